@@ -0,0 +1,221 @@
+"""
+Controle de admissão para as rotas caras de autenticação (bcrypt, Firebase).
+
+Antes de qualquer trabalho pesado (e antes de abrir sessão no banco), cada
+rota protegida verifica, nesta ordem:
+
+  1. concorrência: no máximo AUTH_MAX_CONCURRENCY requisições da rota em
+     andamento no worker; acima disso responde 503 na hora
+  2. taxa por IP: token bucket de AUTH_IP_RATE_PER_MINUTE por IP do cliente
+  3. taxa por conta: token bucket de AUTH_ACCOUNT_RATE_PER_MINUTE por email
+     (ou usuário autenticado), contra credential stuffing numa mesma conta
+
+Taxas excedidas respondem 429. As duas respostas trazem Retry-After e são
+contadas por rota e motivo em /metrics (seção "admission").
+
+Os limites valem por worker (o estado fica em memória). Atrás de um proxy, o
+IP da conexão é o do proxy: ver client_ip() e TRUSTED_PROXY_HOPS.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+
+from . import metrics
+from .auth import Principal, get_current_user
+from .settings import settings
+
+# Buckets mantidos por limitador; acima disso os menos usados são descartados
+MAX_TRACKED_KEYS = 100_000
+
+# Retry-After das respostas 503 por concorrência
+OVERLOAD_RETRY_AFTER_SECONDS = 1
+
+
+def client_ip(request: Request) -> str:
+    """
+    IP do cliente usado nos limites por IP.
+
+    Com TRUSTED_PROXY_HOPS > 0, vem do X-Forwarded-For contado da direita: a
+    entrada acrescentada pelo proxy mais externo, que o cliente não consegue
+    forjar (entradas à esquerda vêm do próprio cliente). Sem proxies, ou sem o
+    cabeçalho, é o IP da conexão (request.client, já resolvido pelo uvicorn
+    conforme FORWARDED_ALLOW_IPS).
+    """
+    hops = settings.trusted_proxy_hops
+    if hops > 0:
+        forwarded = [
+            host.strip()
+            for value in request.headers.getlist("x-forwarded-for")
+            for host in value.split(",")
+            if host.strip()
+        ]
+        if forwarded:
+            return forwarded[max(len(forwarded) - hops, 0)]
+    return request.client.host if request.client else ""
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket por chave: capacidade de `rate_per_minute` tokens, repostos
+    continuamente. Executado só no event loop, então não precisa de lock.
+    """
+
+    def __init__(self, rate_per_minute: int, max_keys: int = MAX_TRACKED_KEYS):
+        self.capacity = rate_per_minute
+        self.refill_per_second = rate_per_minute / 60
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def acquire(self, key: str) -> float:
+        """
+        Consome um token da chave.
+
+        Returns:
+            0 se admitido; senão, segundos até o próximo token
+        """
+        if self.capacity <= 0:
+            return 0
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated) * self.refill_per_second)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.refill_per_second
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class AdmissionPolicy:
+    """Limites de uma rota: concorrência, taxa por IP e taxa por conta."""
+
+    def __init__(self, name: str, max_concurrency: int, ip_rate_per_minute: int, account_rate_per_minute: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.by_ip = TokenBucketLimiter(ip_rate_per_minute)
+        self.by_account = TokenBucketLimiter(account_rate_per_minute)
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = {"concurrency": 0, "ip_rate": 0, "account_rate": 0}
+
+    def _reject(self, reason: str, retry_after: float) -> HTTPException:
+        self.shed[reason] += 1
+        if reason == "concurrency":
+            return HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servidor ocupado, tente novamente em instantes",
+                headers={"Retry-After": str(OVERLOAD_RETRY_AFTER_SECONDS)},
+            )
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Muitas tentativas, tente novamente em instantes",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    @asynccontextmanager
+    async def admit(self, request: Request, account: Optional[str] = None) -> AsyncIterator[None]:
+        """
+        Reserva uma vaga de concorrência enquanto o bloco executa.
+
+        Args:
+            request: Requisição (o IP do cliente vem de client_ip())
+            account: Email ou id do usuário, quando conhecido antes do trabalho caro
+
+        Raises:
+            HTTPException: 503 por concorrência ou 429 por taxa, com Retry-After
+        """
+        if not settings.admission_enabled:
+            yield
+            return
+
+        # A concorrência é verificada primeiro: sob sobrecarga não consome tokens dos buckets
+        if self.in_flight >= self.max_concurrency:
+            raise self._reject("concurrency", OVERLOAD_RETRY_AFTER_SECONDS)
+        wait = self.by_ip.acquire(client_ip(request))
+        if wait:
+            raise self._reject("ip_rate", wait)
+        if account:
+            wait = self.by_account.acquire(account.strip().lower())
+            if wait:
+                raise self._reject("account_rate", wait)
+
+        self.in_flight += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "tracked_ips": len(self.by_ip),
+            "tracked_accounts": len(self.by_account),
+        }
+
+
+def _policy(name: str) -> AdmissionPolicy:
+    return AdmissionPolicy(
+        name,
+        max_concurrency=settings.auth_max_concurrency,
+        ip_rate_per_minute=settings.auth_ip_rate_per_minute,
+        account_rate_per_minute=settings.auth_account_rate_per_minute,
+    )
+
+
+policies: Dict[str, AdmissionPolicy] = {
+    name: _policy(name)
+    for name in ("auth.login", "auth.register", "users.change_password", "auth.google_login")
+}
+
+metrics.register("admission", lambda: {name: policy.stats() for name, policy in policies.items()})
+
+
+# ========== DEPENDÊNCIAS DAS ROTAS ==========
+# Declaradas em dependencies=[...] da rota: rodam antes dos parâmetros do endpoint
+
+async def login_admission(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    """Admissão do login por senha (conta = username do formulário)."""
+    async with policies["auth.login"].admit(request, account=form_data.username):
+        yield
+
+
+async def register_admission(request: Request):
+    """Admissão do registro (conta = email do corpo JSON, se legível)."""
+    try:
+        body = await request.json()
+    except ValueError:
+        body = None
+    email = body.get("email") if isinstance(body, dict) else None
+    async with policies["auth.register"].admit(request, account=email if isinstance(email, str) else None):
+        yield
+
+
+async def password_change_admission(request: Request, current_user: Principal = Depends(get_current_user)):
+    """Admissão da troca de senha (conta = usuário autenticado)."""
+    async with policies["users.change_password"].admit(request, account=str(current_user.id)):
+        yield
+
+
+async def google_login_admission(request: Request):
+    """
+    Admissão do login Google. Só por IP: o email só é conhecido depois de
+    verificar o token, que é justamente o trabalho caro.
+    """
+    async with policies["auth.google_login"].admit(request):
+        yield
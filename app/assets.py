@@ -0,0 +1,231 @@
+"""
+Pipeline dos arquivos estáticos do frontend.
+
+Build (python -m app.manage build-assets):
+    Copia frontend/static para frontend/dist/static com nomes com hash do
+    conteúdo (script.<hash>.js), reescrevendo as referências entre os arquivos
+    e no index.html, e grava irmãos pré-comprimidos .gz (e .br, se o módulo
+    brotli estiver instalado). O manifest.json mapeia nome original -> nome
+    com hash.
+
+Servidor:
+    PrecompressedStaticFiles escolhe a variante .br/.gz conforme o
+    Accept-Encoding e marca arquivos com hash como imutáveis. IndexPage serve
+    o index.html da memória com ETag. Sem build (desenvolvimento), os arquivos
+    de frontend/ são servidos como estão, com revalidação a cada uso.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+try:
+    import brotli
+except ImportError:  # .br é opcional; .gz sempre é gerado
+    brotli = None
+
+FRONTEND_DIR = Path(__file__).resolve().parent.parent / "frontend"
+DIST_DIR = FRONTEND_DIR / "dist"
+
+# Arquivos com hash no nome nunca mudam de conteúdo
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+HASHED_NAME = re.compile(r"\.[0-9a-f]{10}\.[A-Za-z0-9]+$")
+
+# Variantes na ordem de preferência: (Content-Encoding, sufixo do arquivo)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+TEXT_EXTENSIONS = {".js", ".css", ".html", ".svg", ".json", ".txt", ".map"}
+
+# Abaixo disso a compressão não compensa o cabeçalho extra
+MIN_COMPRESS_BYTES = 1024
+
+
+# ========== BUILD ==========
+
+def _fingerprint(name: str, content: bytes) -> str:
+    stem, extension = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:10]}{extension}"
+
+
+def _reference(name: str) -> re.Pattern:
+    # "./nome", "/static/nome" entre aspas ou em url(...)
+    return re.compile(r"""(["'(])(\./|/static/)""" + re.escape(name) + r"""(["')])""")
+
+
+def _rewrite(content: bytes, manifest: Dict[str, str]) -> bytes:
+    text = content.decode("utf-8")
+    for name, hashed in manifest.items():
+        text = _reference(name).sub(lambda match: match.group(1) + match.group(2) + hashed + match.group(3), text)
+    return text.encode("utf-8")
+
+
+def _write_compressed(path: Path, content: bytes) -> None:
+    if path.suffix not in TEXT_EXTENSIONS or len(content) < MIN_COMPRESS_BYTES:
+        return
+    variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(content, quality=11)
+    for suffix, compressed in variants.items():
+        if len(compressed) < len(content):
+            path.with_name(path.name + suffix).write_bytes(compressed)
+
+
+def build_assets(source: Path = FRONTEND_DIR, output: Path = DIST_DIR) -> Dict[str, str]:
+    """
+    Gera frontend/dist com os arquivos estáticos versionados pelo conteúdo.
+
+    Os arquivos são processados das folhas para cima: um arquivo só recebe o
+    hash depois que as referências dele já apontam para os nomes com hash.
+
+    Returns:
+        Manifest {nome original: nome com hash}
+
+    Raises:
+        RuntimeError: Se houver referências circulares entre os arquivos
+    """
+    static_source = source / "static"
+    static_output = output / "static"
+    shutil.rmtree(output, ignore_errors=True)
+    static_output.mkdir(parents=True)
+
+    contents = {path.name: path.read_bytes() for path in sorted(static_source.iterdir()) if path.is_file()}
+    references = {
+        name: {
+            other for other in contents
+            if other != name and Path(name).suffix in TEXT_EXTENSIONS
+            and _reference(other).search(content.decode("utf-8"))
+        }
+        for name, content in contents.items()
+    }
+
+    manifest: Dict[str, str] = {}
+    while len(manifest) < len(contents):
+        ready = [name for name in contents if name not in manifest and references[name] <= manifest.keys()]
+        if not ready:
+            raise RuntimeError(f"Referências circulares entre: {sorted(set(contents) - manifest.keys())}")
+        for name in ready:
+            content = contents[name]
+            if Path(name).suffix in TEXT_EXTENSIONS:
+                content = _rewrite(content, {other: manifest[other] for other in references[name]})
+            manifest[name] = _fingerprint(name, content)
+            # O nome original continua disponível (sem cache longo) para páginas antigas
+            for target in (static_output / manifest[name], static_output / name):
+                target.write_bytes(content)
+                _write_compressed(target, content)
+
+    index = _rewrite((source / "index.html").read_bytes(), manifest)
+    (output / "index.html").write_bytes(index)
+    _write_compressed(output / "index.html", index)
+
+    (output / "manifest.json").write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+# ========== SERVIDOR ==========
+
+def built() -> bool:
+    """True se o build dos assets foi executado (frontend/dist/manifest.json existe)."""
+    return (DIST_DIR / "manifest.json").is_file()
+
+
+def accepted_encodings(headers: Headers) -> set:
+    """Codificações aceitas no Accept-Encoding (ignorando as com q=0)."""
+    accepted = set()
+    for item in headers.get("accept-encoding", "").split(","):
+        token, _, params = item.partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if token.strip():
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles que serve os irmãos .br/.gz gerados no build.
+
+    As variantes disponíveis são levantadas uma vez na criação (os arquivos
+    do build não mudam com o servidor no ar).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._variants: Dict[str, os.stat_result] = {}
+        if self.directory is not None and os.path.isdir(self.directory):
+            for root, _, files in os.walk(self.directory):
+                for filename in files:
+                    if filename.endswith((".br", ".gz")):
+                        path = os.path.realpath(os.path.join(root, filename))
+                        self._variants[path] = os.stat(path)
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        filename = os.path.basename(full_path)
+
+        headers = {
+            "Cache-Control": IMMUTABLE_CACHE if HASHED_NAME.search(filename) else REVALIDATE_CACHE,
+        }
+        path = full_path
+        if self._variants:
+            headers["Vary"] = "Accept-Encoding"
+            accepted = accepted_encodings(request_headers)
+            for encoding, suffix in ENCODINGS:
+                variant = self._variants.get(full_path + suffix)
+                if encoding in accepted and variant is not None:
+                    path, stat_result = full_path + suffix, variant
+                    headers["Content-Encoding"] = encoding
+                    break
+
+        response = FileResponse(
+            path,
+            status_code=status_code,
+            stat_result=stat_result,
+            media_type=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+            headers=headers,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class IndexPage:
+    """index.html carregado uma vez na memória, com ETag e variantes pré-comprimidas."""
+
+    def __init__(self, path: Path):
+        body = path.read_bytes()
+        digest = hashlib.sha256(body).hexdigest()[:16]
+        self._variants = {None: (body, f'"{digest}"')}
+        for encoding, suffix in ENCODINGS:
+            compressed = path.with_name(path.name + suffix)
+            if compressed.is_file():
+                self._variants[encoding] = (compressed.read_bytes(), f'"{digest}-{encoding}"')
+
+    def response(self, request: Request) -> Response:
+        """Responde com a variante aceita pelo cliente (ou 304 se o ETag casar)."""
+        accepted = accepted_encodings(request.headers)
+        encoding: Optional[str] = next(
+            (encoding for encoding, _ in ENCODINGS if encoding in accepted and encoding in self._variants),
+            None,
+        )
+        body, etag = self._variants[encoding]
+
+        headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE, "Vary": "Accept-Encoding"}
+        if etag in [tag.strip(" W/") for tag in request.headers.get("if-none-match", "").split(",")]:
+            return Response(status_code=304, headers=headers)
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return Response(body, media_type="text/html", headers=headers)
@@ -1,61 +1,84 @@
+import hashlib
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from typing import Optional, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-import os
-from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from . import metrics
+from .cache import TTLCache
 from .database import get_db
+from .invalidation import USER_TOKENS, invalidation_bus
 from .models import User
 from .schemas import TokenData
-
-load_dotenv()
+from .settings import settings
+from .passwords import (
+    verify_password,
+    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    verify_and_update_password_async
+)
 
 # Configurações de segurança e autenticação
-SECRET_KEY = os.getenv("SECRET_KEY")
-if not SECRET_KEY:
+if not settings.secret_key:
     raise RuntimeError("SECRET_KEY environment variable is required")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
-
-# Contexto para hash de senhas usando bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # Esquema OAuth2 para autenticação com Bearer token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+@dataclass(frozen=True)
+class Principal:
     """
-    Verifica se a senha em texto plano corresponde ao hash armazenado.
-
-    Args:
-        plain_password: Senha em texto plano fornecida pelo usuário
-        hashed_password: Hash da senha armazenado no banco de dados
+    Representação leve do usuário autenticado, mantida no cache de tokens.
 
-    Returns:
-        True se a senha corresponder, False caso contrário
+    Attributes:
+        id: Identificador do usuário
+        email: Email do usuário
+        token_version: Versão de token do usuário no momento da verificação
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    id: int
+    email: str
+    token_version: int
+
+
+# Cache de tokens já verificados -> principal (evita decode + consulta ao banco a cada requisição)
+principal_cache = TTLCache(maxsize=settings.principal_cache_size, ttl=settings.principal_cache_ttl_seconds)
+metrics.register("auth_principal_cache", principal_cache.stats)
 
 
-def get_password_hash(password: str) -> str:
+def _token_cache_key(token: str) -> str:
+    """Gera a chave do cache a partir do token (evita manter o JWT em memória)."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _discard_user_principals(user_id: int) -> None:
+    principal_cache.discard_where(lambda principal: principal.id == user_id)
+
+
+invalidation_bus.subscribe(
+    USER_TOKENS,
+    _discard_user_principals,
+    reset=lambda: principal_cache.discard_where(lambda principal: True),
+)
+
+
+def invalidate_user_tokens(user_id: int) -> None:
     """
-    Gera um hash bcrypt da senha fornecida.
+    Remove os principals de um usuário do cache de todos os workers.
+    Deve ser chamado (após o commit) sempre que a versão de token do usuário mudar.
 
     Args:
-        password: Senha em texto plano para ser hasheada
-
-    Returns:
-        String com o hash da senha
+        user_id: ID do usuário cujos tokens devem ser invalidados
     """
-    return pwd_context.hash(password)
+    invalidation_bus.publish(USER_TOKENS, user_id)
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """
     Busca um usuário no banco de dados pelo email.
 
@@ -66,12 +89,14 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
     Returns:
         Objeto User se encontrado, None caso contrário
     """
-    return db.query(User).filter(User.email == email).first()
+    return await db.scalar(select(User).where(User.email == email).limit(1))
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
     """
     Autentica um usuário verificando email e senha.
+    A verificação roda no pool de hashing; se o hash armazenado estiver com
+    parâmetros desatualizados, ele é regerado e salvo de forma transparente.
 
     Args:
         db: Sessão do banco de dados
@@ -81,11 +106,15 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     Returns:
         Objeto User se as credenciais forem válidas, None caso contrário
     """
-    user = get_user_by_email(db, email)
+    user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
 
@@ -95,6 +124,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
     Args:
         data: Dicionário com os dados a serem codificados no token
+            ("sub" com o email e "ver" com a versão de token do usuário)
         expires_delta: Tempo até a expiração do token (opcional)
 
     Returns:
@@ -108,27 +138,45 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=15)
 
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    # Import tardio: o python-jose (e o backend de criptografia) fica fora da inicialização
+    from jose import jwt
+
+    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+# Escopo dos tokens curtos da conexão SSE de notificações (vão na query string)
+STREAM_TOKEN_SCOPE = "notifications:stream"
+
+
+def create_stream_token(principal: Principal) -> str:
     """
-    Obtém o usuário atual a partir do token JWT fornecido.
-    Dependency function para proteger rotas que requerem autenticação.
+    Cria um token curto (STREAM_TOKEN_EXPIRE_SECONDS) aceito apenas por /notifications/stream.
+
+    O EventSource não envia cabeçalhos, então o token vai na query string, que
+    acaba em logs de acesso e no histórico: por isso não é o token de acesso.
 
     Args:
-        token: Token JWT extraído do header Authorization
-        db: Sessão do banco de dados
+        principal: Usuário autenticado
 
     Returns:
-        Objeto User do usuário autenticado
+        String com o token JWT codificado
+    """
+    return create_access_token(
+        data={"sub": principal.email, "ver": principal.token_version, "scope": STREAM_TOKEN_SCOPE},
+        expires_delta=timedelta(seconds=settings.stream_token_expire_seconds),
+    )
+
+
+async def _verify_token(token: str, db: AsyncSession, scope: Optional[str]) -> Tuple[Principal, Optional[float]]:
+    """
+    Decodifica o token, confere o escopo e a versão de token do usuário.
+
+    Returns:
+        Tupla (principal, segundos até a expiração do token)
 
     Raises:
-        HTTPException: Se o token for inválido ou o usuário não existir
+        HTTPException: Se o token for inválido, de outro escopo ou o usuário não existir
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -136,17 +184,66 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    from jose import JWTError, jwt
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         email: str = payload.get("sub")
-        if email is None:
+        if email is None or payload.get("scope") != scope:
             raise credentials_exception
-        token_data = TokenData(email=email)
+        token_data = TokenData(email=email, version=payload.get("ver", 0))
     except JWTError:
         raise credentials_exception
 
-    user = get_user_by_email(db, email=token_data.email)
-    if user is None:
+    user = await get_user_by_email(db, email=token_data.email)
+    if user is None or user.token_version != token_data.version:
         raise credentials_exception
 
-    return user
+    principal = Principal(id=user.id, email=user.email, token_version=user.token_version)
+    expires_in = payload["exp"] - time.time() if "exp" in payload else None
+    return principal, expires_in
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """
+    Obtém o usuário atual a partir do token JWT fornecido.
+    Dependency function para proteger rotas que requerem autenticação.
+
+    Tokens já verificados são servidos do cache de principals, sem decode nem
+    consulta ao banco. Tokens cuja versão ("ver") difere da versão atual do
+    usuário (ex: após troca de senha) são rejeitados, assim como tokens com
+    escopo restrito (ex: os de /notifications/stream).
+
+    Args:
+        token: Token JWT extraído do header Authorization
+        db: Sessão do banco de dados
+
+    Returns:
+        Principal do usuário autenticado
+
+    Raises:
+        HTTPException: Se o token for inválido ou o usuário não existir
+    """
+    cache_key = _token_cache_key(token)
+    principal = principal_cache.get(cache_key)
+    if principal is not None:
+        return principal
+
+    principal, expires_in = await _verify_token(token, db, scope=None)
+    principal_cache.set(cache_key, principal, ttl=expires_in)
+
+    return principal
+
+
+async def get_stream_principal(token: str, db: AsyncSession) -> Principal:
+    """
+    Valida um token criado por create_stream_token (sem cache: um por conexão).
+
+    Raises:
+        HTTPException: Se o token for inválido, expirado ou não for de stream
+    """
+    principal, _ = await _verify_token(token, db, scope=STREAM_TOKEN_SCOPE)
+    return principal
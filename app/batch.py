@@ -0,0 +1,31 @@
+"""
+Apoio às operações em lote (PATCH/DELETE /applications/batch e /interviews/batch).
+
+As operações rodam como um único UPDATE/DELETE restrito ao usuário, com
+RETURNING dos IDs afetados; IDs ausentes no retorno não existem ou pertencem a
+outro usuário e são reportados como not_found.
+"""
+
+from typing import Iterable, List
+
+
+def batch_response(ids: List[int], affected_ids: Iterable[int], outcome: str) -> dict:
+    """
+    Monta o resultado por ID de uma operação em lote.
+
+    Args:
+        ids: IDs enviados, na ordem do pedido
+        affected_ids: IDs retornados pelo RETURNING
+        outcome: Resultado dos IDs afetados ("updated" ou "deleted")
+
+    Returns:
+        Dict no formato do BatchResponse
+    """
+    affected = set(affected_ids)
+    return {
+        "affected": len(affected),
+        "results": [
+            {"id": item_id, "result": outcome if item_id in affected else "not_found"}
+            for item_id in ids
+        ],
+    }
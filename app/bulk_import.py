@@ -0,0 +1,247 @@
+"""
+Importação em massa de candidaturas (CSV, NDJSON ou array JSON).
+
+O corpo (ou o arquivo do multipart) é copiado para um arquivo temporário
+"spooled" (memória até IMPORT_SPOOL_BYTES, disco acima disso) e lido linha a
+linha; cada linha é validada com ApplicationCreate e as válidas são inseridas
+em lotes de IMPORT_BATCH_SIZE com um único INSERT executemany por lote. Tudo
+acontece numa transação só: o commit fica com o endpoint.
+
+Linhas inválidas não interrompem a importação; elas vão para o relatório de
+erros (até IMPORT_MAX_ERRORS entradas detalhadas).
+"""
+
+import csv
+import io
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import IO, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Application
+from .schemas import ApplicationCreate
+from .settings import settings
+
+# Erros detalhados no relatório (os demais só entram na contagem)
+IMPORT_MAX_ERRORS = 1000
+
+# Acima deste tamanho o upload vai para disco em vez de ficar em memória
+IMPORT_SPOOL_BYTES = 1024 * 1024
+
+FORMATS = ("csv", "ndjson", "json")
+
+_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json": "json",
+}
+
+_EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "json"}
+
+
+@dataclass
+class ImportResult:
+    """Contadores e erros de uma importação."""
+    imported: int = 0
+    failed: int = 0
+    errors: List[dict] = field(default_factory=list)
+
+    def add_error(self, row: int, messages: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({"row": row, "errors": messages})
+
+    def report(self) -> dict:
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Arquivo maior que o limite de {settings.import_max_bytes // (1024 * 1024)} MB",
+    )
+
+
+async def read_upload(request: Request, format: Optional[str]) -> Tuple[IO[bytes], str]:
+    """
+    Copia o upload para um arquivo temporário e descobre o formato.
+
+    Aceita multipart/form-data (campo "file") ou o arquivo direto no corpo.
+    O formato vem do parâmetro format, do Content-Type ou da extensão do arquivo.
+
+    Returns:
+        Tupla (arquivo binário posicionado no início, formato)
+
+    Raises:
+        HTTPException: 400 sem arquivo, 413 acima de IMPORT_MAX_BYTES, 415 em formato desconhecido
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type == "multipart/form-data":
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Envie o arquivo no campo 'file'")
+        spool = upload.file
+        spool.seek(0, io.SEEK_END)
+        if spool.tell() > settings.import_max_bytes:
+            raise _too_large()
+        spool.seek(0)
+        extension = os.path.splitext(upload.filename or "")[1].lower()
+        detected = _EXTENSIONS.get(extension) or _CONTENT_TYPES.get((upload.content_type or "").lower())
+    else:
+        spool = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES)
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > settings.import_max_bytes:
+                spool.close()
+                raise _too_large()
+            spool.write(chunk)
+        spool.seek(0)
+        detected = _CONTENT_TYPES.get(content_type)
+
+    format = format or detected
+    if format not in FORMATS:
+        spool.close()
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Formato não suportado; use CSV, NDJSON ou um array JSON",
+        )
+    return spool, format
+
+
+def _clean(raw) -> Optional[dict]:
+    # Cabeçalhos sem diferença de caixa/espaços; células vazias assumem o padrão do schema
+    if not isinstance(raw, dict):
+        return None
+    return {
+        str(key).strip().lower(): value.strip() if isinstance(value, str) else value
+        for key, value in raw.items()
+        if key is not None and value not in ("", None)
+    }
+
+
+def iter_rows(spool: IO[bytes], format: str) -> Iterator[Tuple[int, Optional[dict]]]:
+    """
+    Lê o arquivo em sequência, sem carregá-lo inteiro (exceto o array JSON).
+
+    Yields:
+        Tuplas (número da linha/item, dict da linha ou None se não for um objeto)
+
+    Raises:
+        HTTPException: 400 se o arquivo não for UTF-8 ou o JSON for inválido
+    """
+    text = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+    try:
+        if format == "csv":
+            reader = csv.DictReader(text)
+            for raw in reader:
+                yield reader.line_num, _clean(raw)
+        elif format == "ndjson":
+            for number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, _clean(json.loads(line))
+                except json.JSONDecodeError:
+                    yield number, None
+        else:
+            # Clientes programáticos: o array é carregado inteiro (limitado por IMPORT_MAX_BYTES)
+            try:
+                items = json.load(text)
+            except json.JSONDecodeError:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="JSON inválido")
+            if not isinstance(items, list):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="O corpo JSON deve ser um array")
+            for number, item in enumerate(items, start=1):
+                yield number, _clean(item)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="O arquivo deve estar em UTF-8")
+    finally:
+        text.detach()
+
+
+def _error_messages(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" if item["loc"] else item["msg"]
+        for item in error.errors()
+    ]
+
+
+def _read_chunk(rows: Iterator[Tuple[int, Optional[dict]]], user_id: int, result: ImportResult, lines_before: int) -> Tuple[List[dict], bool]:
+    """
+    Lê e valida até IMPORT_BATCH_SIZE linhas (válidas ou não). Bloqueante: roda no threadpool.
+
+    Returns:
+        Tupla (linhas válidas prontas para o INSERT, True se o arquivo terminou)
+    """
+    valid: List[dict] = []
+    for read, (number, raw) in enumerate(rows, start=1):
+        if lines_before + read > settings.import_max_rows:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Importação limitada a {settings.import_max_rows} linhas",
+            )
+        if raw is None:
+            result.add_error(number, ["Registro não é um objeto JSON válido"])
+        else:
+            try:
+                application = ApplicationCreate.model_validate(raw)
+            except ValidationError as error:
+                result.add_error(number, _error_messages(error))
+            else:
+                valid.append({**application.model_dump(), "user_id": user_id})
+        if read >= settings.import_batch_size:
+            return valid, False
+    return valid, True
+
+
+async def import_applications(db: AsyncSession, user_id: int, rows: Iterator[Tuple[int, Optional[dict]]]) -> ImportResult:
+    """
+    Valida e insere as linhas em lotes, na transação corrente (sem commit).
+
+    A leitura e a validação rodam no threadpool, um bloco de IMPORT_BATCH_SIZE
+    linhas por vez: mesmo um arquivo só com linhas inválidas não segura o
+    event loop durante o parse inteiro.
+
+    Args:
+        db: Sessão da requisição
+        user_id: Dono das candidaturas importadas
+        rows: Linhas produzidas por iter_rows()
+
+    Returns:
+        ImportResult com a quantidade importada e os erros por linha
+
+    Raises:
+        HTTPException: 413 se o arquivo tiver mais de IMPORT_MAX_ROWS linhas
+    """
+    result = ImportResult()
+    batch: List[dict] = []
+    finished = False
+
+    while not finished:
+        lines_before = result.imported + result.failed + len(batch)
+        valid, finished = await run_in_threadpool(_read_chunk, rows, user_id, result, lines_before)
+        batch.extend(valid)
+        if len(batch) >= settings.import_batch_size or (finished and batch):
+            await db.execute(insert(Application), batch)
+            result.imported += len(batch)
+            batch = []
+
+    return result
@@ -0,0 +1,98 @@
+"""
+Cache em memória (por processo) com expiração por tempo e política LRU.
+Usado para evitar trabalho repetido em caminhos quentes, como a validação de tokens.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Cache limitado por tamanho (LRU) com expiração por entrada.
+
+    Seguro para uso concorrente entre threads do threadpool do FastAPI.
+    Mantém contadores de acertos/erros para acompanhar a eficácia do cache.
+
+    Attributes:
+        maxsize: Número máximo de entradas mantidas
+        ttl: Tempo de vida padrão de cada entrada, em segundos
+        hits: Total de buscas atendidas pelo cache
+        misses: Total de buscas que não encontraram entrada válida
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retorna o valor associado à chave, ou None se ausente/expirado."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Armazena o valor, descartando a entrada menos usada se o cache estiver cheio."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove a entrada da chave, se existir."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Any], bool]) -> int:
+        """
+        Remove todas as entradas cujo valor satisfaz o predicado.
+
+        Returns:
+            Quantidade de entradas removidas
+        """
+        with self._lock:
+            keys = [key for key, (_, value) in self._data.items() if predicate(value)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove todas as entradas e zera os contadores."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Retorna tamanho atual e contadores de acertos/erros."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
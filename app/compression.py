@@ -0,0 +1,236 @@
+"""
+Compressão dinâmica das respostas (brotli ou gzip, negociada pelo Accept-Encoding).
+
+Middleware ASGI puro: decide no primeiro bloco do corpo se a resposta será
+comprimida. Ficam de fora respostas que já têm Content-Encoding (arquivos
+pré-comprimidos, exportações .gz), tipos fora da lista de permitidos (inclusive
+text/event-stream, que precisa chegar evento a evento) e corpos completos
+menores que COMPRESSION_MIN_BYTES.
+
+Respostas em streaming (mais de um bloco) são comprimidas bloco a bloco, com
+flush a cada bloco, sem bufferizar o corpo inteiro.
+
+Os contadores por rota (bytes antes/depois e tempo de CPU) ficam em /metrics
+na seção "compression", para calibrar os níveis.
+"""
+
+import time
+import zlib
+from collections import defaultdict
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from . import metrics
+from .assets import accepted_encodings
+from .settings import settings
+
+try:
+    import brotli
+except ImportError:  # sem brotli, apenas gzip é negociado
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+
+# Tipos text/* que não devem passar pelo compressor
+EXCLUDED_TYPES = {"text/event-stream"}
+
+_UNMATCHED_ROUTE = "<sem rota>"
+
+
+class _RouteCounters:
+    __slots__ = ("responses", "streamed", "bytes_in", "bytes_out", "cpu_seconds")
+
+    def __init__(self):
+        self.responses = 0
+        self.streamed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "responses": self.responses,
+            "streamed": self.streamed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None,
+            "cpu_ms": round(self.cpu_seconds * 1000, 2),
+            "cpu_us_per_kb": round(self.cpu_seconds * 1e6 / (self.bytes_in / 1024), 2) if self.bytes_in else None,
+        }
+
+
+_routes: Dict[str, _RouteCounters] = defaultdict(_RouteCounters)
+_skipped = {"small": 0, "content_type": 0, "already_encoded": 0, "status": 0}
+
+
+def compression_stats() -> dict:
+    return {
+        "min_bytes": settings.compression_min_bytes,
+        "gzip_level": settings.compression_gzip_level,
+        "brotli_quality": settings.compression_brotli_quality if brotli is not None else None,
+        "skipped": dict(_skipped),
+        "routes": {route: counters.snapshot() for route, counters in sorted(_routes.items())},
+    }
+
+
+metrics.register("compression", compression_stats)
+
+
+def _compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type in EXCLUDED_TYPES:
+        return False
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+
+def _add_vary(headers: MutableHeaders, token: str) -> None:
+    """Acrescenta o token ao Vary, a menos que ele (ou "*") já esteja presente."""
+    present = {value.strip().lower() for value in headers.get("vary", "").split(",")}
+    if token.lower() not in present and "*" not in present:
+        headers.add_vary_header(token)
+
+
+class _Compressor:
+    """Interface comum para gzip (zlib) e brotli em modo incremental."""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=settings.compression_brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            # wbits=31: formato gzip
+            self._zlib = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        if self._brotli is not None:
+            output = self._brotli.process(data)
+            return output + self._brotli.flush() if flush else output
+        output = self._zlib.compress(data)
+        return output + self._zlib.flush(zlib.Z_SYNC_FLUSH) if flush else output
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """Middleware ASGI de compressão com limite de tamanho e lista de tipos permitidos."""
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.compression_min_bytes if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = accepted_encodings(Headers(scope=scope))
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(scope, send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, scope, send, encoding: str, minimum_size: int):
+        self.scope = scope
+        self.downstream = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message: Optional[dict] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+        self.counters: Optional[_RouteCounters] = None
+
+    async def send(self, message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.downstream(message)
+            return
+        if self.compressor is None:
+            await self._first_body(message)
+        else:
+            await self._next_body(message)
+
+    def _route(self) -> str:
+        # O router do Starlette/FastAPI grava a rota encontrada no scope
+        return getattr(self.scope.get("route"), "path", None) or _UNMATCHED_ROUTE
+
+    async def _first_body(self, message) -> None:
+        headers = MutableHeaders(scope=self.start_message)
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        status_code = self.start_message["status"]
+
+        skip = None
+        if "content-encoding" in headers:
+            skip = "already_encoded"
+        elif not _compressible(headers.get("content-type", "")):
+            skip = "content_type"
+        elif status_code < 200 or status_code in (204, 206, 304):
+            skip = "status"
+        else:
+            _add_vary(headers, "Accept-Encoding")
+            if not more_body and len(body) < self.minimum_size:
+                skip = "small"
+
+        if skip is not None:
+            _skipped[skip] += 1
+            self.passthrough = True
+            await self.downstream(self.start_message)
+            await self.downstream(message)
+            return
+
+        self.compressor = _Compressor(self.encoding)
+        self.counters = _routes[self._route()]
+        self.counters.responses += 1
+        if more_body:
+            self.counters.streamed += 1
+
+        headers["Content-Encoding"] = self.encoding
+        # A representação comprimida não é idêntica byte a byte: o validador vira fraco
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+        data = self._compress(body, more_body)
+        if more_body:
+            del headers["content-length"]
+        else:
+            headers["Content-Length"] = str(len(data))
+        await self.downstream(self.start_message)
+        await self.downstream({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _next_body(self, message) -> None:
+        more_body = message.get("more_body", False)
+        data = self._compress(message.get("body", b""), more_body)
+        await self.downstream({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _compress(self, body: bytes, more_body: bool) -> bytes:
+        started = time.thread_time()
+        if more_body:
+            data = self.compressor.compress(body, flush=True)
+        else:
+            data = self.compressor.compress(body, flush=False) + self.compressor.finish()
+        self.counters.cpu_seconds += time.thread_time() - started
+        self.counters.bytes_in += len(body)
+        self.counters.bytes_out += len(data)
+        return data
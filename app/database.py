@@ -1,20 +1,35 @@
-import os
-from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.engine import FrozenResult
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
-load_dotenv()
+from . import metrics
+from .db_pool import engine_options, pool_stats
+from .query_stats import instrument_engine
+from .settings import settings
 
-# Obtém a URL de conexão do banco de dados das variáveis de ambiente
-DATABASE_URL = os.getenv("DATABASE_URL")
+# URL de conexão do banco (postgres:// já normalizado para postgresql://)
+DATABASE_URL = settings.database_url
 
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL não definida")
 
-# Corrige o esquema postgres:// para postgresql:// (compatibilidade Railway/Heroku)
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+# Camada assíncrona (AsyncSession) ou síncrona (Session no threadpool), para comparação sob carga
+DB_ASYNC = settings.db_async
+
+
+def _async_url(url: str) -> str:
+    """Converte a URL síncrona para o driver assíncrono equivalente (aiosqlite/asyncpg)."""
+    scheme, rest = url.split("://", 1)
+    driver = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}.get(scheme.split("+")[0])
+    return f"{driver}://{rest}" if driver else url
+
+
+ASYNC_DATABASE_URL = _async_url(DATABASE_URL)
 
 connect_args = {}
 
@@ -22,11 +37,12 @@ connect_args = {}
 if DATABASE_URL.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
 
-# Cria o engine de conexão com o banco de dados
+# Cria o engine de conexão com o banco de dados (usado no modo síncrono e por scripts)
+# O pool é configurável pelo ambiente (DB_POOL_SIZE, DB_DISCONNECT_STRATEGY, etc.)
 engine = create_engine(
     DATABASE_URL,
     connect_args=connect_args,
-    pool_pre_ping=True  # Verifica conexões antes de usar
+    **engine_options(DATABASE_URL, is_async=False)
 )
 
 # Fabrica de sessões do SQLAlchemy
@@ -36,19 +52,177 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Engine e fábrica de sessões assíncronas (concorrência limitada pelas conexões, não pelo threadpool)
+async_engine = None
+AsyncSessionLocal = None
+
+if DB_ASYNC:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        **engine_options(ASYNC_DATABASE_URL, is_async=True)
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+# Contagem e tempo das instruções SQL por requisição (Server-Timing)
+instrument_engine(engine)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine)
+
+# Métricas do pool efetivamente usado pelas requisições
+metrics.register(
+    "db_pool",
+    lambda: pool_stats(async_engine.pool if async_engine is not None else engine.pool)
+)
+
 # Classe base para os modelos do SQLAlchemy
 Base = declarative_base()
 
-def get_db():
+
+class SyncSessionAdapter:
+    """
+    Expõe uma Session síncrona com a mesma interface assíncrona da AsyncSession.
+
+    Cada operação de banco roda no threadpool, permitindo que os routers usem
+    um único código (await db.execute(...)) nos dois modos de DB_ASYNC.
+    Os resultados são bufferizados na thread, antes de voltar ao event loop.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def _execute_buffered(self, statement, params=None, **kwargs):
+        result = self.sync_session.execute(statement, params, **kwargs)
+        try:
+            return result.freeze()
+        except NotImplementedError:
+            # Instruções sem linhas (UPDATE/INSERT em lote sem RETURNING): só rowcount
+            return result
+
+    async def execute(self, statement, params=None, **kwargs):
+        result = await run_in_threadpool(self._execute_buffered, statement, params, **kwargs)
+        return result() if isinstance(result, FrozenResult) else result
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return (await self.execute(statement, params, **kwargs)).scalar()
+
+    async def scalars(self, statement, params=None, **kwargs):
+        return (await self.execute(statement, params, **kwargs)).scalars()
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    async def delete(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def refresh(self, instance, attribute_names=None) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, attribute_names)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    def get_bind(self):
+        return self.sync_session.get_bind()
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+async def stream_partitions(db, statement, size: int) -> AsyncIterator[list]:
+    """
+    Executa o SELECT com cursor do lado do servidor (yield_per) e entrega as
+    linhas em blocos, sem carregar o resultado inteiro em memória.
+
+    Args:
+        db: AsyncSession ou SyncSessionAdapter
+        statement: SELECT a executar
+        size: Linhas por bloco
+
+    Yields:
+        Listas com até size linhas
+    """
+    statement = statement.execution_options(yield_per=size)
+    if isinstance(db, SyncSessionAdapter):
+        result = await run_in_threadpool(db.sync_session.execute, statement)
+        try:
+            while rows := await run_in_threadpool(result.fetchmany, size):
+                yield rows
+        finally:
+            result.close()
+    else:
+        result = await db.stream(statement)
+        async for rows in result.partitions(size):
+            yield rows
+
+
+@asynccontextmanager
+async def session_scope():
+    """
+    Abre uma sessão de banco de dados fora do ciclo de dependências do FastAPI.
+
+    Usado por respostas em streaming e tarefas de background: as dependências
+    com yield são finalizadas antes do envio da resposta, então a sessão da
+    requisição não pode ser usada enquanto o corpo é transmitido.
+
+    Yields:
+        AsyncSession: Sessão assíncrona (ou SyncSessionAdapter com DB_ASYNC desativado)
+    """
+    if DB_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SyncSessionAdapter(SessionLocal())
+        try:
+            yield db
+        finally:
+            await db.close()
+
+
+async def get_db():
     """
     Dependency function que fornece uma sessão de banco de dados.
     Garante que a sessão seja fechada após o uso.
 
+    Com DB_ASYNC ativo fornece uma AsyncSession; caso contrário, uma Session
+    síncrona adaptada (SyncSessionAdapter) com a mesma interface.
+
     Yields:
-        Session: Sessão do banco de dados SQLAlchemy
+        AsyncSession: Sessão do banco de dados SQLAlchemy
     """
-    db = SessionLocal()
-    try:
+    async with session_scope() as db:
         yield db
-    finally:
-        db.close()
+
+
+def reset_pools_after_fork() -> None:
+    """
+    Descarta, sem fechar, as conexões herdadas do processo pai (gunicorn com
+    preload): o socket continua sendo do pai, e o worker abre as próprias.
+    """
+    engine.dispose(close=False)
+    if async_engine is not None:
+        async_engine.sync_engine.dispose(close=False)
+
+
+async def dispose_engines() -> None:
+    """Fecha as conexões abertas pelos engines (chamado no shutdown da aplicação)."""
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
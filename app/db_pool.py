@@ -0,0 +1,131 @@
+"""
+Configuração e instrumentação do pool de conexões do SQLAlchemy.
+
+O tamanho do pool e a estratégia de detecção de desconexão vêm do ambiente,
+para dimensionar o pool contra o limite de conexões do Postgres. As classes de
+pool abaixo medem o tempo de espera em cada checkout (histograma em ms).
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from .settings import settings
+
+# Limites superiores (ms) dos buckets do histograma de espera no checkout
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolWaitMetrics:
+    """Contadores de checkout e histograma do tempo de espera por uma conexão."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._lock = threading.Lock()
+
+    def observe(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            self.buckets[bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    def timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"le_{bound}ms" for bound in WAIT_BUCKETS_MS] + ["inf"]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+                "wait_histogram": dict(zip(labels, self.buckets)),
+            }
+
+
+wait_metrics = PoolWaitMetrics()
+
+
+class _TimedCheckoutMixin:
+    """Mede o tempo gasto esperando (ou abrindo) uma conexão do pool."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            wait_metrics.timeout()
+            raise
+        wait_metrics.observe((time.perf_counter() - start) * 1000)
+        return connection
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool com medição do tempo de espera no checkout."""
+
+
+class TimedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool com medição do tempo de espera no checkout."""
+
+
+def engine_options(url: str, is_async: bool) -> dict:
+    """
+    Monta os argumentos de pool para create_engine/create_async_engine.
+
+    Args:
+        url: URL de conexão do banco
+        is_async: Se o engine é assíncrono
+
+    Returns:
+        Dicionário de argumentos de pool
+    """
+    options = {
+        # "optimistic": sem ping; conexões mortas são descartadas quando o erro acontece
+        "pool_pre_ping": settings.db_disconnect_strategy == "pessimistic",
+    }
+
+    # SQLite em memória usa pools próprios (uma única conexão compartilhada)
+    if url.startswith("sqlite") and (":memory:" in url or url.rstrip("/").endswith(":")):
+        return options
+
+    options.update(
+        poolclass=TimedAsyncQueuePool if is_async else TimedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    return options
+
+
+def pool_stats(pool) -> dict:
+    """
+    Retorna o estado atual de um pool e as métricas de espera no checkout.
+
+    Args:
+        pool: Pool do engine ativo (engine.pool)
+    """
+    stats: dict = {
+        "pool_class": type(pool).__name__,
+        "disconnect_strategy": settings.db_disconnect_strategy,
+    }
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            max_overflow=settings.db_max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow_in_use=max(pool.overflow(), 0),
+        )
+    stats.update(wait_metrics.snapshot())
+    return stats
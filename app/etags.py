@@ -0,0 +1,113 @@
+"""
+GET condicional (ETag / If-None-Match) guiado pela versão de dados do usuário.
+
+Toda escrita em candidaturas/entrevistas incrementa users.data_version na mesma
+transação (bump_data_version). O ETag das respostas derivadas desses dados é
+
+    "v<versão>-<válido até (epoch, 0 = sem expiração)>-<digest>"
+
+onde o digest amarra usuário, rota, query string, versão e validade. Para
+responder 304 basta ler a versão atual (uma busca por chave primária): as
+consultas pesadas do endpoint não são executadas.
+
+Respostas que dependem do relógio (próximas entrevistas, notificações) informam
+até quando continuam idênticas; depois disso o ETag deixa de casar.
+"""
+
+import hashlib
+import time
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import User
+
+
+async def bump_data_version(db: AsyncSession, user_id: int) -> None:
+    """Incrementa a versão de dados do usuário (chamar antes do commit da escrita)."""
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+    )
+
+
+async def get_data_version(db: AsyncSession, user_id: int) -> int:
+    """Retorna a versão de dados atual do usuário."""
+    return await db.scalar(select(User.data_version).where(User.id == user_id)) or 0
+
+
+def _digest(request: Request, user_id: int, version: int, valid_until: int) -> str:
+    query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+    key = f"{user_id}|{request.url.path}|{query}|{version}|{valid_until}"
+    return hashlib.sha256(key.encode()).hexdigest()[:20]
+
+
+def _epoch(moment: Optional[datetime]) -> int:
+    # Datas do banco são UTC ingênuas (datetime.utcnow); arredonda para baixo
+    if moment is None:
+        return 0
+    return int((moment - datetime(1970, 1, 1)).total_seconds())
+
+
+class ConditionalGet:
+    """
+    Validador de um GET condicional.
+
+    Uso no endpoint:
+        conditional = await ConditionalGet.check(request, db, current_user.id)
+        ... consultas pesadas ...
+        conditional.apply(response, valid_until=...)
+    """
+
+    def __init__(self, request: Request, user_id: int, version: int):
+        self.request = request
+        self.user_id = user_id
+        self.version = version
+
+    @classmethod
+    async def check(cls, request: Request, db: AsyncSession, user_id: int) -> "ConditionalGet":
+        """
+        Compara If-None-Match com a versão atual e responde 304 se ainda for válido.
+
+        Raises:
+            HTTPException: 304 Not Modified (com o ETag) quando o cliente já tem a resposta
+        """
+        conditional = cls(request, user_id, await get_data_version(db, user_id))
+
+        for tag in request.headers.get("if-none-match", "").split(","):
+            tag = tag.strip().removeprefix("W/")
+            if conditional._matches(tag):
+                raise HTTPException(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": tag, "Cache-Control": "private, no-cache"},
+                )
+
+        return conditional
+
+    def _matches(self, tag: str) -> bool:
+        try:
+            version, valid_until, digest = tag.strip('"').removeprefix("v").split("-")
+            version, valid_until = int(version), int(valid_until)
+        except ValueError:
+            return False
+
+        if version != self.version or (valid_until and time.time() >= valid_until):
+            return False
+        return digest == _digest(self.request, self.user_id, version, valid_until)
+
+    def apply(self, response: Response, valid_until: Optional[datetime] = None) -> None:
+        """
+        Define o ETag (e Cache-Control) da resposta.
+
+        Args:
+            response: Resposta do endpoint
+            valid_until: Momento (UTC) em que a resposta muda mesmo sem escritas
+        """
+        until = _epoch(valid_until)
+        digest = _digest(self.request, self.user_id, self.version, until)
+        response.headers["ETag"] = f'"v{self.version}-{until}-{digest}"'
+        response.headers["Cache-Control"] = "private, no-cache"
@@ -0,0 +1,107 @@
+"""
+Exportação em streaming (CSV ou NDJSON, opcionalmente gzip).
+
+O SELECT roda uma única vez com cursor do lado do servidor (yield_per) numa
+sessão própria, aberta dentro do gerador da resposta: a exportação inteira vem
+de uma só instrução, portanto de um snapshot consistente do banco, e a memória
+do worker fica limitada a um bloco de EXPORT_BATCH_SIZE linhas, independente
+do tamanho da conta.
+"""
+
+import csv
+import enum
+import io
+import json
+import logging
+import zlib
+from datetime import date, datetime
+from typing import AsyncIterator, Iterable, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+
+from .database import session_scope, stream_partitions
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunk(rows: Iterable[Sequence]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([["" if value is None else _value(value) for value in row] for row in rows])
+    return buffer.getvalue()
+
+
+def _ndjson_chunk(fields: Sequence[str], rows: Iterable[Sequence]) -> str:
+    return "".join(
+        json.dumps(dict(zip(fields, map(_value, row))), ensure_ascii=False, separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+
+async def _export_chunks(statement: Select, format: str, fields: Sequence[str]) -> AsyncIterator[str]:
+    async with session_scope() as db:
+        if format == "csv":
+            # BOM para o Excel reconhecer UTF-8
+            yield "\ufeff" + _csv_chunk([fields])
+        async for rows in stream_partitions(db, statement, settings.export_batch_size):
+            yield _csv_chunk(rows) if format == "csv" else _ndjson_chunk(fields, rows)
+
+
+async def _encode(chunks: AsyncIterator[str], compress: bool) -> AsyncIterator[bytes]:
+    # wbits=31: formato gzip, comprimido incrementalmente a cada bloco
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    try:
+        async for chunk in chunks:
+            data = chunk.encode("utf-8")
+            if compressor is not None:
+                data = compressor.compress(data)
+            if data:
+                yield data
+        if compressor is not None:
+            yield compressor.flush()
+    except Exception:
+        # Os cabeçalhos já foram enviados: só resta interromper o corpo
+        logger.exception("Falha durante a exportação")
+        raise
+
+
+def export_response(statement: Select, format: str, compress: bool, filename: str) -> StreamingResponse:
+    """
+    Monta a resposta de exportação em streaming.
+
+    Args:
+        statement: SELECT das colunas exportadas, já filtrado e ordenado
+        format: "csv" ou "ndjson"
+        compress: Comprime o arquivo com gzip (extensão .gz)
+        filename: Nome do arquivo sem extensão
+
+    Returns:
+        StreamingResponse com Content-Disposition de download
+    """
+    fields = [column.key for column in statement.selected_columns]
+    filename = f"{filename}.{format}"
+    media_type = MEDIA_TYPES[format]
+    if compress:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        _encode(_export_chunks(statement, format, fields), compress),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        },
+    )
@@ -0,0 +1,66 @@
+"""
+Projeções compartilhadas pelos feeds de entrevistas (listagem, próximas e notificações).
+
+Os feeds são montados com um único SELECT com junção em applications que
+projeta apenas as colunas necessárias: nenhuma instância ORM é hidratada e o
+número de consultas não depende da quantidade de entrevistas retornadas.
+"""
+
+from sqlalchemy import Select, select
+
+from .models import Application, Interview
+
+# Colunas do schema InterviewWithApplication
+INTERVIEW_FEED_COLUMNS = (
+    Interview.id,
+    Interview.application_id,
+    Interview.interview_datetime,
+    Interview.interview_type,
+    Interview.interviewer_name,
+    Interview.interviewer_role,
+    Interview.duration_minutes,
+    Interview.status,
+    Interview.questions_asked,
+    Interview.answers_notes,
+    Interview.feedback_received,
+    Interview.self_rating,
+    Interview.pre_interview_notes,
+    Interview.post_interview_notes,
+    Interview.meeting_link,
+    Interview.created_at,
+    Interview.updated_at,
+    Application.nome.label("application_nome"),
+    Application.empresa.label("application_empresa"),
+)
+
+# Subconjunto exibido nos lembretes de notificações
+NOTIFICATION_COLUMNS = (
+    Interview.id,
+    Interview.application_id,
+    Interview.interview_datetime,
+    Interview.interview_type,
+    Interview.interviewer_name,
+    Interview.duration_minutes,
+    Interview.meeting_link,
+    Application.nome.label("application_nome"),
+    Application.empresa.label("application_empresa"),
+)
+
+
+def interview_feed_query(user_id: int, columns=INTERVIEW_FEED_COLUMNS) -> Select:
+    """
+    Monta o SELECT base de um feed de entrevistas do usuário.
+
+    Args:
+        user_id: Dono das entrevistas
+        columns: Colunas projetadas (padrão: todas as de InterviewWithApplication)
+
+    Returns:
+        Statement com a junção em applications; filtros e ordenação ficam com o chamador
+    """
+    return (
+        select(*columns)
+        .join(Application, Application.id == Interview.application_id)
+        .where(Interview.user_id == user_id)
+    )
+
@@ -0,0 +1,281 @@
+"""
+Verificação de ID tokens do Firebase Authentication sem bloquear o event loop.
+
+Os tokens são JWT RS256 assinados pelas chaves públicas do Google
+(securetoken@system.gserviceaccount.com). As chaves ficam em cache respeitando
+o Cache-Control max-age da resposta e são renovadas em background antes de
+expirar. Tokens já verificados ficam num cache curto, e o Firebase Admin SDK só
+é inicializado (sob demanda) quando o project id não pode ser determinado.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from . import metrics
+from .cache import TTLCache
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Tempo de cache usado quando a resposta não traz max-age
+DEFAULT_CERTS_MAX_AGE_SECONDS = 3600
+# Renova em background quando faltar menos que isso para expirar
+CERTS_REFRESH_MARGIN_SECONDS = 300
+# Intervalo mínimo entre buscas forçadas por "kid" desconhecido
+CERTS_FORCED_REFRESH_INTERVAL_SECONDS = 30
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+# Tipo do fetcher: retorna (mapa kid -> certificado PEM, max-age em segundos)
+CertsFetcher = Callable[[], Tuple[Dict[str, str], Optional[int]]]
+
+
+class InvalidIdToken(Exception):
+    """ID token inválido, expirado ou emitido para outro projeto."""
+
+
+class SigningKeysUnavailable(Exception):
+    """As chaves públicas do Google não puderam ser obtidas e não há chaves em cache."""
+
+
+def fetch_google_certs() -> Tuple[Dict[str, str], Optional[int]]:
+    """
+    Busca os certificados públicos usados para assinar ID tokens do Firebase.
+
+    Returns:
+        Tupla (mapa kid -> certificado PEM, max-age do Cache-Control ou None)
+    """
+    import httpx
+
+    response = httpx.get(settings.firebase_certs_url, timeout=10.0)
+    response.raise_for_status()
+    match = _MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+    return response.json(), int(match.group(1)) if match else None
+
+
+class SigningKeyCache:
+    """
+    Cache das chaves públicas de assinatura, com renovação em background.
+
+    A primeira busca (ou uma busca após expiração total) é síncrona; quando as
+    chaves estão perto de expirar, uma thread de background as renova enquanto
+    as chaves atuais continuam sendo servidas.
+    """
+
+    def __init__(self, fetcher: CertsFetcher = fetch_google_certs):
+        self.fetcher = fetcher
+        self.fetches = 0
+        self.background_refreshes = 0
+        self.fetch_errors = 0
+        self._keys: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._last_fetch = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        keys, max_age = self.fetcher()
+        if max_age is None:
+            max_age = DEFAULT_CERTS_MAX_AGE_SECONDS
+        with self._lock:
+            self._keys = dict(keys)
+            self._expires_at = time.monotonic() + max_age
+            self._last_fetch = time.monotonic()
+            self.fetches += 1
+
+    def _try_refresh(self) -> bool:
+        """
+        Renova as chaves sem propagar falhas de rede (timeout, DNS, 5xx).
+
+        Returns:
+            True se a busca funcionou; em caso de falha as chaves atuais são
+            mantidas e a próxima tentativa só ocorre após o intervalo mínimo
+        """
+        try:
+            self._refresh()
+            return True
+        except Exception:
+            self.fetch_errors += 1
+            logger.warning("Falha ao buscar chaves do Firebase", exc_info=True)
+            with self._lock:
+                self._last_fetch = time.monotonic()
+                if self._keys:
+                    # Continua servindo as chaves antigas até a próxima tentativa
+                    self._expires_at = self._last_fetch + CERTS_FORCED_REFRESH_INTERVAL_SECONDS
+            return False
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self._refresh()
+            self.background_refreshes += 1
+        except Exception:
+            logger.warning("Falha ao renovar chaves do Firebase em background", exc_info=True)
+        finally:
+            self._refreshing = False
+
+    def get(self, kid: str) -> Optional[str]:
+        """
+        Retorna o certificado PEM para o "kid" informado.
+
+        Args:
+            kid: Identificador da chave presente no header do JWT
+
+        Returns:
+            Certificado PEM, ou None se a chave não existir
+
+        Raises:
+            SigningKeysUnavailable: Se a busca falhar e não houver chaves em cache
+        """
+        now = time.monotonic()
+        if now >= self._expires_at:
+            if not self._try_refresh() and not self._keys:
+                raise SigningKeysUnavailable("Chaves públicas do Firebase indisponíveis")
+        elif self._expires_at - now < CERTS_REFRESH_MARGIN_SECONDS and not self._refreshing:
+            self._refreshing = True
+            threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+        key = self._keys.get(kid)
+        if key is None and now - self._last_fetch > CERTS_FORCED_REFRESH_INTERVAL_SECONDS:
+            # Rotação de chaves antes do max-age: tenta uma busca imediata
+            if self._try_refresh():
+                key = self._keys.get(kid)
+        return key
+
+    def clear(self) -> None:
+        """Descarta as chaves em cache (a próxima verificação fará nova busca)."""
+        with self._lock:
+            self._keys = {}
+            self._expires_at = 0.0
+            self._last_fetch = 0.0
+
+    def stats(self) -> dict:
+        """Retorna contadores de busca das chaves."""
+        return {
+            "keys": len(self._keys),
+            "expires_in_seconds": max(0, round(self._expires_at - time.monotonic())),
+            "fetches": self.fetches,
+            "background_refreshes": self.background_refreshes,
+            "fetch_errors": self.fetch_errors,
+        }
+
+
+signing_keys = SigningKeyCache()
+verified_tokens = TTLCache(maxsize=settings.firebase_token_cache_size, ttl=settings.firebase_token_cache_ttl_seconds)
+
+_firebase_app_lock = threading.Lock()
+
+
+def get_project_id() -> Optional[str]:
+    """Obtém o project id do Firebase (FIREBASE_PROJECT_ID ou da service account)."""
+    if settings.firebase_project_id:
+        return settings.firebase_project_id
+    if settings.firebase_service_account_key:
+        return json.loads(settings.firebase_service_account_key).get("project_id")
+    return None
+
+
+def get_firebase_app():
+    """
+    Inicializa o Firebase Admin SDK no primeiro uso (e não no import do módulo).
+
+    Returns:
+        App padrão do firebase_admin
+    """
+    import firebase_admin
+    from firebase_admin import credentials
+
+    with _firebase_app_lock:
+        if not firebase_admin._apps:
+            if settings.firebase_service_account_key:
+                cred = credentials.Certificate(json.loads(settings.firebase_service_account_key))
+                firebase_admin.initialize_app(cred)
+            else:
+                firebase_admin.initialize_app()
+        return firebase_admin.get_app()
+
+
+def _decode_with_cached_keys(id_token: str, project_id: str) -> dict:
+    from jose import JWTError, jwt
+
+    try:
+        header = jwt.get_unverified_header(id_token)
+    except JWTError as exc:
+        raise InvalidIdToken(str(exc)) from exc
+
+    if header.get("alg") != "RS256":
+        raise InvalidIdToken("Algoritmo de assinatura inesperado")
+    certificate = signing_keys.get(header.get("kid", ""))
+    if certificate is None:
+        raise InvalidIdToken("Chave de assinatura desconhecida")
+
+    try:
+        claims = jwt.decode(
+            id_token,
+            certificate,
+            algorithms=["RS256"],
+            audience=project_id,
+            issuer=f"https://securetoken.google.com/{project_id}",
+            options={"verify_at_hash": False},
+        )
+    except JWTError as exc:
+        raise InvalidIdToken(str(exc)) from exc
+
+    if not claims.get("sub") or claims.get("auth_time", 0) > time.time():
+        raise InvalidIdToken("Claims do token inválidos")
+    claims.setdefault("uid", claims["sub"])
+    return claims
+
+
+def _decode_with_sdk(id_token: str) -> dict:
+    import firebase_admin
+    from firebase_admin import auth as firebase_auth
+
+    try:
+        return firebase_auth.verify_id_token(id_token, app=get_firebase_app())
+    except (firebase_admin.exceptions.FirebaseError, ValueError) as exc:
+        raise InvalidIdToken(str(exc)) from exc
+
+
+def verify_id_token(id_token: str) -> dict:
+    """
+    Verifica um ID token do Firebase e retorna os dados do usuário.
+    Bloqueante (pode buscar chaves na rede): execute fora do event loop.
+
+    Args:
+        id_token: Token ID fornecido pelo Firebase Authentication
+
+    Returns:
+        Dicionário com email, name, picture e sub
+
+    Raises:
+        InvalidIdToken: Se o token for inválido ou expirado
+        SigningKeysUnavailable: Se as chaves públicas não puderem ser obtidas
+    """
+    cache_key = hashlib.sha256(id_token.encode()).hexdigest()
+    user_data = verified_tokens.get(cache_key)
+    if user_data is not None:
+        return user_data
+
+    project_id = get_project_id()
+    if project_id:
+        claims = _decode_with_cached_keys(id_token, project_id)
+    else:
+        claims = _decode_with_sdk(id_token)
+
+    user_data = {
+        "email": claims.get("email"),
+        "name": claims.get("name"),
+        "picture": claims.get("picture"),
+        "sub": claims.get("uid"),
+    }
+    verified_tokens.set(cache_key, user_data, ttl=claims.get("exp", 0) - time.time())
+    return user_data
+
+
+metrics.register("firebase_signing_keys", signing_keys.stats)
+metrics.register("firebase_verified_tokens", verified_tokens.stats)
@@ -0,0 +1,240 @@
+"""
+Auditoria de índices: executa EXPLAIN nas consultas dos routers e aponta full scans.
+
+Cada consulta abaixo espelha o formato (filtros e ordenação) de uma consulta
+real dos routers. Ao criar ou alterar um endpoint, adicione/atualize a consulta
+correspondente em audit_queries() para que regressões de índice sejam detectadas.
+"""
+
+import json
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import extract, func, select, tuple_
+from sqlalchemy.engine import Engine
+
+from .feeds import NOTIFICATION_COLUMNS, interview_feed_query
+from .models import Application, Interview, InterviewStatusEnum, StatusEnum, User, UserStats
+
+
+def audit_queries() -> List[Tuple[str, object]]:
+    """
+    Retorna as consultas auditadas como pares (nome, statement).
+    Os parâmetros são valores de exemplo; o plano depende só do formato da consulta.
+    """
+    user_id = 1
+    now = datetime.utcnow()
+    week_end = now + timedelta(days=7)
+
+    interviews_feed = interview_feed_query(user_id)
+    scheduled = (
+        Interview.status == InterviewStatusEnum.SCHEDULED,
+        Interview.interview_datetime >= now,
+    )
+
+    return [
+        ("auth.get_user_by_email", select(User).where(User.email == "user@example.com").limit(1)),
+        (
+            "applications.get_applications",
+            select(Application)
+            .where(Application.user_id == user_id)
+            .order_by(Application.created_at.desc(), Application.id.desc())
+            .limit(51),
+        ),
+        (
+            "applications.get_applications[cursor]",
+            select(Application)
+            .where(
+                Application.user_id == user_id,
+                tuple_(Application.created_at, Application.id) < (now, 1000),
+            )
+            .order_by(Application.created_at.desc(), Application.id.desc())
+            .limit(51),
+        ),
+        (
+            "applications.get_applications[sort=data]",
+            select(Application)
+            .where(Application.user_id == user_id)
+            .order_by(Application.data.desc(), Application.id.desc())
+            .limit(51),
+        ),
+        (
+            "applications.get_applications[sort=empresa]",
+            select(Application)
+            .where(
+                Application.user_id == user_id,
+                tuple_(Application.empresa, Application.id) > ("Empresa", 1000),
+            )
+            .order_by(Application.empresa.asc(), Application.id.asc())
+            .limit(51),
+        ),
+        (
+            "applications.get_applications[status]",
+            select(Application)
+            .where(Application.user_id == user_id, Application.status == StatusEnum.ENTREVISTA)
+            .order_by(Application.created_at.desc(), Application.id.desc())
+            .limit(51),
+        ),
+        (
+            "applications.get_applications[from/to]",
+            select(Application)
+            .where(
+                Application.user_id == user_id,
+                Application.data >= date(2024, 1, 1),
+                Application.data <= date(2024, 12, 31),
+            )
+            .order_by(Application.created_at.desc(), Application.id.desc())
+            .limit(51),
+        ),
+        (
+            "applications.get_application",
+            select(Application).where(Application.id == 1, Application.user_id == user_id),
+        ),
+        (
+            "applications.export_applications",
+            select(Application.id, Application.nome, Application.created_at)
+            .where(Application.user_id == user_id)
+            .order_by(Application.created_at.asc(), Application.id.asc()),
+        ),
+        (
+            "interviews.get_interviews",
+            interviews_feed.order_by(Interview.interview_datetime.desc()),
+        ),
+        (
+            "interviews.get_interviews[application_id]",
+            interviews_feed
+            .where(Interview.application_id == 1)
+            .order_by(Interview.interview_datetime.desc()),
+        ),
+        (
+            "interviews.get_upcoming_interviews",
+            interviews_feed.where(*scheduled).order_by(Interview.interview_datetime.asc()).limit(5),
+        ),
+        (
+            "interviews.get_interview",
+            select(Interview).where(Interview.id == 1, Interview.user_id == user_id),
+        ),
+        (
+            "interviews.export_interviews",
+            interviews_feed.order_by(Interview.interview_datetime.asc(), Interview.id.asc()),
+        ),
+        (
+            "notifications.get_notifications",
+            interview_feed_query(user_id, NOTIFICATION_COLUMNS)
+            .where(*scheduled, Interview.interview_datetime < week_end)
+            .order_by(Interview.interview_datetime.asc()),
+        ),
+        (
+            "users.get_user_stats",
+            select(UserStats).where(UserStats.user_id == user_id),
+        ),
+        (
+            "user_stats.compute[status]",
+            select(Application.status, func.count(Application.id))
+            .where(Application.user_id == user_id)
+            .group_by(Application.status),
+        ),
+        (
+            "user_stats.compute[empresa]",
+            select(Application.empresa, func.count(Application.id))
+            .where(Application.user_id == user_id)
+            .group_by(Application.empresa),
+        ),
+        (
+            "user_stats.compute[mes]",
+            select(extract("year", Application.data), extract("month", Application.data), func.count())
+            .where(Application.user_id == user_id)
+            .group_by(extract("year", Application.data), extract("month", Application.data)),
+        ),
+        (
+            "user_stats.compute[primeira]",
+            select(Application.id, Application.data)
+            .where(Application.user_id == user_id)
+            .order_by(Application.created_at.asc(), Application.id.asc())
+            .limit(1),
+        ),
+        (
+            "user_stats.compute[ultima_entrevista]",
+            select(Application.id, Application.data)
+            .where(Application.user_id == user_id, Application.status == StatusEnum.ENTREVISTA)
+            .order_by(Application.updated_at.desc(), Application.id.desc())
+            .limit(1),
+        ),
+    ]
+
+
+def _explain_sqlite(connection, statement) -> Tuple[List[str], List[str], List[str]]:
+    compiled = statement.compile(dialect=connection.dialect)
+    params = tuple(compiled.construct_params()[name] for name in compiled.positiontup)
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+
+    plan = [row[-1] for row in rows]
+    scans = [d for d in plan if d.startswith("SCAN ") and "INDEX" not in d]
+    sorts = [d for d in plan if "TEMP B-TREE" in d]
+    return plan, scans, sorts
+
+
+def _walk_pg_plan(node: dict) -> Iterable[dict]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk_pg_plan(child)
+
+
+def _explain_postgresql(connection, statement) -> Tuple[List[str], List[str], List[str]]:
+    compiled = statement.compile(dialect=connection.dialect)
+    result = connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}",
+        compiled.construct_params(),
+    ).scalar()
+    document = result if isinstance(result, list) else json.loads(result)
+
+    nodes = list(_walk_pg_plan(document[0]["Plan"]))
+    plan = [
+        f'{node["Node Type"]} {node.get("Relation Name", "")} {node.get("Index Name", "")}'.strip()
+        for node in nodes
+    ]
+    scans = [p for p, node in zip(plan, nodes) if node["Node Type"] == "Seq Scan"]
+    sorts = [p for p, node in zip(plan, nodes) if node["Node Type"] in ("Sort", "Incremental Sort")]
+    return plan, scans, sorts
+
+
+def run_audit(engine: Engine, verbose: bool = False) -> int:
+    """
+    Executa EXPLAIN em todas as consultas auditadas e imprime um relatório.
+
+    Args:
+        engine: Engine síncrono apontando para o banco configurado
+        verbose: Se True, imprime o plano completo de cada consulta
+
+    Returns:
+        Quantidade de consultas com full scan (0 = nenhuma regressão)
+    """
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        explain = _explain_sqlite
+    elif dialect == "postgresql":
+        explain = _explain_postgresql
+    else:
+        raise RuntimeError(f"Dialeto não suportado pela auditoria: {dialect}")
+
+    flagged = 0
+    with engine.connect() as connection:
+        for name, statement in audit_queries():
+            plan, scans, sorts = explain(connection, statement)
+            status = "FULL SCAN" if scans else "ok"
+            if scans:
+                flagged += 1
+            print(f"[{status:^9}] {name}")
+            for detail in scans:
+                print(f"             full scan: {detail}")
+            for detail in sorts:
+                print(f"             ordenação sem índice: {detail}")
+            if verbose:
+                for detail in plan:
+                    print(f"             | {detail}")
+
+    if dialect == "postgresql":
+        print("\nObs: em tabelas pequenas o Postgres pode preferir Seq Scan mesmo com índice; "
+              "rode ANALYZE e audite com volume realista.")
+    print(f"\n{flagged} consulta(s) com full scan")
+    return flagged
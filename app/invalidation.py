@@ -0,0 +1,341 @@
+"""
+Barramento de invalidação de caches entre os workers.
+
+Com vários workers (gunicorn), cada processo tem os próprios caches em memória:
+principals do auth e conexões SSE do hub de notificações. Quando os dados ou os
+tokens de um usuário mudam, o worker que atendeu a escrita aplica a invalidação
+localmente na hora e a publica no barramento, e os demais workers aplicam o
+mesmo handler ao recebê-la.
+
+Backends (INVALIDATION_BACKEND):
+    postgres: LISTEN/NOTIFY numa conexão asyncpg dedicada
+    sqlite:   tabela num arquivo SQLite consultada a cada INVALIDATION_POLL_SECONDS
+              (substituto do LISTEN/NOTIFY para rodar vários workers localmente)
+    local:    só o próprio processo (um único worker)
+    auto:     postgres para DATABASE_URL Postgres, sqlite para SQLite em arquivo
+
+Mensagens publicadas com o backend fora do ar ficam na fila e são enviadas na
+reconexão. As recebidas nesse intervalo se perdem, então ao reconectar os
+handlers de reset descartam os caches inteiros.
+
+O ETag das listagens não depende do barramento: a versão de dados fica no banco.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from . import metrics
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Tópicos: o payload é sempre o id do usuário afetado
+USER_DATA = "user_data"  # candidaturas/entrevistas do usuário mudaram
+USER_TOKENS = "user_tokens"  # tokens do usuário foram revogados (troca de senha)
+
+POSTGRES_CHANNEL = "cache_invalidation"
+
+# Verificação periódica da conexão de LISTEN (conexões ociosas morrem em silêncio)
+POSTGRES_HEALTHCHECK_SECONDS = 30
+
+# Mensagens mais antigas que isso são apagadas da tabela do backend SQLite
+SQLITE_RETENTION_SECONDS = 60
+
+RECONNECT_MAX_DELAY_SECONDS = 30
+
+
+class _PostgresBackend:
+    """LISTEN/NOTIFY numa conexão asyncpg própria (fora do pool da aplicação)."""
+
+    name = "postgres"
+
+    def __init__(self, url: str):
+        # asyncpg aceita postgresql://; remove o driver do SQLAlchemy (+psycopg2, +asyncpg)
+        self.dsn = "postgresql://" + url.split("://", 1)[1]
+        self._conn = None
+        self._lock = asyncio.Lock()
+        self._lost: Optional[asyncio.Event] = None
+
+    async def connect(self, on_message: Callable[[str], None]) -> None:
+        import asyncpg
+
+        self._lost = asyncio.Event()
+        self._conn = await asyncpg.connect(self.dsn)
+        self._conn.add_termination_listener(lambda connection: self._lost.set())
+        await self._conn.add_listener(
+            POSTGRES_CHANNEL, lambda connection, pid, channel, payload: on_message(payload)
+        )
+
+    async def send(self, payload: str) -> None:
+        async with self._lock:
+            await self._conn.execute("SELECT pg_notify($1, $2)", POSTGRES_CHANNEL, payload)
+
+    async def wait_closed(self) -> None:
+        while not self._conn.is_closed():
+            try:
+                await asyncio.wait_for(self._lost.wait(), POSTGRES_HEALTHCHECK_SECONDS)
+                return
+            except asyncio.TimeoutError:
+                async with self._lock:
+                    await self._conn.execute("SELECT 1", timeout=10)
+
+    async def close(self) -> None:
+        if self._conn is not None and not self._conn.is_closed():
+            try:
+                await asyncio.wait_for(self._conn.close(), 5)
+            except Exception:
+                self._conn.terminate()
+        self._conn = None
+
+
+class _SQLiteBackend:
+    """Tabela de mensagens num arquivo SQLite compartilhado, lida por polling."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, poll_seconds: float):
+        self.path = path
+        self.poll_seconds = poll_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._poller: Optional[asyncio.Task] = None
+
+    def _open(self) -> None:
+        self._conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS invalidations ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._last_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM invalidations").fetchone()[0]
+
+    def _insert(self, payload: str) -> None:
+        with self._lock:
+            now = time.time()
+            self._conn.execute("INSERT INTO invalidations (payload, created_at) VALUES (?, ?)", (payload, now))
+            self._conn.execute("DELETE FROM invalidations WHERE created_at < ?", (now - SQLITE_RETENTION_SECONDS,))
+
+    def _fetch(self) -> list:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, payload FROM invalidations WHERE id > ? ORDER BY id", (self._last_id,)
+            ).fetchall()
+
+    async def connect(self, on_message: Callable[[str], None]) -> None:
+        await asyncio.to_thread(self._open)
+        self._poller = asyncio.get_running_loop().create_task(self._poll(on_message))
+
+    async def _poll(self, on_message: Callable[[str], None]) -> None:
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            for row_id, payload in await asyncio.to_thread(self._fetch):
+                self._last_id = row_id
+                on_message(payload)
+
+    async def send(self, payload: str) -> None:
+        await asyncio.to_thread(self._insert, payload)
+
+    async def wait_closed(self) -> None:
+        # Só retorna se o polling falhar (a exceção é propagada)
+        await self._poller
+
+    async def close(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except BaseException:
+                pass
+            self._poller = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def _sqlite_path() -> str:
+    if settings.invalidation_sqlite_path:
+        return settings.invalidation_sqlite_path
+    # Ao lado do banco SQLite da aplicação: workers que compartilham o banco compartilham o barramento
+    if settings.database_url and settings.database_url.startswith("sqlite"):
+        database_path = settings.database_url.split(":///", 1)[-1]
+        if database_path and ":memory:" not in database_path:
+            return database_path + "-invalidation"
+    return os.path.join(tempfile.gettempdir(), "jobtracker-invalidation.db")
+
+
+def _backend_name() -> str:
+    name = settings.invalidation_backend
+    if name != "auto":
+        return name
+    url = settings.database_url or ""
+    if url.startswith("postgresql"):
+        return "postgres"
+    if url.startswith("sqlite") and ":memory:" not in url:
+        return "sqlite"
+    return "local"
+
+
+class InvalidationBus:
+    """Distribui invalidações por usuário entre os workers."""
+
+    def __init__(self):
+        self.origin = ""
+        self._handlers: Dict[str, List[Callable[[int], object]]] = defaultdict(list)
+        self._reset_handlers: List[Callable[[], object]] = []
+        self._backend = None
+        self._outbox: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._connected = False
+        self._published = 0
+        self._received = 0
+        self._errors = 0
+        self._reconnects = 0
+
+    def subscribe(self, topic: str, handler: Callable[[int], object], reset: Optional[Callable[[], object]] = None) -> None:
+        """
+        Registra o handler de um tópico (executado no event loop de cada worker).
+
+        Args:
+            topic: USER_DATA ou USER_TOKENS
+            handler: Recebe o id do usuário afetado
+            reset: Descarta o cache inteiro quando mensagens podem ter sido perdidas
+        """
+        self._handlers[topic].append(handler)
+        if reset is not None:
+            self._reset_handlers.append(reset)
+
+    def publish(self, topic: str, user_id: int) -> None:
+        """Aplica a invalidação neste worker e a envia aos demais (chamar após o commit)."""
+        self._dispatch(topic, user_id)
+        self._published += 1
+        if self._outbox is not None:
+            self._outbox.put_nowait(json.dumps({"origin": self.origin, "topic": topic, "user_id": user_id}))
+
+    def _dispatch(self, topic: str, user_id: int) -> None:
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler(user_id)
+            except Exception:
+                logger.exception("Falha no handler de invalidação %s", topic)
+
+    def _receive(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Mensagem de invalidação inválida: %r", payload)
+            return
+        if message.get("origin") == self.origin:
+            return
+        self._received += 1
+        self._dispatch(message["topic"], message["user_id"])
+
+    def _reset(self) -> None:
+        for reset in self._reset_handlers:
+            try:
+                reset()
+            except Exception:
+                logger.exception("Falha no reset de cache após reconexão do barramento")
+
+    async def start(self) -> None:
+        """Conecta ao backend em background (chamado no startup de cada worker)."""
+        # Identifica as mensagens deste worker (o NOTIFY também é entregue a quem o enviou).
+        # Definido aqui, e não no import: com preload, os workers são forks do mesmo processo
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        name = _backend_name()
+        if name == "postgres":
+            self._backend = _PostgresBackend(settings.database_url)
+        elif name == "sqlite":
+            self._backend = _SQLiteBackend(_sqlite_path(), settings.invalidation_poll_seconds)
+        elif name == "local":
+            return
+        else:
+            raise RuntimeError(f"INVALIDATION_BACKEND desconhecido: {name}")
+        self._outbox = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        delay = 1
+        pending: Optional[str] = None
+        connected_before = False
+        while True:
+            try:
+                await self._backend.connect(self._receive)
+                if connected_before:
+                    self._reconnects += 1
+                    self._reset()
+                connected_before = self._connected = True
+                delay = 1
+                pending = await self._pump(pending)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._errors += 1
+                logger.warning("Barramento de invalidação (%s) indisponível", self._backend.name, exc_info=True)
+            finally:
+                self._connected = False
+                await self._backend.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY_SECONDS)
+
+    async def _pump(self, pending: Optional[str]) -> Optional[str]:
+        """Envia a fila até o backend cair; retorna a mensagem que ficou sem envio."""
+        lost = asyncio.ensure_future(self._backend.wait_closed())
+        try:
+            while True:
+                if pending is None:
+                    next_message = asyncio.ensure_future(self._outbox.get())
+                    await asyncio.wait({next_message, lost}, return_when=asyncio.FIRST_COMPLETED)
+                    if not next_message.done():
+                        next_message.cancel()
+                        lost.result()
+                        return None
+                    pending = next_message.result()
+                await self._backend.send(pending)
+                pending = None
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._errors += 1
+            logger.warning("Barramento de invalidação (%s) desconectado", self._backend.name, exc_info=True)
+            return pending
+        finally:
+            if lost.done() and not lost.cancelled():
+                lost.exception()  # já tratada: evita o aviso de exceção não recuperada
+            lost.cancel()
+
+    async def stop(self) -> None:
+        """Encerra a conexão com o backend (chamado no shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._outbox = None
+
+    def stats(self) -> dict:
+        return {
+            "backend": self._backend.name if self._backend is not None else "local",
+            "connected": self._connected,
+            "published": self._published,
+            "received": self._received,
+            "queued": self._outbox.qsize() if self._outbox is not None else 0,
+            "errors": self._errors,
+            "reconnects": self._reconnects,
+        }
+
+
+invalidation_bus = InvalidationBus()
+
+metrics.register("invalidation_bus", invalidation_bus.stats)
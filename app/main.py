@@ -3,17 +3,48 @@ Aplicação principal FastAPI para o Job Application Tracker.
 Sistema para gerenciamento de candidaturas de emprego com autenticação JWT e Google OAuth.
 """
 
-import os
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import RedirectResponse
+
+from . import passwords
+from .assets import DIST_DIR, FRONTEND_DIR, IndexPage, PrecompressedStaticFiles, built
+from .compression import CompressionMiddleware
+from .database import dispose_engines
+from .invalidation import invalidation_bus
+from .notification_hub import notification_hub
+from .query_stats import QueryStatsMiddleware
+from .settings import settings
+from .routers import (
+    auth_router,
+    applications,
+    users,
+    google_auth,
+    config,
+    interviews,
+    notifications,
+    metrics,
+    search
+)
+
+# O schema é gerenciado por migrações (python -m app.manage migrate), executadas
+# uma única vez antes de iniciar os workers; a inicialização não executa DDL.
 
-from .database import engine, Base
-from .routers import auth_router, applications, users, google_auth, config, interviews, notifications
 
-# Cria todas as tabelas do banco de dados na inicialização
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Ciclo de vida da aplicação (executado em cada worker): conecta o barramento
+    de invalidação e libera recursos de background e conexões no shutdown.
+    """
+    await invalidation_bus.start()
+    yield
+    await invalidation_bus.stop()
+    await notification_hub.shutdown()
+    passwords.shutdown()
+    await dispose_engines()
+
 
 # Inicializa a aplicação FastAPI
 app = FastAPI(
@@ -21,24 +52,32 @@ app = FastAPI(
     description="API para gerenciar candidaturas de emprego com autenticação JWT",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
-# Monta diretório de arquivos estáticos (CSS, JS, imagens)
-app.mount("/static", StaticFiles(directory="frontend/static"), name="static")
+# Arquivos estáticos: saída do build (nomes com hash + .br/.gz) ou, sem build, o frontend como está
+ASSETS_DIR = DIST_DIR if built() else FRONTEND_DIR
+app.mount("/static", PrecompressedStaticFiles(directory=ASSETS_DIR / "static"), name="static")
+index_page = IndexPage(ASSETS_DIR / "index.html")
 
 # Configuração de CORS para permitir requisições do frontend
-cors_origins = os.getenv("CORS_ORIGINS", "").split(",") if os.getenv("CORS_ORIGINS") else [
-    "http://localhost:8000",
-]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=cors_origins,
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    # Cursor das listagens paginadas, validador do GET condicional e métricas de SQL
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
 
+# Contagem/tempo de SQL por requisição no cabeçalho Server-Timing e log de requisições lentas
+app.add_middleware(QueryStatsMiddleware)
+
+# Compressão brotli/gzip das respostas dinâmicas (o mais externo: comprime o que os outros produzem)
+app.add_middleware(CompressionMiddleware)
+
 # Registra os routers da aplicação
 app.include_router(auth_router.router)
 app.include_router(applications.router)
@@ -47,6 +86,8 @@ app.include_router(google_auth.router)
 app.include_router(config.router)
 app.include_router(interviews.router)
 app.include_router(notifications.router)
+app.include_router(search.router)
+app.include_router(metrics.router)
 
 @app.get("/", tags=["Root"])
 def root():
@@ -76,9 +117,9 @@ def api_info():
 
 
 @app.get("/app", tags=["Frontend"])
-def serve_frontend():
-    """Serve a interface web (SPA) do Job Tracker."""
-    return FileResponse("frontend/index.html")
+def serve_frontend(request: Request):
+    """Serve a interface web (SPA) do Job Tracker, da memória e com ETag."""
+    return index_page.response(request)
 
 
 @app.get("/health", tags=["Health"])
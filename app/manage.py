@@ -0,0 +1,128 @@
+"""
+Comandos de manutenção da aplicação.
+
+Uso:
+    python -m app.manage migrate [revision]
+    python -m app.manage audit-indexes [--verbose]
+    python -m app.manage rebuild-stats
+    python -m app.manage check-stats
+    python -m app.manage build-assets
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Revisão equivalente ao schema criado pelo antigo Base.metadata.create_all
+LEGACY_BASELINE_REVISION = "0001"
+
+
+def migrate(args: argparse.Namespace) -> int:
+    """
+    Aplica as migrações pendentes (passo único antes de iniciar os workers).
+    Bancos criados pelo antigo create_all (sem alembic_version) são marcados
+    com a revisão inicial antes do upgrade.
+    """
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import inspect
+
+    from .database import engine
+
+    config = Config(str(ROOT_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT_DIR / "migrations"))
+
+    tables = inspect(engine).get_table_names()
+    if "alembic_version" not in tables and "users" in tables:
+        print(f"Banco sem versionamento detectado; marcando revisão {LEGACY_BASELINE_REVISION}")
+        command.stamp(config, LEGACY_BASELINE_REVISION)
+
+    command.upgrade(config, args.revision)
+    return 0
+
+
+def audit_indexes(args: argparse.Namespace) -> int:
+    """Executa EXPLAIN nas consultas dos routers e falha se houver full scans."""
+    from .database import engine
+    from .index_audit import run_audit
+
+    flagged = run_audit(engine, verbose=args.verbose)
+    return 1 if flagged else 0
+
+
+def _run_with_session(func):
+    """Executa func(db) numa sessão própria e fecha os engines ao final."""
+    from .database import dispose_engines, session_scope
+
+    async def run():
+        try:
+            async with session_scope() as db:
+                return await func(db)
+        finally:
+            await dispose_engines()
+
+    return asyncio.run(run())
+
+
+def rebuild_stats(args: argparse.Namespace) -> int:
+    """Recalcula a tabela user_stats de todos os usuários (backfill após a migração)."""
+    from .user_stats import rebuild_all
+
+    print(f"Estatísticas recalculadas para {_run_with_session(rebuild_all)} usuário(s)")
+    return 0
+
+
+def check_stats(args: argparse.Namespace) -> int:
+    """Compara user_stats com um recálculo completo e falha se houver divergências."""
+    from .user_stats import check_all
+
+    problems = _run_with_session(check_all)
+    for problem in problems:
+        print(problem)
+    print("Estatísticas consistentes" if not problems else f"{len(problems)} divergência(s)")
+    return 1 if problems else 0
+
+
+def build_assets(args: argparse.Namespace) -> int:
+    """Gera frontend/dist: assets com hash no nome, index.html reescrito e variantes .gz/.br."""
+    from .assets import DIST_DIR, brotli, build_assets as build
+
+    manifest = build()
+    for name, hashed in sorted(manifest.items()):
+        print(f"{name} -> {hashed}")
+    if brotli is None:
+        print("Módulo brotli não instalado: apenas variantes .gz geradas")
+    print(f"Assets gerados em {DIST_DIR}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.manage", description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    upgrade = subparsers.add_parser("migrate", help="aplica as migrações do schema")
+    upgrade.add_argument("revision", nargs="?", default="head", help="revisão alvo (padrão: head)")
+    upgrade.set_defaults(func=migrate)
+
+    audit = subparsers.add_parser("audit-indexes", help="EXPLAIN das consultas dos routers, apontando full scans")
+    audit.add_argument("--verbose", "-v", action="store_true", help="imprime o plano completo")
+    audit.set_defaults(func=audit_indexes)
+
+    rebuild = subparsers.add_parser("rebuild-stats", help="recalcula as estatísticas de todos os usuários")
+    rebuild.set_defaults(func=rebuild_stats)
+
+    check = subparsers.add_parser("check-stats", help="verifica user_stats contra um recálculo completo")
+    check.set_defaults(func=check_stats)
+
+    assets = subparsers.add_parser("build-assets", help="versiona e pré-comprime os arquivos do frontend")
+    assets.set_defaults(func=build_assets)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+"""
+Registro de métricas internas da aplicação.
+Cada subsistema registra uma função que devolve um snapshot (dict) dos seus contadores.
+"""
+
+from typing import Callable, Dict
+
+_collectors: Dict[str, Callable[[], dict]] = {}
+
+
+def register(name: str, collector: Callable[[], dict]) -> None:
+    """
+    Registra um coletor de métricas sob um nome.
+
+    Args:
+        name: Nome da seção no snapshot (ex: "auth_cache")
+        collector: Função sem argumentos que retorna um dict serializável
+    """
+    _collectors[name] = collector
+
+
+def snapshot() -> dict:
+    """Coleta e retorna as métricas de todos os subsistemas registrados."""
+    return {name: collector() for name, collector in _collectors.items()}
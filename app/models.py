@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import JSON, Column, Integer, String, Date, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -49,6 +49,8 @@ class User(Base):
         id: Identificador único do usuário
         email: Email do usuário (único e indexado)
         hashed_password: Senha hasheada com bcrypt
+        token_version: Versão dos tokens emitidos (incrementada para invalidá-los)
+        data_version: Versão dos dados (incrementada a cada escrita em candidaturas/entrevistas)
         created_at: Data e hora de criação da conta
         applications: Relação com as candidaturas do usuário
     """
@@ -57,6 +59,8 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relacionamento 1:N com Application (um usuário tem várias candidaturas)
@@ -71,7 +75,7 @@ class Application(Base):
         id: Identificador único da candidatura
         nome: Nome/título da vaga
         empresa: Nome da empresa
-        data: Data da candidatura (formato YYYY-MM-DD)
+        data: Data da candidatura
         status: Status atual da candidatura (esperando, rejeitado, entrevista)
         chance: Percentual estimado de sucesso (0-100)
         role: Cargo/função da vaga
@@ -81,11 +85,21 @@ class Application(Base):
         owner: Relação com o usuário dono
     """
     __tablename__ = "applications"
+    __table_args__ = (
+        # Listagem: user_id = ? ORDER BY created_at DESC
+        Index("ix_applications_user_created", "user_id", "created_at"),
+        # Contagens por status e última entrevista (ORDER BY updated_at)
+        Index("ix_applications_user_status", "user_id", "status", "updated_at"),
+        # Agrupamento por empresa nas estatísticas
+        Index("ix_applications_user_empresa", "user_id", "empresa"),
+        # Filtros por período e agregação por mês da data da candidatura
+        Index("ix_applications_user_data", "user_id", "data"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String, nullable=False)  # Nome da vaga
     empresa = Column(String, nullable=False)  # Nome da empresa
-    data = Column(String, nullable=False)  # Data da candidatura
+    data = Column(Date, nullable=False)  # Data da candidatura
     status = Column(SQLEnum(StatusEnum), default=StatusEnum.ESPERANDO)  # Status atual
     chance = Column(Integer, default=50)  # Chance de sucesso (0-100)
     role = Column(String, nullable=False)  # Cargo/função
@@ -109,6 +123,7 @@ class Interview(Base):
     Attributes:
         id: Identificador único da entrevista
         application_id: ID da candidatura relacionada
+        user_id: ID do dono da candidatura (desnormalizado para filtrar sem junção)
         interview_datetime: Data e hora da entrevista
         interview_type: Tipo da entrevista (phone, video, in_person, technical, behavioral, hr)
         interviewer_name: Nome do entrevistador
@@ -126,9 +141,18 @@ class Interview(Base):
         updated_at: Data da última atualização
     """
     __tablename__ = "interviews"
+    __table_args__ = (
+        # Entrevistas de uma candidatura (e junção com applications)
+        Index("ix_interviews_application_datetime", "application_id", "interview_datetime"),
+        # Listagem do usuário ordenada por data (sem junção com applications)
+        Index("ix_interviews_user_datetime", "user_id", "interview_datetime"),
+        # Entrevistas agendadas por período (próximas entrevistas e notificações)
+        Index("ix_interviews_user_status_datetime", "user_id", "status", "interview_datetime"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # Igual a application.user_id
 
     # Detalhes básicos da entrevista
     interview_datetime = Column(DateTime, nullable=False)
@@ -154,4 +178,39 @@ class Interview(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relacionamento N:1 com Application
-    application = relationship("Application", back_populates="interviews")
\ No newline at end of file
+    application = relationship("Application", back_populates="interviews")
+
+
+class UserStats(Base):
+    """
+    Estatísticas das candidaturas de um usuário, mantidas incrementalmente
+    pelas escritas em candidaturas (ver app.user_stats).
+
+    Attributes:
+        user_id: ID do usuário (chave primária)
+        total: Quantidade de candidaturas
+        esperando: Candidaturas com status esperando
+        entrevista: Candidaturas com status entrevista
+        rejeitado: Candidaturas com status rejeitado
+        empresa_counts: Candidaturas por empresa ({empresa: quantidade})
+        month_counts: Candidaturas por mês da data da candidatura ({"YYYY-MM": quantidade})
+        primeira_candidatura_id: Candidatura criada primeiro
+        primeira_candidatura: Data dessa candidatura
+        ultima_entrevista_id: Candidatura em entrevista atualizada por último
+        ultima_entrevista: Data dessa candidatura
+        updated_at: Data e hora da última atualização
+    """
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    esperando = Column(Integer, nullable=False, default=0)
+    entrevista = Column(Integer, nullable=False, default=0)
+    rejeitado = Column(Integer, nullable=False, default=0)
+    empresa_counts = Column(JSON, nullable=False, default=dict)
+    month_counts = Column(JSON, nullable=False, default=dict)
+    primeira_candidatura_id = Column(Integer, nullable=True)
+    primeira_candidatura = Column(Date, nullable=True)
+    ultima_entrevista_id = Column(Integer, nullable=True)
+    ultima_entrevista = Column(Date, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
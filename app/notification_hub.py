@@ -0,0 +1,129 @@
+"""
+Hub em processo para as notificações enviadas por Server-Sent Events.
+
+Cada conexão SSE assina o hub com uma fila de tamanho 1: um sinal pendente já
+significa "recalcule", então sinais repetidos são coalescidos. As escritas em
+entrevistas/candidaturas publicam USER_DATA no barramento de invalidação após
+o commit, que chama publish(user_id) em todos os workers.
+
+Um único agendador (uma task asyncio por worker) guarda o próximo instante em
+que as notificações de cada usuário conectado mudam sozinhas (virada do dia ou
+início da próxima entrevista) e sinaliza o usuário nesse momento. Não há laço
+de polling por conexão: uma conexão ociosa é só uma corrotina esperando a fila.
+"""
+
+import asyncio
+import heapq
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from . import metrics
+from .invalidation import USER_DATA, invalidation_bus
+
+
+class NotificationHub:
+    """Assinaturas por usuário e agendador único dos limites de lembrete."""
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._deadlines: Dict[int, float] = {}
+        self._heap: List[Tuple[float, int]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._scheduler: Optional[asyncio.Task] = None
+        self._signals_sent = 0
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        """Registra uma conexão do usuário e retorna a fila de sinais dela."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        self._ensure_scheduler()
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        """Remove a conexão; sem conexões, o usuário sai do agendador."""
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+            self._deadlines.pop(user_id, None)
+
+    def publish(self, user_id: int) -> None:
+        """Sinaliza as conexões do usuário para recalcular as notificações."""
+        for queue in self._subscribers.get(user_id, ()):
+            if queue.empty():
+                queue.put_nowait(True)
+                self._signals_sent += 1
+
+    def publish_all(self) -> None:
+        """Sinaliza todas as conexões (após perda de mensagens do barramento)."""
+        for user_id in list(self._subscribers):
+            self.publish(user_id)
+
+    def schedule(self, user_id: int, at: Optional[datetime]) -> None:
+        """
+        Agenda o próximo limite de lembrete do usuário.
+
+        Args:
+            user_id: Usuário conectado
+            at: Momento (UTC ingênuo, como no banco) em que as notificações mudam
+        """
+        if at is None or user_id not in self._subscribers:
+            return
+        deadline = (at - datetime(1970, 1, 1)).total_seconds()
+        if self._deadlines.get(user_id) == deadline:
+            return
+
+        self._deadlines[user_id] = deadline
+        heapq.heappush(self._heap, (deadline, user_id))
+        if self._wakeup is not None and self._heap[0] == (deadline, user_id):
+            self._wakeup.set()
+
+    def _ensure_scheduler(self) -> None:
+        if self._scheduler is None or self._scheduler.done():
+            self._wakeup = asyncio.Event()
+            self._scheduler = asyncio.get_running_loop().create_task(self._run_scheduler())
+
+    async def _run_scheduler(self) -> None:
+        while True:
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                deadline, user_id = heapq.heappop(self._heap)
+                # Entradas substituídas por um agendamento mais recente são ignoradas
+                if self._deadlines.get(user_id) == deadline:
+                    del self._deadlines[user_id]
+                    self.publish(user_id)
+
+            timeout = self._heap[0][0] - now if self._heap else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def shutdown(self) -> None:
+        """Encerra o agendador (chamado no shutdown da aplicação)."""
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+            try:
+                await self._scheduler
+            except asyncio.CancelledError:
+                pass
+            self._scheduler = None
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._subscribers),
+            "connections": sum(len(queues) for queues in self._subscribers.values()),
+            "scheduled_boundaries": len(self._deadlines),
+            "signals_sent": self._signals_sent,
+        }
+
+
+notification_hub = NotificationHub()
+
+metrics.register("notification_hub", notification_hub.stats)
+
+invalidation_bus.subscribe(USER_DATA, notification_hub.publish, reset=notification_hub.publish_all)
@@ -0,0 +1,67 @@
+"""
+Paginação por cursor (keyset) para as listagens.
+
+O cursor é opaco para o cliente: um JSON em base64url com a chave de ordenação,
+a direção e os valores da última linha entregue (coluna de ordenação + id).
+A página seguinte continua estritamente depois dessa linha, então o custo de
+cada página não depende de quantas páginas vieram antes.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Callable, Tuple
+
+from fastapi import HTTPException, status
+
+# Tamanho de página padrão e máximo aceito no parâmetro limit
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(sort: str, order: str, value: Any, last_id: int) -> str:
+    """
+    Gera o cursor da próxima página a partir da última linha entregue.
+
+    Args:
+        sort: Nome da chave de ordenação
+        order: Direção da ordenação ("asc" ou "desc")
+        value: Valor da coluna de ordenação na última linha
+        last_id: ID da última linha (desempate)
+
+    Returns:
+        Cursor opaco em base64url
+    """
+    if hasattr(value, "isoformat"):
+        value = value.isoformat()
+    payload = json.dumps({"s": sort, "o": order, "v": value, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, order: str, parse: Callable[[Any], Any]) -> Tuple[Any, int]:
+    """
+    Lê um cursor gerado por encode_cursor.
+
+    Args:
+        cursor: Cursor recebido do cliente
+        sort: Chave de ordenação da requisição atual
+        order: Direção da ordenação da requisição atual
+        parse: Converte o valor serializado de volta para o tipo da coluna
+
+    Returns:
+        Tupla (valor da coluna de ordenação, id) da última linha entregue
+
+    Raises:
+        HTTPException: Se o cursor for inválido ou de outra ordenação
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["s"] != sort or payload["o"] != order:
+            raise ValueError("cursor de outra ordenação")
+        return parse(payload["v"]), int(payload["id"])
+    except (binascii.Error, json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido para esta ordenação"
+        )
@@ -0,0 +1,201 @@
+"""
+Hash e verificação de senhas com bcrypt fora dos workers de requisição.
+
+O bcrypt é propositalmente caro; executá-lo no event loop ou no threadpool do
+FastAPI faz as demais requisições esperarem. Aqui o trabalho vai para um pool
+de processos dedicado e limitado, com limite de fila que responde 503 quando
+saturado. Este módulo é importado pelos processos do pool, então deve
+permanecer leve (sem banco, FastAPI app ou routers).
+"""
+
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+
+from . import metrics
+from .settings import settings
+
+_executor: Optional[Executor] = None
+_pending = 0
+_rejected = 0
+_completed = 0
+_failed = 0
+_pool_restarts = 0
+
+
+@functools.lru_cache(maxsize=None)
+def _pwd_context():
+    """
+    Contexto para hash de senhas usando bcrypt, criado no primeiro uso.
+
+    O passlib só é importado quando uma senha é de fato verificada ou gerada
+    (no processo do pool), não na inicialização do worker web. Hashes com custo
+    diferente de BCRYPT_ROUNDS são marcados como "needs_update".
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifica se a senha em texto plano corresponde ao hash armazenado.
+
+    Args:
+        plain_password: Senha em texto plano fornecida pelo usuário
+        hashed_password: Hash da senha armazenado no banco de dados
+
+    Returns:
+        True se a senha corresponder, False caso contrário
+        (inclusive quando o hash não é reconhecido, ex: contas Google)
+    """
+    try:
+        return _pwd_context().verify(plain_password, hashed_password)
+    except ValueError:
+        return False
+
+
+def get_password_hash(password: str) -> str:
+    """
+    Gera um hash bcrypt da senha fornecida.
+
+    Args:
+        password: Senha em texto plano para ser hasheada
+
+    Returns:
+        String com o hash da senha
+    """
+    return _pwd_context().hash(password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a senha e, se o hash estiver desatualizado, gera um novo.
+
+    Args:
+        plain_password: Senha em texto plano fornecida pelo usuário
+        hashed_password: Hash da senha armazenado no banco de dados
+
+    Returns:
+        Tupla (senha válida, novo hash ou None se não precisar atualizar)
+    """
+    try:
+        return _pwd_context().verify_and_update(plain_password, hashed_password)
+    except ValueError:
+        return False, None
+
+
+def _get_executor() -> Executor:
+    """Cria o pool de processos sob demanda (no primeiro uso, já dentro do worker)."""
+    global _executor
+    if _executor is None and settings.password_hash_workers > 0:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.password_hash_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def _busy():
+    # FastAPI importado aqui: os processos do pool só precisam do passlib/bcrypt
+    from fastapi import HTTPException, status
+
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Servidor ocupado, tente novamente em instantes",
+        headers={"Retry-After": str(settings.password_hash_retry_after_seconds)},
+    )
+
+
+def _discard_broken_pool(executor: Executor) -> None:
+    """Descarta o pool quebrado (ex: processo filho morto por OOM); o próximo uso cria outro."""
+    global _executor, _pool_restarts
+    # Várias chamadas podem falhar com o mesmo pool: só a primeira o substitui
+    if _executor is executor:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        _pool_restarts += 1
+
+
+async def _run(func, *args):
+    """
+    Executa uma função de hashing no pool, respeitando o limite de fila.
+
+    Se o pool quebrar (um processo filho morreu), ele é recriado e o trabalho
+    é tentado mais uma vez.
+
+    Raises:
+        HTTPException: 503 com Retry-After se houver trabalhos demais pendentes
+            ou se o pool recriado também falhar
+    """
+    global _pending, _rejected, _completed, _failed
+    if _pending >= settings.password_hash_max_pending:
+        _rejected += 1
+        raise _busy()
+
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor = _get_executor()
+            try:
+                result = await loop.run_in_executor(executor, func, *args)
+            except BrokenProcessPool:
+                _discard_broken_pool(executor)
+                if attempt == 0:
+                    continue
+                _failed += 1
+                raise _busy()
+            except Exception:
+                _failed += 1
+                raise
+            _completed += 1
+            return result
+    finally:
+        _pending -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Versão assíncrona de verify_password, executada no pool de hashing."""
+    return await _run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Versão assíncrona de get_password_hash, executada no pool de hashing."""
+    return await _run(get_password_hash, password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Versão assíncrona de verify_and_update_password, executada no pool de hashing."""
+    return await _run(verify_and_update_password, plain_password, hashed_password)
+
+
+def shutdown() -> None:
+    """Encerra o pool de processos (chamado no shutdown da aplicação)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def stats() -> dict:
+    """Retorna o estado atual do pool de hashing."""
+    return {
+        "workers": settings.password_hash_workers,
+        "max_pending": settings.password_hash_max_pending,
+        "pending": _pending,
+        "completed": _completed,
+        "failed": _failed,
+        "rejected": _rejected,
+        "pool_restarts": _pool_restarts,
+        "bcrypt_rounds": settings.bcrypt_rounds,
+    }
+
+
+metrics.register("password_hashing", stats)
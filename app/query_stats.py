@@ -0,0 +1,120 @@
+"""
+Instrumentação de SQL por requisição.
+
+Eventos do SQLAlchemy contam as instruções executadas e medem o tempo de banco;
+o middleware agrega os números da requisição corrente (via ContextVar) e os
+expõe no cabeçalho Server-Timing. Requisições acima de SLOW_REQUEST_LOG_MS são
+registradas no log com a instrução mais lenta.
+
+Exemplo de cabeçalho:
+    Server-Timing: db;dur=4.12;desc="3 queries", db-slowest;dur=2.05, app;dur=9.80
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestQueryStats:
+    """Métricas de SQL acumuladas durante uma requisição."""
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+    def server_timing(self, app_ms: float) -> str:
+        return (
+            f'db;dur={self.total_ms:.2f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_ms:.2f}, "
+            f"app;dur={app_ms:.2f}"
+        )
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    """Retorna as métricas da requisição corrente (None fora de uma requisição)."""
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started_at = getattr(context, "_query_started_at", None)
+    if stats is not None and started_at is not None:
+        stats.record(statement, (time.perf_counter() - started_at) * 1000)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Registra os eventos de contagem/tempo no engine (síncrono ou sync_engine do assíncrono)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    Middleware ASGI que agrega as métricas de SQL de cada requisição.
+
+    Implementado como ASGI puro (sem BaseHTTPMiddleware) para que o ContextVar
+    seja visível no endpoint e para não bufferizar respostas em streaming.
+    O cabeçalho reflete as consultas feitas até o início da resposta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current.set(stats)
+        started_at = time.perf_counter()
+        status_code = None
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.query_stats_header:
+                    app_ms = (time.perf_counter() - started_at) * 1000
+                    MutableHeaders(scope=message).append("Server-Timing", stats.server_timing(app_ms))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            if settings.slow_request_log_ms and elapsed_ms >= settings.slow_request_log_ms:
+                logger.warning(
+                    "Requisição lenta: %s %s -> %s em %.1f ms (%d queries, %.1f ms no banco; mais lenta %.1f ms: %s)",
+                    scope["method"], scope["path"], status_code, elapsed_ms,
+                    stats.count, stats.total_ms, stats.slowest_ms,
+                    (stats.slowest_statement or "")[:200],
+                )
+
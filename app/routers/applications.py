@@ -3,41 +3,131 @@ Router para gerenciamento de candidaturas de emprego.
 Contém endpoints para criar, listar, atualizar e deletar candidaturas.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from datetime import date, datetime
 
+from ..batch import batch_response
+from ..bulk_import import import_applications, iter_rows, read_upload
 from ..database import get_db
-from ..models import Application, User
-from ..schemas import ApplicationCreate, ApplicationUpdate, ApplicationResponse
-from ..auth import get_current_user
+from ..etags import ConditionalGet, bump_data_version
+from ..exports import export_response
+from ..invalidation import USER_DATA, invalidation_bus
+from ..models import Application, Interview, StatusEnum
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from ..schemas import (
+    ApplicationBatchUpdate,
+    ApplicationCreate,
+    ApplicationResponse,
+    ApplicationUpdate,
+    BatchIds,
+    BatchResponse,
+    ImportReport,
+)
+from ..serialization import fast_json, rows_to_dicts
+from ..user_stats import ApplicationSnapshot, apply_application_change, rebuild_user_stats
+from ..auth import Principal, get_current_user
 
 router = APIRouter(prefix="/applications", tags=["Applications"])
 
+# Chaves de ordenação aceitas: coluna e conversor do valor serializado no cursor.
+# Cada uma tem índice (user_id, coluna), então a página sai direto do índice.
+SORT_KEYS = {
+    "created_at": (Application.created_at, datetime.fromisoformat),
+    "data": (Application.data, date.fromisoformat),
+    "empresa": (Application.empresa, str),
+}
+
+# Colunas do schema ApplicationResponse, projetadas na listagem (sem instâncias ORM)
+APPLICATION_COLUMNS = (
+    Application.nome,
+    Application.empresa,
+    Application.data,
+    Application.role,
+    Application.status,
+    Application.chance,
+    Application.id,
+    Application.user_id,
+    Application.created_at,
+    Application.updated_at,
+)
+
 
 @router.get("/", response_model=List[ApplicationResponse])
-def get_applications(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_applications(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Quantidade máxima de itens na página"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)"),
+    sort: Literal["created_at", "data", "empresa"] = Query("created_at", description="Chave de ordenação"),
+    order: Literal["asc", "desc"] = Query("desc", description="Direção da ordenação"),
+    status_filter: Optional[StatusEnum] = Query(None, alias="status", description="Filtra pelo status"),
+    empresa: Optional[str] = Query(None, description="Filtra pelo nome exato da empresa"),
+    role: Optional[str] = Query(None, description="Filtra pelo cargo exato"),
+    date_from: Optional[date] = Query(None, alias="from", description="Data da candidatura inicial (inclusive)"),
+    date_to: Optional[date] = Query(None, alias="to", description="Data da candidatura final (inclusive)"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Lista todas as candidaturas do usuário autenticado.
-    Retorna as candidaturas ordenadas por data de criação (mais recentes primeiro).
+    Lista as candidaturas do usuário autenticado, uma página por vez.
+    Pode ser filtrado por status, empresa, cargo e período da data da candidatura (from/to).
+    Por padrão ordena por data de criação (mais recentes primeiro).
+
+    Quando há mais itens, o cursor da próxima página vem no cabeçalho
+    X-Next-Cursor; basta repetir a requisição com ?cursor=<valor>.
+    Responde 304 se o ETag enviado em If-None-Match ainda for válido.
     """
-    applications = (
-        db.query(Application)
-        .filter(Application.user_id == current_user.id)
-        .order_by(Application.created_at.desc())
-        .all()
-    )
-    return applications
+    conditional = await ConditionalGet.check(request, db, current_user.id)
+
+    column, parse = SORT_KEYS[sort]
+    query = select(*APPLICATION_COLUMNS).where(Application.user_id == current_user.id)
+
+    if status_filter:
+        query = query.where(Application.status == status_filter)
+
+    if empresa:
+        query = query.where(Application.empresa == empresa)
+
+    if role:
+        query = query.where(Application.role == role)
+
+    if date_from:
+        query = query.where(Application.data >= date_from)
+
+    if date_to:
+        query = query.where(Application.data <= date_to)
+
+    # Keyset: continua estritamente depois da última linha entregue (coluna, id)
+    if cursor:
+        last_value, last_id = decode_cursor(cursor, sort, order, parse)
+        position = tuple_(column, Application.id)
+        query = query.where(position < (last_value, last_id) if order == "desc" else position > (last_value, last_id))
+
+    if order == "desc":
+        query = query.order_by(column.desc(), Application.id.desc())
+    else:
+        query = query.order_by(column.asc(), Application.id.asc())
+
+    # Busca um item a mais apenas para saber se existe próxima página
+    applications = rows_to_dicts(await db.execute(query.limit(limit + 1)))
+
+    if len(applications) > limit:
+        applications = applications[:limit]
+        last = applications[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(sort, order, last[sort], last["id"])
+
+    conditional.apply(response)
+    return fast_json(applications, response)
 
 
 @router.post("/", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
-def create_application(
+async def create_application(
     application: ApplicationCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Cria uma nova candidatura para o usuário autenticado.
@@ -49,29 +139,157 @@ def create_application(
     )
 
     db.add(new_application)
-    db.commit()
-    db.refresh(new_application)
+    await db.flush()
+    await apply_application_change(db, current_user.id, None, ApplicationSnapshot.of(new_application))
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(new_application)
 
     return new_application
 
 
+@router.post("/import", response_model=ImportReport)
+async def import_applications_file(
+    request: Request,
+    format: Optional[Literal["csv", "ndjson", "json"]] = Query(None, description="csv, ndjson ou json (padrão: pelo Content-Type ou extensão)"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Importa candidaturas em massa de um arquivo CSV, NDJSON ou de um array JSON.
+    O arquivo pode vir em multipart/form-data (campo "file") ou direto no corpo.
+    Linhas inválidas são listadas no relatório; as válidas são inseridas em lotes,
+    numa única transação.
+    """
+    spool, detected_format = await read_upload(request, format)
+    rows = iter_rows(spool, detected_format)
+    try:
+        result = await import_applications(db, current_user.id, rows)
+    finally:
+        rows.close()
+        spool.close()
+
+    if result.imported:
+        # Um recálculo só, em vez de um delta por linha
+        await rebuild_user_stats(db, current_user.id)
+        await bump_data_version(db, current_user.id)
+        await db.commit()
+        invalidation_bus.publish(USER_DATA, current_user.id)
+
+    return result.report()
+
+
+@router.get("/export")
+async def export_applications(
+    format: Literal["csv", "ndjson"] = Query("csv", description="Formato do arquivo"),
+    gzip: bool = Query(False, description="Comprime o arquivo com gzip"),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Exporta todas as candidaturas do usuário em CSV ou NDJSON.
+    O arquivo é gerado em streaming, direto do cursor do banco.
+    """
+    statement = (
+        select(
+            Application.id,
+            Application.nome,
+            Application.empresa,
+            Application.data,
+            Application.role,
+            Application.status,
+            Application.chance,
+            Application.created_at,
+            Application.updated_at,
+        )
+        .where(Application.user_id == current_user.id)
+        .order_by(Application.created_at.asc(), Application.id.asc())
+    )
+    return export_response(statement, format, gzip, f"candidaturas-{date.today().isoformat()}")
+
+
+@router.patch("/batch", response_model=BatchResponse)
+async def update_applications_batch(
+    payload: ApplicationBatchUpdate,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Aplica a mesma alteração parcial a várias candidaturas com um único UPDATE.
+    Retorna o resultado por ID (updated ou not_found).
+    """
+    changes = payload.changes.model_dump(exclude_unset=True)
+    if not changes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Nenhum campo para atualizar"
+        )
+
+    updated_ids = (await db.scalars(
+        update(Application)
+        .where(Application.user_id == current_user.id, Application.id.in_(payload.ids))
+        .values(**changes)
+        .returning(Application.id)
+        .execution_options(synchronize_session=False)
+    )).all()
+
+    if updated_ids:
+        # Um recálculo só, em vez de um delta por candidatura
+        await rebuild_user_stats(db, current_user.id)
+        await bump_data_version(db, current_user.id)
+        await db.commit()
+        invalidation_bus.publish(USER_DATA, current_user.id)
+
+    return batch_response(payload.ids, updated_ids, "updated")
+
+
+@router.delete("/batch", response_model=BatchResponse)
+async def delete_applications_batch(
+    payload: BatchIds,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Deleta várias candidaturas (e as entrevistas delas) numa única transação.
+    Retorna o resultado por ID (deleted ou not_found).
+    """
+    # As entrevistas saem antes: o cascade do relacionamento não vale para DELETE em lote
+    await db.execute(
+        delete(Interview)
+        .where(Interview.user_id == current_user.id, Interview.application_id.in_(payload.ids))
+        .execution_options(synchronize_session=False)
+    )
+    deleted_ids = (await db.scalars(
+        delete(Application)
+        .where(Application.user_id == current_user.id, Application.id.in_(payload.ids))
+        .returning(Application.id)
+        .execution_options(synchronize_session=False)
+    )).all()
+
+    if deleted_ids:
+        await rebuild_user_stats(db, current_user.id)
+        await bump_data_version(db, current_user.id)
+        await db.commit()
+        invalidation_bus.publish(USER_DATA, current_user.id)
+
+    return batch_response(payload.ids, deleted_ids, "deleted")
+
+
 @router.get("/{application_id}", response_model=ApplicationResponse)
-def get_application(
+async def get_application(
     application_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Busca uma candidatura específica pelo ID.
     Retorna 404 se não encontrada ou se pertencer a outro usuário.
     """
-    application = (
-        db.query(Application)
-        .filter(
+    application = await db.scalar(
+        select(Application)
+        .where(
             Application.id == application_id,
             Application.user_id == current_user.id
         )
-        .first()
     )
 
     if not application:
@@ -84,23 +302,22 @@ def get_application(
 
 
 @router.put("/{application_id}", response_model=ApplicationResponse)
-def update_application(
+async def update_application(
     application_id: int,
     application_update: ApplicationUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Atualiza uma candidatura existente.
     Apenas os campos fornecidos serão atualizados (patch parcial).
     """
-    application = (
-        db.query(Application)
-        .filter(
+    application = await db.scalar(
+        select(Application)
+        .where(
             Application.id == application_id,
             Application.user_id == current_user.id
         )
-        .first()
     )
 
     if not application:
@@ -109,33 +326,37 @@ def update_application(
             detail="Candidatura não encontrada"
         )
 
+    before = ApplicationSnapshot.of(application)
     update_data = application_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(application, field, value)
 
-    db.commit()
-    db.refresh(application)
+    await db.flush()
+    await apply_application_change(db, current_user.id, before, ApplicationSnapshot.of(application))
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    invalidation_bus.publish(USER_DATA, current_user.id)
+    await db.refresh(application)
 
     return application
 
 
 @router.delete("/{application_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_application(
+async def delete_application(
     application_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Deleta permanentemente uma candidatura do banco de dados.
     Retorna 404 se não encontrada ou se pertencer a outro usuário.
     """
-    application = (
-        db.query(Application)
-        .filter(
+    application = await db.scalar(
+        select(Application)
+        .where(
             Application.id == application_id,
             Application.user_id == current_user.id
         )
-        .first()
     )
 
     if not application:
@@ -144,7 +365,12 @@ def delete_application(
             detail="Candidatura não encontrada"
         )
 
-    db.delete(application)
-    db.commit()
+    before = ApplicationSnapshot.of(application)
+    await db.delete(application)
+    await db.flush()
+    await apply_application_change(db, current_user.id, before, None)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    invalidation_bus.publish(USER_DATA, current_user.id)
 
     return None
@@ -5,56 +5,62 @@ Contém endpoints para registro e login com JWT.
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
+from ..admission import login_admission, register_admission
 from ..database import get_db
 from ..models import User
 from ..schemas import UserCreate, UserResponse, Token
 from ..auth import (
-    get_password_hash,
+    get_password_hash_async,
     authenticate_user,
     create_access_token,
-    get_user_by_email,
-    ACCESS_TOKEN_EXPIRE_MINUTES
+    get_user_by_email
 )
+from ..settings import settings
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(register_admission)],
+)
+async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Registra um novo usuário no sistema.
     Valida se o email já não está em uso e cria o usuário com senha hasheada.
     """
-    db_user = get_user_by_email(db, email=user.email)
+    db_user = await get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email já registrado"
         )
 
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     new_user = User(email=user.email, hashed_password=hashed_password)
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     return new_user
 
 
-@router.post("/login", response_model=Token)
-def login(
+@router.post("/login", response_model=Token, dependencies=[Depends(login_admission)])
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Realiza login do usuário e retorna um token JWT.
     O token deve ser usado no header Authorization das requisições protegidas.
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,9 +68,9 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": user.email},
+        data={"sub": user.email, "ver": user.token_version},
         expires_delta=access_token_expires
     )
 
@@ -1,9 +1,10 @@
 """
 Router para servir configurações públicas do Firebase
 """
-import os
 from fastapi import APIRouter
 
+from ..settings import settings
+
 router = APIRouter(prefix="/api", tags=["Config"])
 
 
@@ -16,10 +17,10 @@ def get_firebase_config():
     Essas informações são públicas e seguras de expor.
     """
     return {
-        "apiKey": os.getenv("FIREBASE_API_KEY", ""),
-        "authDomain": os.getenv("FIREBASE_AUTH_DOMAIN", ""),
-        "projectId": os.getenv("FIREBASE_PROJECT_ID", ""),
-        "storageBucket": os.getenv("FIREBASE_STORAGE_BUCKET", ""),
-        "messagingSenderId": os.getenv("FIREBASE_MESSAGING_SENDER_ID", ""),
-        "appId": os.getenv("FIREBASE_APP_ID", "")
+        "apiKey": settings.firebase_api_key,
+        "authDomain": settings.firebase_auth_domain,
+        "projectId": settings.firebase_project_id or "",
+        "storageBucket": settings.firebase_storage_bucket,
+        "messagingSenderId": settings.firebase_messaging_sender_id,
+        "appId": settings.firebase_app_id
     }
\ No newline at end of file
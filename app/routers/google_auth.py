@@ -3,27 +3,22 @@ Router para autenticação via Google OAuth (Firebase).
 Permite login/registro usando conta Google através do Firebase Authentication.
 """
 
-import json
-import os
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
-import firebase_admin
-from firebase_admin import credentials, auth as firebase_auth
 
+from ..admission import google_login_admission
 from ..database import get_db
 from ..models import User
-from ..auth import create_access_token
-
-# Inicializa o Firebase Admin SDK
-if not firebase_admin._apps:
-    service_account_json = os.getenv("FIREBASE_SERVICE_ACCOUNT_KEY")
-    if service_account_json:
-        cred = credentials.Certificate(json.loads(service_account_json))
-        firebase_admin.initialize_app(cred)
-    else:
-        firebase_admin.initialize_app()
+from ..auth import create_access_token, get_user_by_email
+from ..firebase_tokens import (
+    CERTS_FORCED_REFRESH_INTERVAL_SECONDS,
+    InvalidIdToken,
+    SigningKeysUnavailable,
+    verify_id_token,
+)
 
 router = APIRouter(prefix="/auth/google", tags=["Google Auth"])
 
@@ -40,9 +35,10 @@ class GoogleAuthResponse(BaseModel):
     user: dict
 
 
-def verify_firebase_token(id_token: str) -> dict:
+async def verify_firebase_token(id_token: str) -> dict:
     """
-    Verifica o ID token do Firebase usando o Firebase Admin SDK.
+    Verifica o ID token do Firebase fora do event loop.
+    Usa as chaves públicas do Google em cache (e o cache de tokens já verificados).
 
     Args:
         id_token: Token ID fornecido pelo Firebase Authentication
@@ -51,42 +47,38 @@ def verify_firebase_token(id_token: str) -> dict:
         Dicionário com dados do usuário (email, nome, foto, etc.)
 
     Raises:
-        HTTPException: Se o token for inválido ou expirado
+        HTTPException: 401 se o token for inválido ou expirado; 503 se as
+            chaves públicas do Google estiverem indisponíveis
     """
     try:
-        decoded_token = firebase_auth.verify_id_token(id_token)
-        return {
-            "email": decoded_token.get("email"),
-            "name": decoded_token.get("name"),
-            "picture": decoded_token.get("picture"),
-            "sub": decoded_token.get("uid")
-        }
-    except firebase_admin.exceptions.FirebaseError:
+        return await run_in_threadpool(verify_id_token, id_token)
+    except InvalidIdToken:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido ou expirado"
         )
-    except ValueError:
+    except SigningKeysUnavailable:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Login com Google temporariamente indisponível",
+            headers={"Retry-After": str(CERTS_FORCED_REFRESH_INTERVAL_SECONDS)},
         )
 
 
-@router.post("/login", response_model=GoogleAuthResponse)
+@router.post("/login", response_model=GoogleAuthResponse, dependencies=[Depends(google_login_admission)])
 async def google_login(
     auth_request: GoogleAuthRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Login/Registro com Google via Firebase.
     Verifica o token, busca ou cria o usuário, e retorna um token JWT.
     """
-    user_data = verify_firebase_token(auth_request.id_token)
+    user_data = await verify_firebase_token(auth_request.id_token)
 
     email = user_data["email"]
 
-    user = db.query(User).filter(User.email == email).first()
+    user = await get_user_by_email(db, email)
 
     if not user:
         user = User(
@@ -95,12 +87,12 @@ async def google_login(
             created_at=datetime.utcnow()
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
 
     access_token_expires = timedelta(days=7)
     access_token = create_access_token(
-        data={"sub": user.email},
+        data={"sub": user.email, "ver": user.token_version},
         expires_delta=access_token_expires
     )
     
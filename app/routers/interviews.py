@@ -3,140 +3,110 @@ Router para gerenciamento de entrevistas.
 Contem endpoints para criar, listar, atualizar e deletar entrevistas.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from datetime import date, datetime
 
+from ..batch import batch_response
 from ..database import get_db
-from ..models import Interview, Application, User
-from ..schemas import InterviewCreate, InterviewUpdate, InterviewResponse, InterviewWithApplication
-from ..auth import get_current_user
+from ..etags import ConditionalGet, bump_data_version
+from ..exports import export_response
+from ..invalidation import USER_DATA, invalidation_bus
+from ..serialization import fast_json, rows_to_dicts
+from ..feeds import interview_feed_query
+from ..models import Interview, Application
+from ..schemas import (
+    BatchIds,
+    BatchResponse,
+    InterviewBatchUpdate,
+    InterviewCreate,
+    InterviewResponse,
+    InterviewUpdate,
+    InterviewWithApplication,
+)
+from ..auth import Principal, get_current_user
 
 router = APIRouter(prefix="/interviews", tags=["Interviews"])
 
 
 @router.get("/", response_model=List[InterviewWithApplication])
-def get_interviews(
+async def get_interviews(
+    request: Request,
+    response: Response,
     application_id: Optional[int] = Query(None, description="Filtrar por candidatura"),
     interview_status: Optional[str] = Query(None, description="Filtrar por status"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Lista todas as entrevistas do usuario autenticado.
     Pode ser filtrado por application_id ou status.
     Retorna entrevistas ordenadas por data (mais recentes primeiro).
+    Responde 304 se o ETag enviado em If-None-Match ainda for valido.
     """
-    query = (
-        db.query(Interview)
-        .join(Application)
-        .filter(Application.user_id == current_user.id)
-    )
+    conditional = await ConditionalGet.check(request, db, current_user.id)
+
+    query = interview_feed_query(current_user.id)
 
     if application_id:
-        query = query.filter(Interview.application_id == application_id)
+        query = query.where(Interview.application_id == application_id)
 
     if interview_status:
-        query = query.filter(Interview.status == interview_status)
-
-    interviews = query.order_by(Interview.interview_datetime.desc()).all()
-
-    result = []
-    for interview in interviews:
-        interview_dict = {
-            "id": interview.id,
-            "application_id": interview.application_id,
-            "interview_datetime": interview.interview_datetime,
-            "interview_type": interview.interview_type,
-            "interviewer_name": interview.interviewer_name,
-            "interviewer_role": interview.interviewer_role,
-            "duration_minutes": interview.duration_minutes,
-            "status": interview.status,
-            "questions_asked": interview.questions_asked,
-            "answers_notes": interview.answers_notes,
-            "feedback_received": interview.feedback_received,
-            "self_rating": interview.self_rating,
-            "pre_interview_notes": interview.pre_interview_notes,
-            "post_interview_notes": interview.post_interview_notes,
-            "meeting_link": interview.meeting_link,
-            "created_at": interview.created_at,
-            "updated_at": interview.updated_at,
-            "application_nome": interview.application.nome,
-            "application_empresa": interview.application.empresa,
-        }
-        result.append(interview_dict)
-
-    return result
+        query = query.where(Interview.status == interview_status)
+
+    rows = await db.execute(query.order_by(Interview.interview_datetime.desc()))
+
+    conditional.apply(response)
+    return fast_json(rows_to_dicts(rows), response)
 
 
 @router.get("/upcoming", response_model=List[InterviewWithApplication])
-def get_upcoming_interviews(
+async def get_upcoming_interviews(
+    request: Request,
+    response: Response,
     limit: int = Query(5, ge=1, le=20),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Lista as proximas entrevistas agendadas do usuario.
+    O ETag expira quando a primeira entrevista da lista deixa de ser futura.
     """
-    interviews = (
-        db.query(Interview)
-        .join(Application)
-        .filter(
-            Application.user_id == current_user.id,
+    conditional = await ConditionalGet.check(request, db, current_user.id)
+
+    rows = await db.execute(
+        interview_feed_query(current_user.id)
+        .where(
             Interview.status == "scheduled",
             Interview.interview_datetime >= datetime.utcnow()
         )
         .order_by(Interview.interview_datetime.asc())
         .limit(limit)
-        .all()
     )
+    interviews = rows_to_dicts(rows)
 
-    result = []
-    for interview in interviews:
-        interview_dict = {
-            "id": interview.id,
-            "application_id": interview.application_id,
-            "interview_datetime": interview.interview_datetime,
-            "interview_type": interview.interview_type,
-            "interviewer_name": interview.interviewer_name,
-            "interviewer_role": interview.interviewer_role,
-            "duration_minutes": interview.duration_minutes,
-            "status": interview.status,
-            "questions_asked": interview.questions_asked,
-            "answers_notes": interview.answers_notes,
-            "feedback_received": interview.feedback_received,
-            "self_rating": interview.self_rating,
-            "pre_interview_notes": interview.pre_interview_notes,
-            "post_interview_notes": interview.post_interview_notes,
-            "meeting_link": interview.meeting_link,
-            "created_at": interview.created_at,
-            "updated_at": interview.updated_at,
-            "application_nome": interview.application.nome,
-            "application_empresa": interview.application.empresa,
-        }
-        result.append(interview_dict)
-
-    return result
+    conditional.apply(response, valid_until=interviews[0]["interview_datetime"] if interviews else None)
+    return fast_json(interviews, response)
 
 
 @router.post("/", response_model=InterviewResponse, status_code=status.HTTP_201_CREATED)
-def create_interview(
+async def create_interview(
     interview: InterviewCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Cria uma nova entrevista para uma candidatura do usuario.
     Verifica se a candidatura pertence ao usuario autenticado.
     """
-    application = (
-        db.query(Application)
-        .filter(
+    application = await db.scalar(
+        select(Application)
+        .where(
             Application.id == interview.application_id,
             Application.user_id == current_user.id
         )
-        .first()
     )
 
     if not application:
@@ -145,33 +115,110 @@ def create_interview(
             detail="Candidatura nao encontrada"
         )
 
-    new_interview = Interview(**interview.model_dump())
+    new_interview = Interview(
+        **interview.model_dump(),
+        user_id=application.user_id
+    )
 
     db.add(new_interview)
-    db.commit()
-    db.refresh(new_interview)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    invalidation_bus.publish(USER_DATA, current_user.id)
+    await db.refresh(new_interview)
 
     return new_interview
 
 
+@router.get("/export")
+async def export_interviews(
+    format: Literal["csv", "ndjson"] = Query("csv", description="Formato do arquivo"),
+    gzip: bool = Query(False, description="Comprime o arquivo com gzip"),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Exporta todas as entrevistas do usuario (com nome e empresa da candidatura) em CSV ou NDJSON.
+    O arquivo e gerado em streaming, direto do cursor do banco.
+    """
+    statement = interview_feed_query(current_user.id).order_by(
+        Interview.interview_datetime.asc(), Interview.id.asc()
+    )
+    return export_response(statement, format, gzip, f"entrevistas-{date.today().isoformat()}")
+
+
+@router.patch("/batch", response_model=BatchResponse)
+async def update_interviews_batch(
+    payload: InterviewBatchUpdate,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Aplica a mesma alteracao parcial a varias entrevistas com um unico UPDATE.
+    Retorna o resultado por ID (updated ou not_found).
+    """
+    changes = payload.changes.model_dump(exclude_unset=True)
+    if not changes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Nenhum campo para atualizar"
+        )
+
+    updated_ids = (await db.scalars(
+        update(Interview)
+        .where(Interview.user_id == current_user.id, Interview.id.in_(payload.ids))
+        .values(**changes)
+        .returning(Interview.id)
+        .execution_options(synchronize_session=False)
+    )).all()
+
+    if updated_ids:
+        await bump_data_version(db, current_user.id)
+        await db.commit()
+        invalidation_bus.publish(USER_DATA, current_user.id)
+
+    return batch_response(payload.ids, updated_ids, "updated")
+
+
+@router.delete("/batch", response_model=BatchResponse)
+async def delete_interviews_batch(
+    payload: BatchIds,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Deleta varias entrevistas numa unica transacao.
+    Retorna o resultado por ID (deleted ou not_found).
+    """
+    deleted_ids = (await db.scalars(
+        delete(Interview)
+        .where(Interview.user_id == current_user.id, Interview.id.in_(payload.ids))
+        .returning(Interview.id)
+        .execution_options(synchronize_session=False)
+    )).all()
+
+    if deleted_ids:
+        await bump_data_version(db, current_user.id)
+        await db.commit()
+        invalidation_bus.publish(USER_DATA, current_user.id)
+
+    return batch_response(payload.ids, deleted_ids, "deleted")
+
+
 @router.get("/{interview_id}", response_model=InterviewResponse)
-def get_interview(
+async def get_interview(
     interview_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Busca uma entrevista especifica pelo ID.
     Retorna 404 se nao encontrada ou se pertencer a outro usuario.
     """
-    interview = (
-        db.query(Interview)
-        .join(Application)
-        .filter(
+    interview = await db.scalar(
+        select(Interview)
+        .where(
             Interview.id == interview_id,
-            Application.user_id == current_user.id
+            Interview.user_id == current_user.id
         )
-        .first()
     )
 
     if not interview:
@@ -184,24 +231,22 @@ def get_interview(
 
 
 @router.put("/{interview_id}", response_model=InterviewResponse)
-def update_interview(
+async def update_interview(
     interview_id: int,
     interview_update: InterviewUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Atualiza uma entrevista existente.
     Apenas os campos fornecidos serao atualizados (patch parcial).
     """
-    interview = (
-        db.query(Interview)
-        .join(Application)
-        .filter(
+    interview = await db.scalar(
+        select(Interview)
+        .where(
             Interview.id == interview_id,
-            Application.user_id == current_user.id
+            Interview.user_id == current_user.id
         )
-        .first()
     )
 
     if not interview:
@@ -214,30 +259,30 @@ def update_interview(
     for field, value in update_data.items():
         setattr(interview, field, value)
 
-    db.commit()
-    db.refresh(interview)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    invalidation_bus.publish(USER_DATA, current_user.id)
+    await db.refresh(interview)
 
     return interview
 
 
 @router.delete("/{interview_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_interview(
+async def delete_interview(
     interview_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Deleta permanentemente uma entrevista do banco de dados.
     Retorna 404 se nao encontrada ou se pertencer a outro usuario.
     """
-    interview = (
-        db.query(Interview)
-        .join(Application)
-        .filter(
+    interview = await db.scalar(
+        select(Interview)
+        .where(
             Interview.id == interview_id,
-            Application.user_id == current_user.id
+            Interview.user_id == current_user.id
         )
-        .first()
     )
 
     if not interview:
@@ -246,7 +291,9 @@ def delete_interview(
             detail="Entrevista nao encontrada"
         )
 
-    db.delete(interview)
-    db.commit()
+    await db.delete(interview)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    invalidation_bus.publish(USER_DATA, current_user.id)
 
     return None
@@ -0,0 +1,28 @@
+"""
+Router para expor métricas internas (caches, pools, etc.).
+Protegido opcionalmente pela variável de ambiente METRICS_TOKEN.
+"""
+
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, status
+
+from .. import metrics
+from ..settings import settings
+
+router = APIRouter(prefix="/metrics", tags=["Health"])
+
+
+@router.get("/")
+def get_metrics(x_metrics_token: Optional[str] = Header(None)):
+    """
+    Retorna um snapshot das métricas de todos os subsistemas registrados.
+    Se METRICS_TOKEN estiver definido, exige o header X-Metrics-Token correspondente.
+    """
+    if settings.metrics_token and not secrets.compare_digest(x_metrics_token or "", settings.metrics_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Token de métricas inválido"
+        )
+
+    return metrics.snapshot()
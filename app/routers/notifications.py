@@ -1,29 +1,44 @@
 """
 Router para notificacoes/lembretes de entrevistas.
 Deriva notificacoes a partir dos dados existentes de entrevistas.
+
+Alem do GET (polling com ETag), /notifications/stream envia as notificacoes por
+Server-Sent Events sempre que mudam: apos escritas em entrevistas/candidaturas
+ou quando um limite de lembrete e cruzado (ver app.notification_hub).
 """
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+import asyncio
+import json
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
-from ..models import Interview, Application, User
-from ..auth import get_current_user
+from ..database import get_db, session_scope
+from ..etags import ConditionalGet
+from ..feeds import NOTIFICATION_COLUMNS, interview_feed_query
+from ..models import Interview
+from ..notification_hub import notification_hub
+from ..serialization import rows_to_dicts
+from ..settings import settings
+from ..auth import Principal, create_stream_token, get_current_user, get_stream_principal
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
+# Intervalo dos comentarios de keepalive do SSE (mantem proxies/balanceadores abertos)
+SSE_KEEPALIVE_SECONDS = 25
 
-@router.get("/")
-def get_notifications(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+
+async def collect_notifications(db: AsyncSession, user_id: int) -> Tuple[dict, datetime]:
     """
-    Retorna lembretes de entrevistas agendadas, categorizados por:
-    - today: entrevistas de hoje
-    - tomorrow: entrevistas de amanha
-    - this_week: entrevistas nos proximos 7 dias (excluindo hoje e amanha)
+    Calcula as notificacoes do usuario em uma unica consulta.
+
+    Returns:
+        Tupla (payload, valido ate): o payload so muda sem escritas na virada
+        do dia ou quando a primeira entrevista da lista deixa de ser futura
     """
     now = datetime.utcnow()
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -31,63 +46,129 @@ def get_notifications(
     tomorrow_end = today_start + timedelta(days=2)
     week_end = today_start + timedelta(days=7)
 
-    base_query = (
-        db.query(Interview)
-        .join(Application)
-        .filter(
-            Application.user_id == current_user.id,
+    # Uma unica consulta para a semana inteira; a separacao por dia e feita em memoria
+    rows = await db.execute(
+        interview_feed_query(user_id, NOTIFICATION_COLUMNS)
+        .where(
             Interview.status == "scheduled",
-            Interview.interview_datetime >= now
+            Interview.interview_datetime >= now,
+            Interview.interview_datetime < week_end
         )
-    )
-
-    today_interviews = (
-        base_query
-        .filter(Interview.interview_datetime < today_end)
         .order_by(Interview.interview_datetime.asc())
-        .all()
     )
 
-    tomorrow_interviews = (
-        base_query
-        .filter(
-            Interview.interview_datetime >= today_end,
-            Interview.interview_datetime < tomorrow_end
-        )
-        .order_by(Interview.interview_datetime.asc())
-        .all()
-    )
+    buckets = {"today": [], "tomorrow": [], "this_week": []}
+    for interview in rows_to_dicts(rows):
+        if interview["interview_datetime"] < today_end:
+            bucket = "today"
+        elif interview["interview_datetime"] < tomorrow_end:
+            bucket = "tomorrow"
+        else:
+            bucket = "this_week"
+        buckets[bucket].append(interview)
 
-    week_interviews = (
-        base_query
-        .filter(
-            Interview.interview_datetime >= tomorrow_end,
-            Interview.interview_datetime < week_end
-        )
-        .order_by(Interview.interview_datetime.asc())
-        .all()
-    )
+    first = buckets["today"] or buckets["tomorrow"] or buckets["this_week"]
+    valid_until = min(today_end, first[0]["interview_datetime"]) if first else today_end
+
+    payload = {
+        **buckets,
+        "total_count": sum(len(items) for items in buckets.values()),
+    }
+    return payload, valid_until
+
+
+@router.get("/")
+async def get_notifications(
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retorna lembretes de entrevistas agendadas, categorizados por:
+    - today: entrevistas de hoje
+    - tomorrow: entrevistas de amanha
+    - this_week: entrevistas nos proximos 7 dias (excluindo hoje e amanha)
 
-    def serialize(interview):
-        return {
-            "id": interview.id,
-            "application_id": interview.application_id,
-            "interview_datetime": interview.interview_datetime.isoformat(),
-            "interview_type": interview.interview_type.value if interview.interview_type else None,
-            "interviewer_name": interview.interviewer_name,
-            "duration_minutes": interview.duration_minutes,
-            "meeting_link": interview.meeting_link,
-            "application_nome": interview.application.nome,
-            "application_empresa": interview.application.empresa,
-        }
-
-    today_list = [serialize(i) for i in today_interviews]
-    tomorrow_list = [serialize(i) for i in tomorrow_interviews]
-    week_list = [serialize(i) for i in week_interviews]
+    O ETag expira na virada do dia (as categorias mudam) ou quando a primeira
+    entrevista da lista deixa de ser futura, o que vier antes.
+    """
+    conditional = await ConditionalGet.check(request, db, current_user.id)
 
+    payload, valid_until = await collect_notifications(db, current_user.id)
+
+    conditional.apply(response, valid_until=valid_until)
+    return payload
+
+
+@router.post("/stream-token")
+async def create_notifications_stream_token(current_user: Principal = Depends(get_current_user)):
+    """
+    Emite o token curto exigido por /notifications/stream.
+
+    O EventSource nao envia cabecalhos, entao o token vai na query string (e
+    em logs de acesso); o token de acesso nunca e usado ali. Vale por
+    STREAM_TOKEN_EXPIRE_SECONDS e so precisa ser valido na abertura da conexao.
+    """
     return {
-        "today": today_list,
-        "tomorrow": tomorrow_list,
-        "this_week": week_list,
-        "total_count": len(today_list) + len(tomorrow_list) + len(week_list),
+        "token": create_stream_token(current_user),
+        "expires_in": settings.stream_token_expire_seconds,
     }
+
+
+async def get_stream_user(
+    token: str = Query(..., description="Token de POST /notifications/stream-token (EventSource nao envia cabecalhos)"),
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """Autentica a conexao SSE pelo token de stream da query string."""
+    return await get_stream_principal(token, db)
+
+
+@router.get("/stream")
+async def stream_notifications(current_user: Principal = Depends(get_stream_user)):
+    """
+    Envia as notificacoes por Server-Sent Events (evento "notifications").
+
+    O payload e o mesmo do GET /notifications/ e so e reenviado quando muda.
+    Cada recalculo usa uma sessao propria e curta: conexoes ociosas nao
+    seguram conexoes do pool.
+    """
+    user_id = current_user.id
+
+    async def events():
+        queue = notification_hub.subscribe(user_id)
+        last_sent: Optional[str] = None
+        loop = asyncio.get_running_loop()
+        # Duracao maxima (SSE_MAX_STREAM_SECONDS): o EventSource reconecta sozinho (revalidando
+        # o token) e conexoes abertas nao seguram o shutdown do worker indefinidamente
+        closes_at = loop.time() + settings.sse_max_stream_seconds
+        try:
+            yield "retry: 10000\n\n"
+            while True:
+                async with session_scope() as db:
+                    payload, valid_until = await collect_notifications(db, user_id)
+                notification_hub.schedule(user_id, valid_until)
+
+                data = json.dumps(jsonable_encoder(payload), separators=(",", ":"))
+                if data != last_sent:
+                    last_sent = data
+                    yield f"event: notifications\ndata: {data}\n\n"
+
+                # Espera o proximo sinal do hub, enviando keepalives enquanto isso
+                while True:
+                    remaining = closes_at - loop.time()
+                    if remaining <= 0:
+                        return
+                    try:
+                        await asyncio.wait_for(queue.get(), min(SSE_KEEPALIVE_SECONDS, remaining))
+                        break
+                    except asyncio.TimeoutError:
+                        yield ": keepalive\n\n"
+        finally:
+            notification_hub.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,78 @@
+"""
+Router de busca textual.
+Pesquisa candidaturas (vaga, empresa, cargo) e entrevistas (entrevistador e notas).
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_db
+from ..models import Application, Interview
+from ..schemas import SearchResponse
+from ..search import search_documents, split_document_id
+from ..auth import Principal, get_current_user
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("/", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Termos da busca"),
+    limit: int = Query(20, ge=1, le=50, description="Quantidade máxima de resultados"),
+    offset: int = Query(0, ge=0, le=1000, description="Quantidade de resultados a pular"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Busca candidaturas e entrevistas do usuário autenticado.
+    Os resultados vêm ordenados por relevância, com os termos encontrados
+    destacados entre <mark> no título e no trecho. Quando há mais resultados,
+    next_offset indica o offset da próxima página.
+    """
+    # Busca um resultado a mais apenas para saber se existe próxima página
+    documents = await search_documents(db, current_user.id, q, limit + 1, offset)
+    next_offset = offset + limit if len(documents) > limit else None
+    documents = documents[:limit]
+
+    hits = [(document, *split_document_id(document["doc_id"])) for document in documents]
+    application_ids = {source_id for _, kind, source_id in hits if kind == "application"}
+    interview_ids = {source_id for _, kind, source_id in hits if kind == "interview"}
+
+    # Candidatura de cada entrevista encontrada (e confirmação do dono)
+    interview_applications = {}
+    if interview_ids:
+        rows = await db.execute(
+            select(Interview.id, Interview.application_id)
+            .where(Interview.id.in_(interview_ids), Interview.user_id == current_user.id)
+        )
+        interview_applications = dict(rows.all())
+        application_ids.update(interview_applications.values())
+
+    applications = {}
+    if application_ids:
+        rows = await db.execute(
+            select(Application.id, Application.nome, Application.empresa)
+            .where(Application.id.in_(application_ids), Application.user_id == current_user.id)
+        )
+        applications = {row.id: row for row in rows}
+
+    results = []
+    for document, kind, source_id in hits:
+        application_id = source_id if kind == "application" else interview_applications.get(source_id)
+        application = applications.get(application_id)
+        if application is None:
+            continue
+
+        results.append({
+            "type": kind,
+            "id": source_id,
+            "application_id": application_id,
+            "title": document["title"],
+            "snippet": document["snippet"],
+            "application_nome": application.nome,
+            "application_empresa": application.empresa,
+            "rank": document["rank"],
+        })
+
+    return {"results": results, "next_offset": next_offset}
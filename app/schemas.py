@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional
-from datetime import datetime
+from typing import List, Optional
+from datetime import date, datetime
 from .models import StatusEnum, InterviewTypeEnum, InterviewStatusEnum
 
 
@@ -41,6 +41,7 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     """Schema para dados extraídos do token JWT."""
     email: Optional[str] = None
+    version: int = 0
 
 
 # ========== SCHEMAS DE CANDIDATURA ==========
@@ -49,18 +50,19 @@ class ApplicationBase(BaseModel):
     """Schema base para candidatura com todos os campos necessários."""
     nome: str = Field(..., min_length=1, description="Nome da vaga")
     empresa: str = Field(..., min_length=1, description="Nome da empresa")
-    data: str = Field(..., description="Data da candidatura (ex: 2024-01-15)")
+    data: date = Field(..., description="Data da candidatura (ex: 2024-01-15)")
     role: str = Field(..., min_length=1, description="Cargo/função")
     status: StatusEnum = Field(default=StatusEnum.ESPERANDO)
     chance: int = Field(default=50, ge=0, le=100, description="Chance de sucesso (0-100)")
 
-    @validator('data')
+    @validator('data', pre=True)
     def validate_data(cls, v):
         """Valida se a data está no formato YYYY-MM-DD."""
-        try:
-            datetime.strptime(v, '%Y-%m-%d')
+        if isinstance(v, date):
             return v
-        except ValueError:
+        try:
+            return datetime.strptime(v, '%Y-%m-%d').date()
+        except (TypeError, ValueError):
             raise ValueError('Data deve estar no formato YYYY-MM-DD (ex: 2024-01-15)')
 
 
@@ -73,19 +75,25 @@ class ApplicationUpdate(BaseModel):
     """Schema para atualização de candidatura (todos os campos opcionais)."""
     nome: Optional[str] = Field(None, min_length=1)
     empresa: Optional[str] = Field(None, min_length=1)
-    data: Optional[str] = None
+    data: Optional[date] = None
     role: Optional[str] = Field(None, min_length=1)
     status: Optional[StatusEnum] = None
     chance: Optional[int] = Field(None, ge=0, le=100)
 
-    @validator('data')
+    @validator('nome', 'empresa', 'data', 'role', 'status', 'chance', pre=True)
+    def reject_null(cls, v):
+        """Campos omitidos não são alterados; null explícito não é aceito (colunas obrigatórias)."""
+        if v is None:
+            raise ValueError('Campo não pode ser nulo')
+        return v
+
+    @validator('data', pre=True)
     def validate_data(cls, v):
         """Valida formato da data se fornecida."""
-        if v is not None:
+        if v is not None and not isinstance(v, date):
             try:
-                datetime.strptime(v, '%Y-%m-%d')
-                return v
-            except ValueError:
+                return datetime.strptime(v, '%Y-%m-%d').date()
+            except (TypeError, ValueError):
                 raise ValueError('Data deve estar no formato YYYY-MM-DD (ex: 2024-01-15)')
         return v
 
@@ -101,6 +109,20 @@ class ApplicationResponse(ApplicationBase):
         from_attributes = True
 
 
+class ImportRowError(BaseModel):
+    """Erros de validação de uma linha do arquivo importado."""
+    row: int = Field(..., description="Número da linha (CSV/NDJSON) ou do item (array JSON)")
+    errors: List[str]
+
+
+class ImportReport(BaseModel):
+    """Resultado da importação em massa de candidaturas."""
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+    errors_truncated: bool = Field(..., description="True se houver mais erros do que os listados")
+
+
 # ========== SCHEMAS DE ENTREVISTA ==========
 
 class InterviewBase(BaseModel):
@@ -141,6 +163,13 @@ class InterviewUpdate(BaseModel):
     post_interview_notes: Optional[str] = None
     meeting_link: Optional[str] = None
 
+    @validator('interview_datetime', 'interview_type', 'status', pre=True)
+    def reject_null(cls, v):
+        """Campos omitidos nao sao alterados; null explicito nao e aceito (colunas obrigatorias)."""
+        if v is None:
+            raise ValueError('Campo nao pode ser nulo')
+        return v
+
 
 class InterviewResponse(InterviewBase):
     """Schema de resposta com dados completos da entrevista."""
@@ -156,4 +185,60 @@ class InterviewResponse(InterviewBase):
 class InterviewWithApplication(InterviewResponse):
     """Schema de resposta com dados da candidatura incluidos."""
     application_nome: Optional[str] = None
-    application_empresa: Optional[str] = None
\ No newline at end of file
+    application_empresa: Optional[str] = None
+
+# ========== SCHEMAS DE OPERAÇÕES EM LOTE ==========
+
+BATCH_MAX_IDS = 500
+
+
+class BatchIds(BaseModel):
+    """IDs alvo de uma operação em lote (duplicados são ignorados)."""
+    ids: List[int] = Field(..., min_length=1, max_length=BATCH_MAX_IDS)
+
+    @validator('ids')
+    def unique_ids(cls, v):
+        """Remove IDs repetidos mantendo a ordem enviada."""
+        return list(dict.fromkeys(v))
+
+
+class ApplicationBatchUpdate(BatchIds):
+    """Alteração parcial aplicada a várias candidaturas."""
+    changes: ApplicationUpdate
+
+
+class InterviewBatchUpdate(BatchIds):
+    """Alteracao parcial aplicada a varias entrevistas."""
+    changes: InterviewUpdate
+
+
+class BatchItemResult(BaseModel):
+    """Resultado da operação em lote para um ID."""
+    id: int
+    result: str = Field(..., description="updated, deleted ou not_found")
+
+
+class BatchResponse(BaseModel):
+    """Resultado por ID de uma operação em lote."""
+    affected: int
+    results: List[BatchItemResult]
+
+
+# ========== SCHEMAS DE BUSCA ==========
+
+class SearchHit(BaseModel):
+    """Resultado da busca textual (candidatura ou entrevista)."""
+    type: str = Field(..., description="application ou interview")
+    id: int
+    application_id: int
+    title: str = Field(..., description="Título com os termos encontrados entre <mark>")
+    snippet: str = Field(..., description="Trecho do texto com os termos encontrados entre <mark>")
+    application_nome: str
+    application_empresa: str
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    """Página de resultados da busca, do mais relevante para o menos relevante."""
+    results: List[SearchHit]
+    next_offset: Optional[int] = None
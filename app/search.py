@@ -0,0 +1,124 @@
+"""
+Busca textual sobre candidaturas e notas de entrevistas.
+
+Usa o índice invertido search_documents criado na migração 0005: FTS5 no
+SQLite e tsvector + GIN no Postgres, mantido por triggers nas tabelas de
+origem. O id de cada documento identifica a origem: 2 * id para candidaturas
+e 2 * id + 1 para entrevistas.
+"""
+
+import html
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Configuração de texto do Postgres (a mesma das colunas geradas na migração 0005)
+SEARCH_TS_CONFIG = "portuguese"
+
+# Marcadores de destaque usados no banco; trocados por <mark> após escapar o HTML
+_MARK_START, _MARK_END = "\x02", "\x03"
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+_SQLITE_SEARCH = text(
+    """
+    SELECT rowid AS doc_id,
+           -bm25(search_documents, 0.0, 2.0, 1.0) AS rank,
+           highlight(search_documents, 1, char(2), char(3)) AS title,
+           snippet(search_documents, 2, char(2), char(3), '…', 16) AS snippet
+    FROM search_documents
+    WHERE search_documents MATCH :match
+    ORDER BY bm25(search_documents, 0.0, 2.0, 1.0), rowid DESC
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+# O ranking e a paginação acontecem antes do ts_headline (caro), só para a página
+_POSTGRES_SEARCH = text(
+    f"""
+    WITH q AS (SELECT websearch_to_tsquery('{SEARCH_TS_CONFIG}', :query) AS query)
+    SELECT hit.id AS doc_id,
+           hit.rank,
+           ts_headline('{SEARCH_TS_CONFIG}', hit.title, q.query,
+                       'HighlightAll=true, StartSel=' || chr(2) || ', StopSel=' || chr(3)) AS title,
+           ts_headline('{SEARCH_TS_CONFIG}', hit.body, q.query,
+                       'MaxFragments=2, MaxWords=20, MinWords=5, FragmentDelimiter=" … ", '
+                       'StartSel=' || chr(2) || ', StopSel=' || chr(3)) AS snippet
+    FROM (
+        SELECT d.id, d.title, d.body, ts_rank_cd(d.document, q.query) AS rank
+        FROM search_documents d, q
+        WHERE d.user_id = :user_id AND d.document @@ q.query
+        ORDER BY rank DESC, d.id DESC
+        LIMIT :limit OFFSET :offset
+    ) hit, q
+    ORDER BY hit.rank DESC, hit.id DESC
+    """
+)
+
+
+def _fts5_match(user_id: int, query: str) -> Optional[str]:
+    """
+    Converte o texto digitado em uma expressão FTS5 segura.
+    Cada palavra vira um termo entre aspas com prefixo (todas obrigatórias),
+    restrito a título/corpo e ao dono dos documentos.
+    """
+    terms = _TERM.findall(query)
+    if not terms:
+        return None
+    expression = " ".join(f'"{term}"*' for term in terms)
+    return f'owner : "u{user_id}" AND {{title body}} : ({expression})'
+
+
+def render_highlight(value: Optional[str]) -> str:
+    """Escapa o texto indexado e converte os marcadores de destaque em <mark>."""
+    escaped = html.escape(value or "")
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def split_document_id(doc_id: int) -> Tuple[str, int]:
+    """Retorna (tipo, id de origem) a partir do id do documento."""
+    return ("interview" if doc_id % 2 else "application"), doc_id // 2
+
+
+async def search_documents(
+    db: AsyncSession,
+    user_id: int,
+    query: str,
+    limit: int,
+    offset: int
+) -> List[dict]:
+    """
+    Executa a busca no índice do usuário, do mais relevante para o menos relevante.
+
+    Args:
+        db: Sessão de banco de dados
+        user_id: Dono dos documentos pesquisados
+        query: Texto digitado pelo usuário
+        limit: Quantidade máxima de resultados
+        offset: Quantidade de resultados a pular
+
+    Returns:
+        Lista de dicts com doc_id, rank, title e snippet (destaques já em <mark>)
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        statement = _POSTGRES_SEARCH
+        params = {"query": query, "user_id": user_id}
+    else:
+        match = _fts5_match(user_id, query)
+        if match is None:
+            return []
+        statement = _SQLITE_SEARCH
+        params = {"match": match}
+
+    result = await db.execute(statement, {**params, "limit": limit, "offset": offset})
+    return [
+        {
+            "doc_id": row.doc_id,
+            "rank": float(row.rank or 0),
+            "title": render_highlight(row.title),
+            "snippet": render_highlight(row.snippet),
+        }
+        for row in result
+    ]
@@ -0,0 +1,48 @@
+"""
+Caminho rápido de serialização para as listagens.
+
+As listagens projetam colunas (linhas Core, sem instâncias ORM) e devolvem um
+FastJSONResponse: as linhas viram dicts com as chaves do resultado calculadas
+uma vez e são codificadas direto com orjson, que entende date/datetime/Enum.
+Como a resposta é retornada pronta, o FastAPI não revalida cada item pelo
+response_model nem passa pelo jsonable_encoder; o response_model continua
+declarado na rota e o schema do OpenAPI não muda.
+
+As colunas projetadas devem ter os mesmos nomes (e tipos) dos campos do schema
+de resposta declarado.
+"""
+
+from typing import Any, List
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse codificado com orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def rows_to_dicts(result) -> List[dict]:
+    """
+    Converte um resultado Core em dicts (chaves = nomes/labels das colunas).
+
+    Args:
+        result: Resultado de db.execute(select(colunas...))
+    """
+    keys = tuple(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+def fast_json(content: Any, response: Response) -> FastJSONResponse:
+    """
+    Monta a resposta final levando os cabeçalhos definidos no Response injetado
+    (ETag, X-Next-Cursor...), que o FastAPI ignora quando a rota retorna uma
+    resposta pronta.
+    """
+    fast_response = FastJSONResponse(content)
+    fast_response.raw_headers.extend(response.raw_headers)
+    return fast_response
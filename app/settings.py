@@ -0,0 +1,186 @@
+"""
+Configuração da aplicação, lida do ambiente uma única vez.
+
+O .env é carregado aqui (e só aqui) no primeiro import; os demais módulos usam
+o objeto `settings` em vez de chamar os.getenv. Variáveis já definidas no
+ambiente têm precedência sobre o .env. Os valores são fixos durante a vida do
+processo: mudanças no ambiente exigem reiniciar os workers.
+
+Este módulo é importado pelos processos do pool de hashing, então deve
+permanecer leve (só a biblioteca padrão e python-dotenv).
+"""
+
+import os
+from dataclasses import dataclass
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+
+def _str(name: str, default: Optional[str] = None) -> Optional[str]:
+    return os.getenv(name, default)
+
+
+def _int(name: str, default: int) -> int:
+    return int(os.getenv(name) or default)
+
+
+def _float(name: str, default: float) -> float:
+    return float(os.getenv(name) or default)
+
+
+def _bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.lower() in ("1", "true", "yes")
+
+
+def _list(name: str, default: List[str]) -> List[str]:
+    value = os.getenv(name)
+    return [item.strip() for item in value.split(",") if item.strip()] if value else list(default)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Todas as variáveis de ambiente da aplicação (ver README)."""
+
+    # Banco de dados
+    database_url: Optional[str]
+    db_async: bool
+    db_pool_size: int
+    db_max_overflow: int
+    db_pool_timeout: float
+    db_pool_recycle: int
+    db_disconnect_strategy: str
+
+    # Autenticação
+    secret_key: Optional[str]
+    algorithm: str
+    access_token_expire_minutes: int
+    stream_token_expire_seconds: int
+    principal_cache_size: int
+    principal_cache_ttl_seconds: float
+
+    # Hash de senhas
+    password_hash_workers: int
+    password_hash_max_pending: int
+    password_hash_retry_after_seconds: int
+    bcrypt_rounds: int
+
+    # Controle de admissão das rotas de autenticação (ver app/admission.py)
+    admission_enabled: bool
+    auth_max_concurrency: int
+    auth_ip_rate_per_minute: int
+    auth_account_rate_per_minute: int
+    trusted_proxy_hops: int
+
+    # Firebase (login com Google e configuração pública do frontend)
+    firebase_project_id: Optional[str]
+    firebase_service_account_key: Optional[str]
+    firebase_certs_url: str
+    firebase_token_cache_size: int
+    firebase_token_cache_ttl_seconds: float
+    firebase_api_key: str
+    firebase_auth_domain: str
+    firebase_storage_bucket: str
+    firebase_messaging_sender_id: str
+    firebase_app_id: str
+
+    # HTTP
+    cors_origins: List[str]
+    compression_min_bytes: int
+    compression_gzip_level: int
+    compression_brotli_quality: int
+    sse_max_stream_seconds: int
+
+    # Importação e exportação
+    import_batch_size: int
+    import_max_rows: int
+    import_max_bytes: int
+    export_batch_size: int
+
+    # Invalidação de caches entre workers (ver app/invalidation.py)
+    invalidation_backend: str
+    invalidation_sqlite_path: Optional[str]
+    invalidation_poll_seconds: float
+
+    # Observabilidade
+    query_stats_header: bool
+    slow_request_log_ms: float
+    metrics_token: Optional[str]
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Monta as configurações a partir das variáveis de ambiente atuais."""
+        database_url = _str("DATABASE_URL")
+        # Corrige o esquema postgres:// para postgresql:// (compatibilidade Railway/Heroku)
+        if database_url and database_url.startswith("postgres://"):
+            database_url = database_url.replace("postgres://", "postgresql://", 1)
+
+        return cls(
+            database_url=database_url,
+            # Camada assíncrona (AsyncSession) ou síncrona (Session no threadpool)
+            db_async=_bool("DB_ASYNC", True),
+            db_pool_size=_int("DB_POOL_SIZE", 5),
+            db_max_overflow=_int("DB_MAX_OVERFLOW", 10),
+            db_pool_timeout=_float("DB_POOL_TIMEOUT", 30),
+            db_pool_recycle=_int("DB_POOL_RECYCLE", 1800),
+            # "optimistic": sem ping; "pessimistic": SELECT 1 a cada checkout (pool_pre_ping)
+            db_disconnect_strategy=_str("DB_DISCONNECT_STRATEGY", "optimistic").lower(),
+            secret_key=_str("SECRET_KEY"),
+            algorithm=_str("ALGORITHM", "HS256"),
+            access_token_expire_minutes=_int("ACCESS_TOKEN_EXPIRE_MINUTES", 30),
+            # Tokens de /notifications/stream: só precisam valer até a conexão abrir
+            stream_token_expire_seconds=_int("STREAM_TOKEN_EXPIRE_SECONDS", 60),
+            principal_cache_size=_int("PRINCIPAL_CACHE_SIZE", 10000),
+            principal_cache_ttl_seconds=_float("PRINCIPAL_CACHE_TTL_SECONDS", 60),
+            # 0 workers = executa no threadpool padrão
+            password_hash_workers=_int("PASSWORD_HASH_WORKERS", 2),
+            password_hash_max_pending=_int("PASSWORD_HASH_MAX_PENDING", 64),
+            password_hash_retry_after_seconds=_int("PASSWORD_HASH_RETRY_AFTER_SECONDS", 2),
+            bcrypt_rounds=_int("BCRYPT_ROUNDS", 12),
+            admission_enabled=_bool("ADMISSION_ENABLED", True),
+            # Por rota e por worker; taxas 0 desativam o respectivo limite
+            auth_max_concurrency=_int("AUTH_MAX_CONCURRENCY", 16),
+            auth_ip_rate_per_minute=_int("AUTH_IP_RATE_PER_MINUTE", 30),
+            auth_account_rate_per_minute=_int("AUTH_ACCOUNT_RATE_PER_MINUTE", 10),
+            # Proxies que acrescentam ao X-Forwarded-For na frente da aplicação (0 = usa o IP da conexão)
+            trusted_proxy_hops=_int("TRUSTED_PROXY_HOPS", 0),
+            firebase_project_id=_str("FIREBASE_PROJECT_ID"),
+            firebase_service_account_key=_str("FIREBASE_SERVICE_ACCOUNT_KEY"),
+            firebase_certs_url=_str(
+                "FIREBASE_CERTS_URL",
+                "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com",
+            ),
+            firebase_token_cache_size=_int("FIREBASE_TOKEN_CACHE_SIZE", 1000),
+            firebase_token_cache_ttl_seconds=_float("FIREBASE_TOKEN_CACHE_TTL_SECONDS", 300),
+            firebase_api_key=_str("FIREBASE_API_KEY", ""),
+            firebase_auth_domain=_str("FIREBASE_AUTH_DOMAIN", ""),
+            firebase_storage_bucket=_str("FIREBASE_STORAGE_BUCKET", ""),
+            firebase_messaging_sender_id=_str("FIREBASE_MESSAGING_SENDER_ID", ""),
+            firebase_app_id=_str("FIREBASE_APP_ID", ""),
+            cors_origins=_list("CORS_ORIGINS", ["http://localhost:8000"]),
+            # Corpos menores que isso não são comprimidos (0 comprime tudo)
+            compression_min_bytes=_int("COMPRESSION_MIN_BYTES", 1024),
+            compression_gzip_level=_int("COMPRESSION_GZIP_LEVEL", 6),
+            compression_brotli_quality=_int("COMPRESSION_BROTLI_QUALITY", 4),
+            sse_max_stream_seconds=_int("SSE_MAX_STREAM_SECONDS", 600),
+            import_batch_size=_int("IMPORT_BATCH_SIZE", 1000),
+            import_max_rows=_int("IMPORT_MAX_ROWS", 50000),
+            import_max_bytes=_int("IMPORT_MAX_BYTES", 20 * 1024 * 1024),
+            export_batch_size=_int("EXPORT_BATCH_SIZE", 1000),
+            # auto: postgres com DATABASE_URL Postgres, sqlite com SQLite em arquivo, senão local
+            invalidation_backend=_str("INVALIDATION_BACKEND", "auto").lower(),
+            invalidation_sqlite_path=_str("INVALIDATION_SQLITE_PATH"),
+            invalidation_poll_seconds=_float("INVALIDATION_POLL_SECONDS", 0.2),
+            query_stats_header=_bool("QUERY_STATS_HEADER", True),
+            # Vazio ou 0 desativa o log de requisições lentas
+            slow_request_log_ms=_float("SLOW_REQUEST_LOG_MS", 0),
+            metrics_token=_str("METRICS_TOKEN"),
+        )
+
+
+load_dotenv()
+
+settings = Settings.from_env()
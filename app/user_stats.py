@@ -0,0 +1,260 @@
+"""
+Estatísticas por usuário mantidas incrementalmente (tabela user_stats).
+
+As escritas em candidaturas chamam apply_application_change() na mesma
+transação, com o estado da candidatura antes e depois da escrita; a leitura de
+/users/me/stats vira uma busca por chave primária. compute_user_stats() refaz
+tudo com consultas agregadas e é usada no rebuild, na checagem de consistência
+e quando o usuário ainda não tem linha em user_stats.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import extract, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Application, StatusEnum, User, UserStats
+
+STATUS_FIELDS = {
+    StatusEnum.ESPERANDO: "esperando",
+    StatusEnum.ENTREVISTA: "entrevista",
+    StatusEnum.REJEITADO: "rejeitado",
+}
+
+# Campos comparados pela checagem de consistência
+STATS_FIELDS = (
+    "total", "esperando", "entrevista", "rejeitado", "empresa_counts", "month_counts",
+    "primeira_candidatura_id", "primeira_candidatura", "ultima_entrevista_id", "ultima_entrevista",
+)
+
+
+@dataclass(frozen=True)
+class ApplicationSnapshot:
+    """Campos de uma candidatura que afetam as estatísticas."""
+    id: int
+    status: Optional[StatusEnum]
+    empresa: str
+    data: date
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def of(cls, application: Application) -> "ApplicationSnapshot":
+        return cls(
+            application.id, application.status, application.empresa,
+            application.data, application.updated_at,
+        )
+
+
+def _month(value: date) -> str:
+    return f"{value.year:04d}-{value.month:02d}"
+
+
+async def _first_application(db: AsyncSession, user_id: int):
+    return (await db.execute(
+        select(Application.id, Application.data)
+        .where(Application.user_id == user_id)
+        .order_by(Application.created_at.asc(), Application.id.asc())
+        .limit(1)
+    )).first()
+
+
+async def _last_interview_application(db: AsyncSession, user_id: int):
+    return (await db.execute(
+        select(Application.id, Application.data)
+        .where(Application.user_id == user_id, Application.status == StatusEnum.ENTREVISTA)
+        .order_by(Application.updated_at.desc(), Application.id.desc())
+        .limit(1)
+    )).first()
+
+
+async def compute_user_stats(db: AsyncSession, user_id: int) -> Dict[str, object]:
+    """
+    Calcula as estatísticas do usuário do zero, com consultas agregadas.
+
+    Returns:
+        Dict com os valores das colunas de UserStats (STATS_FIELDS)
+    """
+    stats: Dict[str, object] = {field: 0 for field in ("total", *STATUS_FIELDS.values())}
+
+    for status, count in await db.execute(
+        select(Application.status, func.count(Application.id))
+        .where(Application.user_id == user_id)
+        .group_by(Application.status)
+    ):
+        stats["total"] += count
+        if status in STATUS_FIELDS:
+            stats[STATUS_FIELDS[status]] = count
+
+    stats["empresa_counts"] = dict((await db.execute(
+        select(Application.empresa, func.count(Application.id))
+        .where(Application.user_id == user_id)
+        .group_by(Application.empresa)
+    )).all())
+
+    # Agrupa por ano/mês da data da candidatura (EXTRACT funciona no SQLite e no Postgres)
+    ano = extract("year", Application.data)
+    mes = extract("month", Application.data)
+    stats["month_counts"] = {
+        f"{int(year):04d}-{int(month):02d}": count
+        for year, month, count in await db.execute(
+            select(ano, mes, func.count(Application.id))
+            .where(Application.user_id == user_id)
+            .group_by(ano, mes)
+        )
+    }
+
+    first = await _first_application(db, user_id)
+    stats["primeira_candidatura_id"], stats["primeira_candidatura"] = first if first else (None, None)
+
+    last = await _last_interview_application(db, user_id)
+    stats["ultima_entrevista_id"], stats["ultima_entrevista"] = last if last else (None, None)
+
+    return stats
+
+
+async def rebuild_user_stats(db: AsyncSession, user_id: int) -> UserStats:
+    """Recalcula e grava a linha de user_stats do usuário (sem commit)."""
+    values = await compute_user_stats(db, user_id)
+
+    row = await db.get(UserStats, user_id)
+    if row is None:
+        row = UserStats(user_id=user_id)
+        db.add(row)
+    for field, value in values.items():
+        setattr(row, field, value)
+
+    await db.flush()
+    return row
+
+
+async def _locked_row(db: AsyncSession, user_id: int) -> Optional[UserStats]:
+    # FOR UPDATE serializa as escritas concorrentes do mesmo usuário (ignorado no SQLite)
+    return await db.scalar(
+        select(UserStats).where(UserStats.user_id == user_id).with_for_update()
+    )
+
+
+def _add(counts: dict, key: str, delta: int) -> dict:
+    counts = dict(counts)
+    counts[key] = counts.get(key, 0) + delta
+    if counts[key] <= 0:
+        del counts[key]
+    return counts
+
+
+async def apply_application_change(
+    db: AsyncSession,
+    user_id: int,
+    before: Optional[ApplicationSnapshot],
+    after: Optional[ApplicationSnapshot]
+) -> None:
+    """
+    Aplica às estatísticas do usuário a criação, alteração ou remoção de uma candidatura.
+    Deve ser chamada depois do flush da escrita e antes do commit.
+
+    Args:
+        db: Sessão da transação da escrita
+        user_id: Dono da candidatura
+        before: Estado anterior (None na criação)
+        after: Estado novo (None na remoção)
+    """
+    row = await _locked_row(db, user_id)
+    if row is None:
+        # Usuário ainda sem estatísticas: o recálculo já inclui esta escrita
+        await rebuild_user_stats(db, user_id)
+        return
+
+    empresa_counts, month_counts = row.empresa_counts, row.month_counts
+
+    for snapshot, delta in ((before, -1), (after, 1)):
+        if snapshot is None:
+            continue
+        row.total += delta
+        if snapshot.status in STATUS_FIELDS:
+            field = STATUS_FIELDS[snapshot.status]
+            setattr(row, field, getattr(row, field) + delta)
+        empresa_counts = _add(empresa_counts, snapshot.empresa, delta)
+        month_counts = _add(month_counts, _month(snapshot.data), delta)
+
+    # Colunas JSON só são gravadas quando reatribuídas
+    row.empresa_counts, row.month_counts = empresa_counts, month_counts
+
+    # Primeira candidatura: só muda ao criar a primeira, ao remover a atual ou ao alterar a data dela
+    if after is not None and (row.primeira_candidatura_id is None or row.primeira_candidatura_id == after.id):
+        row.primeira_candidatura_id, row.primeira_candidatura = after.id, after.data
+    elif after is None and before is not None and row.primeira_candidatura_id == before.id:
+        first = await _first_application(db, user_id)
+        row.primeira_candidatura_id, row.primeira_candidatura = first if first else (None, None)
+
+    # Última entrevista: uma candidatura em entrevista recém-gravada tem o updated_at mais recente
+    touched = after is not None and (before is None or after.updated_at != before.updated_at)
+    if touched and after.status == StatusEnum.ENTREVISTA:
+        row.ultima_entrevista_id, row.ultima_entrevista = after.id, after.data
+    elif before is not None and row.ultima_entrevista_id == before.id and (
+        after is None or after.status != StatusEnum.ENTREVISTA
+    ):
+        last = await _last_interview_application(db, user_id)
+        row.ultima_entrevista_id, row.ultima_entrevista = last if last else (None, None)
+
+
+async def get_user_stats_row(db: AsyncSession, user_id: int) -> UserStats:
+    """Lê a linha de estatísticas (busca por chave primária), criando-a se não existir."""
+    row = await db.get(UserStats, user_id)
+    if row is None:
+        row = await rebuild_user_stats(db, user_id)
+        await db.commit()
+    return row
+
+
+def stats_response(row: UserStats) -> dict:
+    """Monta o payload de /users/me/stats a partir da linha de estatísticas."""
+    empresa_top = max(row.empresa_counts.items(), key=lambda item: item[1], default=None)
+    mes_mais_ativo = max(row.month_counts.items(), key=lambda item: item[1], default=None)
+
+    return {
+        "total": row.total,
+        "esperando": row.esperando,
+        "entrevista": row.entrevista,
+        "rejeitado": row.rejeitado,
+        "taxa_conversao": round((row.entrevista / row.total * 100), 1) if row.total > 0 else 0.0,
+        "empresa_top": empresa_top[0] if empresa_top else None,
+        "empresa_top_count": empresa_top[1] if empresa_top else 0,
+        "primeira_candidatura": row.primeira_candidatura,
+        "ultima_entrevista": row.ultima_entrevista,
+        "mes_mais_ativo": mes_mais_ativo[0] if mes_mais_ativo else None,
+        "mes_mais_ativo_count": mes_mais_ativo[1] if mes_mais_ativo else 0,
+    }
+
+
+async def rebuild_all(db: AsyncSession) -> int:
+    """Recalcula as estatísticas de todos os usuários (commit por usuário)."""
+    user_ids = (await db.scalars(select(User.id).order_by(User.id))).all()
+    for user_id in user_ids:
+        await rebuild_user_stats(db, user_id)
+        await db.commit()
+    return len(user_ids)
+
+
+async def check_all(db: AsyncSession) -> List[str]:
+    """
+    Compara as estatísticas gravadas com um recálculo completo.
+
+    Returns:
+        Lista de divergências encontradas (vazia = consistente)
+    """
+    problems = []
+    user_ids = (await db.scalars(select(User.id).order_by(User.id))).all()
+    for user_id in user_ids:
+        row = await db.get(UserStats, user_id)
+        if row is None:
+            problems.append(f"usuário {user_id}: sem linha em user_stats")
+            continue
+        expected = await compute_user_stats(db, user_id)
+        for field in STATS_FIELDS:
+            if getattr(row, field) != expected[field]:
+                problems.append(
+                    f"usuário {user_id}: {field} = {getattr(row, field)!r}, esperado {expected[field]!r}"
+                )
+    return problems
@@ -29,12 +29,24 @@ const ENDPOINTS = {
   interviewById: (id) => `/interviews/${id}`,
   upcomingInterviews: "/interviews/upcoming",
   notifications: "/notifications/",
+  notificationsStream: "/notifications/stream",
+  notificationsStreamToken: "/notifications/stream-token",
+  stats: "/users/me/stats",
+  search: "/search/",
 };
 
+// Tamanho da página da listagem de candidaturas (máximo aceito pela API: 200)
+const APPLICATIONS_PAGE_SIZE = 50;
+
 // Estado global da aplicação
 let token = localStorage.getItem("token");  // Token JWT armazenado
 let currentUser = null;  // Dados do usuário autenticado
-let notificationInterval = null;  // Interval ID para refresh de notificacoes
+let notificationInterval = null;  // Interval ID para refresh de notificacoes (fallback)
+let notificationStream = null;  // EventSource das notificacoes enviadas pelo servidor
+let notificationStreamRetry = null;  // Timeout da reconexao do stream (com token novo)
+let applicationsCursor = null;  // Cursor da próxima página de candidaturas (null = fim)
+let applicationsLoadingMore = false;  // Evita buscar a mesma página duas vezes
+let searchQuery = "";  // Termos da busca exibida no painel de resultados
 
 // Inicialização quando o DOM estiver carregado
 document.addEventListener("DOMContentLoaded", () => {
@@ -48,13 +60,21 @@ document.addEventListener("DOMContentLoaded", () => {
     });
   }
 
+  // Carrega a próxima página quando o fim da lista fica visível
+  const more = document.getElementById("applicationsMore");
+  if (more && "IntersectionObserver" in window) {
+    new IntersectionObserver((entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) loadMoreApplications();
+    }, { rootMargin: "200px" }).observe(more);
+  }
+
   // Verifica se há token e exibe a tela apropriada
   if (token) {
     showDashboard();
     loadProfile();
     loadApplications();
     loadNotifications();
-    startNotificationPolling();
+    startNotificationStream();
   } else {
     showAuth();
   }
@@ -216,7 +236,7 @@ async function handleLogin(e) {
       loadProfile();
       loadApplications();
       loadNotifications();
-      startNotificationPolling();
+      startNotificationStream();
       showLoginReminders();
     } else {
       showToast(data?.detail || "Email ou senha incorretos", "error");
@@ -233,6 +253,8 @@ function logout() {
   localStorage.removeItem("token");
   token = null;
   currentUser = null;
+  responseCache.clear();
+  stopNotificationStream();
   stopNotificationPolling();
   showAuth();
   showToast("Logout realizado com sucesso", "success");
@@ -307,8 +329,10 @@ async function handleChangePassword(e) {
     });
 
     if (response.status === 204) {
-      showToast("Senha alterada com sucesso!", "success");
+      // A troca de senha invalida os tokens emitidos; é preciso entrar novamente
       document.getElementById("changePasswordForm")?.reset();
+      logout();
+      showToast("Senha alterada com sucesso! Entre novamente.", "success");
       return;
     }
 
@@ -329,20 +353,41 @@ async function handleChangePassword(e) {
 
 // ==================== CANDIDATURAS ====================
 
-// Carrega todas as candidaturas do usuário da API e renderiza na tela
+// Monta a URL da listagem com os filtros/ordenação da tela e o cursor da página
+function applicationsQuery(cursor) {
+  const params = new URLSearchParams({ limit: APPLICATIONS_PAGE_SIZE });
+
+  const [sort, order] = (document.getElementById("filterSort")?.value || "created_at:desc").split(":");
+  params.set("sort", sort);
+  params.set("order", order);
+
+  const filters = {
+    status: "filterStatus",
+    empresa: "filterEmpresa",
+    role: "filterRole",
+    from: "filterFrom",
+    to: "filterTo",
+  };
+  Object.entries(filters).forEach(([param, id]) => {
+    const value = document.getElementById(id)?.value.trim();
+    if (value) params.set(param, value);
+  });
+
+  if (cursor) params.set("cursor", cursor);
+  return `${ENDPOINTS.applications}?${params}`;
+}
+
+// Carrega a primeira página de candidaturas (com os filtros atuais) e renderiza na tela
 async function loadApplications() {
   showLoading();
 
   try {
-    const response = await fetch(apiUrl(ENDPOINTS.applications), {
-      headers: authHeader(),
-    });
+    const response = await cachedFetch(applicationsQuery(null));
 
     if (response.ok) {
       const applications = await safeJson(response);
-      const list = Array.isArray(applications) ? applications : [];
-      renderApplications(list);
-      updateStats(list);
+      applicationsCursor = response.headers.get("X-Next-Cursor");
+      renderApplications(Array.isArray(applications) ? applications : []);
     } else if (response.status === 401) {
       logout();
       showToast("Sessão expirada. Faça login novamente.", "error");
@@ -353,28 +398,53 @@ async function loadApplications() {
   } catch (err) {
     showToast("Erro de conexão com o servidor", "error");
   } finally {
+    updateApplicationsMore();
     hideLoading();
   }
 }
 
-// Renderiza a lista de candidaturas como cards HTML no container
-function renderApplications(applications) {
-  const container = document.getElementById("applicationsList");
-  const emptyState = document.getElementById("emptyState");
+// Busca a próxima página de candidaturas e adiciona ao fim da lista
+async function loadMoreApplications() {
+  if (!applicationsCursor || applicationsLoadingMore) return;
+  applicationsLoadingMore = true;
 
-  if (!container || !emptyState) return;
+  try {
+    const response = await cachedFetch(applicationsQuery(applicationsCursor));
 
-  if (!applications || applications.length === 0) {
-    container.innerHTML = "";
-    emptyState.style.display = "block";
-    return;
+    if (response.ok) {
+      const applications = await safeJson(response);
+      applicationsCursor = response.headers.get("X-Next-Cursor");
+      renderApplications(Array.isArray(applications) ? applications : [], true);
+    } else if (response.status === 401) {
+      logout();
+      showToast("Sessão expirada. Faça login novamente.", "error");
+    } else {
+      const data = await safeJson(response);
+      showToast(data?.detail || "Erro ao carregar candidaturas", "error");
+    }
+  } catch (err) {
+    showToast("Erro de conexão com o servidor", "error");
+  } finally {
+    applicationsLoadingMore = false;
+    updateApplicationsMore();
   }
+}
 
-  emptyState.style.display = "none";
+// Reaplica os filtros da listagem, voltando para a primeira página
+function applyApplicationFilters(e) {
+  e?.preventDefault();
+  loadApplications();
+}
+
+// Mostra o botão "Carregar mais" apenas enquanto houver próxima página
+function updateApplicationsMore() {
+  const more = document.getElementById("applicationsMore");
+  if (more) more.style.display = applicationsCursor ? "flex" : "none";
+}
 
-  container.innerHTML = applications
-    .map(
-      (app) => `
+// Gera o HTML do card de uma candidatura
+function applicationCard(app) {
+  return `
       <div class="application-card" data-id="${escapeHtml(app.id)}">
         <div class="app-header">
           <div class="app-title">
@@ -408,24 +478,29 @@ function renderApplications(applications) {
           </div>
         </div>
       </div>
-    `
-    )
-    .join("");
+    `;
 }
 
-// Atualiza os contadores de status no dashboard (esperando, entrevista, rejeitado, total)
-function updateStats(applications) {
-  const stats = {
-    esperando: 0,
-    entrevista: 0,
-    rejeitado: 0,
-    total: applications.length,
-  };
+// Renderiza uma página de candidaturas como cards HTML (append = adiciona ao fim da lista)
+function renderApplications(applications, append = false) {
+  const container = document.getElementById("applicationsList");
+  const emptyState = document.getElementById("emptyState");
 
-  applications.forEach((app) => {
-    if (stats[app.status] !== undefined) stats[app.status]++;
-  });
+  if (!container || !emptyState) return;
+
+  const html = applications.map(applicationCard).join("");
 
+  if (append) {
+    container.insertAdjacentHTML("beforeend", html);
+    return;
+  }
+
+  emptyState.style.display = applications.length === 0 ? "block" : "none";
+  container.innerHTML = html;
+}
+
+// Atualiza os contadores de status no dashboard com as estatísticas da API
+function updateStats(stats) {
   setText("statEsperando", stats.esperando);
   setText("statEntrevista", stats.entrevista);
   setText("statRejeitado", stats.rejeitado);
@@ -438,6 +513,113 @@ function setText(id, value) {
   if (el) el.textContent = String(value);
 }
 
+// ==================== BUSCA ====================
+
+// Processa o formulário de busca (termos vazios fecham o painel de resultados)
+async function handleSearch(e) {
+  e?.preventDefault();
+  searchQuery = document.getElementById("searchInput")?.value.trim() || "";
+
+  const panel = document.getElementById("searchResults");
+  if (!searchQuery) {
+    if (panel) panel.style.display = "none";
+    return;
+  }
+
+  await loadSearchResults(0);
+}
+
+// Busca uma página de resultados (offset > 0 adiciona ao fim do painel)
+async function loadSearchResults(offset) {
+  const panel = document.getElementById("searchResults");
+  if (!panel) return;
+
+  try {
+    const params = new URLSearchParams({ q: searchQuery, offset, limit: 20 });
+    const response = await fetch(apiUrl(`${ENDPOINTS.search}?${params}`), {
+      headers: authHeader(),
+    });
+    const data = await safeJson(response);
+
+    if (response.status === 401) {
+      logout();
+      showToast("Sessão expirada. Faça login novamente.", "error");
+      return;
+    }
+    if (!response.ok) {
+      showToast(data?.detail || "Erro ao buscar", "error");
+      return;
+    }
+
+    renderSearchResults(data?.results || [], data?.next_offset ?? null, offset > 0);
+  } catch (err) {
+    showToast("Erro de conexão com o servidor", "error");
+  }
+}
+
+// Renderiza os resultados da busca (título e trecho já vêm escapados, com <mark>)
+function renderSearchResults(results, nextOffset, append) {
+  const panel = document.getElementById("searchResults");
+  if (!panel) return;
+
+  panel.style.display = "grid";
+  panel.querySelector(".search-more")?.remove();
+
+  if (!append) {
+    panel.innerHTML = `
+      <div class="search-results-header">
+        <span>Resultados para "${escapeHtml(searchQuery)}"</span>
+        <button class="icon-btn" onclick="closeSearch()" title="Fechar">✖️</button>
+      </div>
+      ${results.length === 0 ? '<p class="text-secondary">Nenhum resultado encontrado.</p>' : ""}
+    `;
+  }
+
+  panel.insertAdjacentHTML("beforeend", results.map(searchHitCard).join(""));
+
+  if (nextOffset !== null) {
+    panel.insertAdjacentHTML("beforeend", `
+      <div class="search-more applications-more">
+        <button class="btn btn-secondary" onclick="loadSearchResults(${Number(nextOffset)})">Mais resultados</button>
+      </div>
+    `);
+  }
+}
+
+// Gera o HTML de um resultado da busca
+function searchHitCard(hit) {
+  const isInterview = hit.type === "interview";
+  const open = isInterview
+    ? `openInterviewFromSearch(${Number(hit.id)})`
+    : `editApplication(${Number(hit.id)})`;
+  const title = isInterview
+    ? `🎤 Entrevista · ${escapeHtml(hit.application_nome)}${hit.title ? ` · ${hit.title}` : ""}`
+    : `💼 ${hit.title}`;
+
+  return `
+    <div class="search-hit" onclick="${open}">
+      <div class="search-hit-title">${title}</div>
+      <div class="search-hit-meta">🏢 ${escapeHtml(hit.application_empresa)}</div>
+      <div class="search-hit-snippet">${hit.snippet}</div>
+    </div>
+  `;
+}
+
+// Abre uma entrevista encontrada na busca
+function openInterviewFromSearch(id) {
+  showSection("interviews");
+  editInterview(id);
+}
+
+// Fecha o painel de resultados e limpa o campo de busca
+function closeSearch() {
+  searchQuery = "";
+  const input = document.getElementById("searchInput");
+  if (input) input.value = "";
+  const panel = document.getElementById("searchResults");
+  if (panel) panel.style.display = "none";
+}
+
 // ==================== MODAL ====================
 
 // Abre o modal para adicionar nova candidatura com campos limpos
@@ -645,6 +827,35 @@ function authHeader() {
   return token ? { Authorization: `Bearer ${token}` } : {};
 }
 
+// Respostas de GET guardadas junto com o ETag, por URL (revalidadas com If-None-Match)
+const responseCache = new Map();
+
+// GET autenticado que envia o validador guardado; um 304 devolve a resposta em cache
+async function cachedFetch(path) {
+  const url = apiUrl(path);
+  const cached = responseCache.get(url);
+
+  const headers = authHeader();
+  if (cached) headers["If-None-Match"] = cached.etag;
+
+  const response = await fetch(url, { headers });
+
+  if (response.status === 304 && cached) {
+    return new Response(cached.body, { status: 200, headers: cached.headers });
+  }
+
+  const etag = response.headers.get("ETag");
+  if (response.ok && etag) {
+    responseCache.set(url, {
+      etag,
+      body: await response.clone().text(),
+      headers: [...response.headers],
+    });
+  }
+
+  return response;
+}
+
 // Extrai JSON de uma response de forma segura, retornando null em caso de erro
 async function safeJson(response) {
   try {
@@ -669,26 +880,22 @@ function escapeHtml(v) {
 
 // ==================== ESTATÍSTICAS ====================
 
-// Busca estatísticas do usuário na API e renderiza na seção de perfil
+// Busca estatísticas do usuário na API e atualiza o dashboard e a seção de perfil
 async function loadStats() {
   const container = document.getElementById('statsContainer');
-  if (!container) {
-    return;
-  }
 
   try {
-    const response = await fetch(apiUrl('/users/me/stats'), {
-      headers: authHeader()
-    });
+    const response = await cachedFetch(ENDPOINTS.stats);
 
     if (response.ok) {
       const stats = await response.json();
+      updateStats(stats);
       renderStats(stats);
-    } else {
+    } else if (container) {
       container.innerHTML = '<p class="loading-stats">❌ Erro ao carregar estatísticas</p>';
     }
   } catch (error) {
-    container.innerHTML = '<p class="loading-stats">❌ Erro de conexão</p>';
+    if (container) container.innerHTML = '<p class="loading-stats">❌ Erro de conexão</p>';
   }
 }
 
@@ -875,7 +1082,7 @@ async function handleGoogleLogin() {
       loadProfile();
       loadApplications();
       loadNotifications();
-      startNotificationPolling();
+      startNotificationStream();
       showLoginReminders();
     } else {
       showToast(data.detail || 'Erro ao fazer login com Google', 'error');
@@ -901,9 +1108,7 @@ async function loadInterviews() {
   showLoading();
 
   try {
-    const response = await fetch(apiUrl(ENDPOINTS.interviews), {
-      headers: authHeader(),
-    });
+    const response = await cachedFetch(ENDPOINTS.interviews);
 
     if (response.ok) {
       const interviews = await safeJson(response);
@@ -927,9 +1132,7 @@ async function loadInterviews() {
 // Carrega proximas entrevistas agendadas
 async function loadUpcomingInterviews() {
   try {
-    const response = await fetch(apiUrl(ENDPOINTS.upcomingInterviews), {
-      headers: authHeader(),
-    });
+    const response = await cachedFetch(ENDPOINTS.upcomingInterviews);
 
     if (response.ok) {
       const interviews = await safeJson(response);
@@ -1095,17 +1298,25 @@ async function loadApplicationsForDropdown() {
   if (!select) return;
 
   try {
-    const response = await fetch(apiUrl(ENDPOINTS.applications), {
-      headers: authHeader(),
-    });
+    // Percorre todas as páginas (tamanho máximo) para montar a lista completa
+    const applications = [];
+    let cursor = null;
 
-    if (response.ok) {
-      const applications = await safeJson(response);
-      select.innerHTML = '<option value="">Selecione a candidatura...</option>' +
-        applications.map(app =>
-          `<option value="${app.id}">${escapeHtml(app.nome)} - ${escapeHtml(app.empresa)}</option>`
-        ).join("");
-    }
+    do {
+      const params = new URLSearchParams({ limit: 200, sort: "empresa", order: "asc" });
+      if (cursor) params.set("cursor", cursor);
+
+      const response = await cachedFetch(`${ENDPOINTS.applications}?${params}`);
+      if (!response.ok) return;
+
+      applications.push(...((await safeJson(response)) || []));
+      cursor = response.headers.get("X-Next-Cursor");
+    } while (cursor);
+
+    select.innerHTML = '<option value="">Selecione a candidatura...</option>' +
+      applications.map(app =>
+        `<option value="${app.id}">${escapeHtml(app.nome)} - ${escapeHtml(app.empresa)}</option>`
+      ).join("");
   } catch (err) {
   }
 }
@@ -1340,9 +1551,7 @@ async function loadNotifications() {
   if (!token) return;
 
   try {
-    const response = await fetch(apiUrl(ENDPOINTS.notifications), {
-      headers: authHeader(),
-    });
+    const response = await cachedFetch(ENDPOINTS.notifications);
 
     if (response.ok) {
       const data = await safeJson(response);
@@ -1450,6 +1659,89 @@ function handleNotificationClick(interviewId) {
   editInterview(interviewId);
 }
 
+// Espera antes de reabrir o stream encerrado pelo servidor (igual ao "retry" do SSE)
+const NOTIFICATION_STREAM_RETRY_MS = 10000;
+
+// Token curto aceito apenas por /notifications/stream: o EventSource nao envia
+// cabecalhos e a URL aparece em logs, entao o token de acesso nunca vai nela
+async function fetchStreamToken() {
+  try {
+    const response = await fetch(apiUrl(ENDPOINTS.notificationsStreamToken), {
+      method: "POST",
+      headers: authHeader(),
+    });
+    if (!response.ok) return null;
+    const data = await safeJson(response);
+    return data?.token || null;
+  } catch (err) {
+    return null;
+  }
+}
+
+// Recebe as notificacoes por Server-Sent Events; sem suporte ou com a conexao
+// recusada (ex: token expirado), volta ao polling
+async function startNotificationStream() {
+  stopNotificationStream();
+
+  if (!token || !("EventSource" in window)) {
+    startNotificationPolling();
+    return;
+  }
+
+  const streamToken = await fetchStreamToken();
+  // Logout (ou outro start) durante a busca do token
+  stopNotificationStream();
+  if (!token) return;
+  if (!streamToken) {
+    startNotificationPolling();
+    return;
+  }
+
+  const url = apiUrl(`${ENDPOINTS.notificationsStream}?token=${encodeURIComponent(streamToken)}`);
+  const stream = new EventSource(url);
+  notificationStream = stream;
+  let opened = false;
+
+  stream.onopen = () => {
+    opened = true;
+  };
+
+  stream.addEventListener("notifications", (e) => {
+    stopNotificationPolling();
+    try {
+      const data = JSON.parse(e.data);
+      updateNotificationBadge(data.total_count);
+      renderNotificationDropdown(data);
+    } catch (err) {
+      // Ignora eventos malformados
+    }
+  });
+
+  stream.onerror = () => {
+    if (notificationStream !== stream) return;
+    // A reconexao automatica reusaria o token de stream, que ja expirou:
+    // fecha e abre uma conexao nova com outro token
+    stream.close();
+    notificationStream = null;
+    if (opened) {
+      notificationStreamRetry = setTimeout(startNotificationStream, NOTIFICATION_STREAM_RETRY_MS);
+    } else {
+      startNotificationPolling();
+    }
+  };
+}
+
+function stopNotificationStream() {
+  if (notificationStreamRetry) {
+    clearTimeout(notificationStreamRetry);
+    notificationStreamRetry = null;
+  }
+  if (notificationStream) {
+    notificationStream.close();
+    notificationStream = null;
+  }
+}
+
 function startNotificationPolling() {
   if (notificationInterval) clearInterval(notificationInterval);
   notificationInterval = setInterval(loadNotifications, 5 * 60 * 1000);
@@ -1466,9 +1758,7 @@ async function showLoginReminders() {
   if (!token) return;
 
   try {
-    const response = await fetch(apiUrl(ENDPOINTS.notifications), {
-      headers: authHeader(),
-    });
+    const response = await cachedFetch(ENDPOINTS.notifications);
 
     if (response.ok) {
       const data = await safeJson(response);
@@ -1504,6 +1794,12 @@ window.showRegister = showRegister;
 window.showSection = showSection;
 window.logout = logout;
 window.showAddModal = showAddModal;
+window.applyApplicationFilters = applyApplicationFilters;
+window.loadMoreApplications = loadMoreApplications;
+window.handleSearch = handleSearch;
+window.loadSearchResults = loadSearchResults;
+window.openInterviewFromSearch = openInterviewFromSearch;
+window.closeSearch = closeSearch;
 window.closeModal = closeModal;
 window.editApplication = editApplication;
 window.deleteApplication = deleteApplication;
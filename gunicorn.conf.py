@@ -0,0 +1,67 @@
+"""
+Configuração do gunicorn para produção: vários workers uvicorn por container.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Workers: WEB_CONCURRENCY ou, por padrão, um por CPU disponível para o
+container (quota do cgroup ou afinidade do processo, não os núcleos do host).
+O código da aplicação é carregado uma vez no master (preload) e compartilhado
+pelos workers via fork; cada worker abre as próprias conexões com o banco e
+conecta o barramento de invalidação no startup.
+
+Outras opções podem ser sobrescritas com GUNICORN_CMD_ARGS (ex: "--bind 0.0.0.0:9000").
+"""
+
+import math
+import os
+
+
+def available_cpus() -> int:
+    """CPUs utilizáveis pelo processo, respeitando a quota do cgroup (containers)."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    try:
+        # cgroup v2: "<quota> <período>" ou "max <período>"
+        with open("/sys/fs/cgroup/cpu.max") as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        try:
+            # cgroup v1
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as quota_file, \
+                    open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as period_file:
+                quota, period = int(quota_file.read()), int(period_file.read())
+            if quota > 0:
+                cpus = min(cpus, math.ceil(quota / period))
+        except (OSError, ValueError):
+            pass
+    return max(cpus, 1)
+
+
+# Porta fixa (Railway)
+bind = "0.0.0.0:8000"
+worker_class = "uvicorn.workers.UvicornWorker"
+# Workers async: um por CPU basta (o event loop não bloqueia em I/O)
+workers = int(os.getenv("WEB_CONCURRENCY") or available_cpus())
+preload_app = True
+
+# Mesmo prazo do --timeout-graceful-shutdown usado com o uvicorn sozinho
+graceful_timeout = 15
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+keepalive = 5
+
+# Proxies cujo X-Forwarded-For/-Proto é aceito pelos workers uvicorn (request.client
+# passa a ser o cliente, não o proxy). No Railway só o proxy da plataforma alcança o
+# container e o IP dele não é fixo: o Dockerfile usa "*" junto com TRUSTED_PROXY_HOPS=1
+# (o controle de admissão lê a entrada acrescentada pelo proxy, não a enviada pelo cliente)
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+accesslog = None
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # Conexões do pool criadas no master antes do fork não podem ser compartilhadas
+    from app.database import reset_pools_after_fork
+
+    reset_pools_after_fork()
@@ -0,0 +1,66 @@
+"""
+Ambiente do Alembic para as migrações do Job Application Tracker.
+Usa a mesma DATABASE_URL da aplicação e os metadados dos modelos SQLAlchemy.
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.database import DATABASE_URL, Base
+from app import models  # noqa: F401  (registra os modelos no metadata)
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Ignora no autogenerate o índice de busca (search_documents e as tabelas
+    auxiliares do FTS5), criado com DDL específico de cada banco na migração 0005.
+    """
+    return not (type_ == "table" and name.startswith("search_documents"))
+
+
+def run_migrations_offline() -> None:
+    """Gera o SQL das migrações sem conectar ao banco (alembic upgrade --sql)."""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_object=include_object,
+        render_as_batch=DATABASE_URL.startswith("sqlite"),
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Aplica as migrações conectando diretamente ao banco."""
+    connectable = config.attributes.get("connection")
+    if connectable is None:
+        connectable = create_engine(DATABASE_URL, poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite não suporta ALTER de colunas/constraints: usa "batch mode"
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
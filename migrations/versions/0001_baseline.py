@@ -0,0 +1,87 @@
+"""Schema inicial (equivalente ao antigo create_all)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "applications",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("nome", sa.String(), nullable=False),
+        sa.Column("empresa", sa.String(), nullable=False),
+        sa.Column("data", sa.String(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("ESPERANDO", "REJEITADO", "ENTREVISTA", name="statusenum"),
+            nullable=True,
+        ),
+        sa.Column("chance", sa.Integer(), nullable=True),
+        sa.Column("role", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+    )
+    op.create_index("ix_applications_id", "applications", ["id"])
+
+    op.create_table(
+        "interviews",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("application_id", sa.Integer(), sa.ForeignKey("applications.id"), nullable=False),
+        sa.Column("interview_datetime", sa.DateTime(), nullable=False),
+        sa.Column(
+            "interview_type",
+            sa.Enum(
+                "PHONE", "VIDEO", "IN_PERSON", "TECHNICAL", "BEHAVIORAL", "HR",
+                name="interviewtypeenum",
+            ),
+            nullable=False,
+        ),
+        sa.Column("interviewer_name", sa.String(), nullable=True),
+        sa.Column("interviewer_role", sa.String(), nullable=True),
+        sa.Column("duration_minutes", sa.Integer(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum("SCHEDULED", "COMPLETED", "CANCELLED", "RESCHEDULED", name="interviewstatusenum"),
+            nullable=True,
+        ),
+        sa.Column("questions_asked", sa.String(), nullable=True),
+        sa.Column("answers_notes", sa.String(), nullable=True),
+        sa.Column("feedback_received", sa.String(), nullable=True),
+        sa.Column("self_rating", sa.Integer(), nullable=True),
+        sa.Column("pre_interview_notes", sa.String(), nullable=True),
+        sa.Column("post_interview_notes", sa.String(), nullable=True),
+        sa.Column("meeting_link", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_interviews_id", "interviews", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("interviews")
+    op.drop_table("applications")
+    op.drop_table("users")
+    sa.Enum(name="interviewstatusenum").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="interviewtypeenum").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="statusenum").drop(op.get_bind(), checkfirst=True)
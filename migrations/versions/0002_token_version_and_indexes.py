@@ -0,0 +1,54 @@
+"""Versão de token dos usuários e índices compostos das consultas dos routers
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_applications_user_created", "applications", ["user_id", "created_at"]),
+    ("ix_applications_user_status", "applications", ["user_id", "status", "updated_at"]),
+    ("ix_applications_user_empresa", "applications", ["user_id", "empresa"]),
+    ("ix_interviews_application_datetime", "interviews", ["application_id", "interview_datetime"]),
+    ("ix_interviews_status_datetime", "interviews", ["status", "interview_datetime"]),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    # Bancos criados pelo antigo create_all podem já ter a coluna/índices
+    if "token_version" not in {c["name"] for c in inspector.get_columns("users")}:
+        op.add_column(
+            "users",
+            sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    existing = {
+        index["name"]
+        for table in ("applications", "interviews")
+        for index in inspector.get_indexes(table)
+    }
+
+    # No Postgres os índices são criados com CONCURRENTLY (sem bloquear escritas),
+    # o que exige rodar fora de uma transação
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            if name not in existing:
+                op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("token_version")
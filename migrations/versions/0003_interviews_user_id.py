@@ -0,0 +1,70 @@
+"""Desnormaliza user_id em interviews (filtro de dono sem junção)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("interviews", sa.Column("user_id", sa.Integer(), nullable=True))
+
+    # Backfill a partir da candidatura dona de cada entrevista
+    op.execute(
+        """
+        UPDATE interviews
+        SET user_id = (
+            SELECT applications.user_id
+            FROM applications
+            WHERE applications.id = interviews.application_id
+        )
+        """
+    )
+
+    with op.batch_alter_table("interviews") as batch_op:
+        batch_op.alter_column("user_id", existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key("fk_interviews_user_id_users", "users", ["user_id"], ["id"])
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_interviews_user_datetime",
+            "interviews",
+            ["user_id", "interview_datetime"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_interviews_user_status_datetime",
+            "interviews",
+            ["user_id", "status", "interview_datetime"],
+            postgresql_concurrently=True,
+        )
+        # Substituído por ix_interviews_user_status_datetime
+        op.drop_index(
+            "ix_interviews_status_datetime",
+            table_name="interviews",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_interviews_status_datetime",
+            "interviews",
+            ["status", "interview_datetime"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_interviews_user_status_datetime", table_name="interviews")
+        op.drop_index("ix_interviews_user_datetime", table_name="interviews")
+
+    with op.batch_alter_table("interviews") as batch_op:
+        batch_op.drop_constraint("fk_interviews_user_id_users", type_="foreignkey")
+        batch_op.drop_column("user_id")
@@ -0,0 +1,78 @@
+"""Converte applications.data de texto para DATE e indexa (user_id, data)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    # Linhas fora do formato YYYY-MM-DD (anteriores à validação) usam a data de criação
+    if dialect == "postgresql":
+        op.execute(
+            r"""
+            UPDATE applications
+            SET data = to_char(created_at, 'YYYY-MM-DD')
+            WHERE data !~ '^\d{4}-\d{2}-\d{2}$'
+            """
+        )
+    else:
+        op.execute(
+            """
+            UPDATE applications
+            SET data = date(created_at)
+            WHERE data NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+            """
+        )
+
+    if dialect == "postgresql":
+        op.alter_column(
+            "applications",
+            "data",
+            existing_type=sa.String(),
+            type_=sa.Date(),
+            existing_nullable=False,
+            postgresql_using="data::date",
+        )
+    else:
+        # O SQLite guarda DATE como texto 'YYYY-MM-DD', mas a recriação da tabela
+        # faria CAST(data AS DATE) (afinidade numérica): preserva o texto original
+        op.add_column("applications", sa.Column("data_original", sa.String(), nullable=True))
+        op.execute("UPDATE applications SET data_original = data")
+        with op.batch_alter_table("applications") as batch_op:
+            batch_op.alter_column("data", existing_type=sa.String(), type_=sa.Date(), existing_nullable=False)
+        op.execute("UPDATE applications SET data = data_original")
+        with op.batch_alter_table("applications") as batch_op:
+            batch_op.drop_column("data_original")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_applications_user_data",
+            "applications",
+            ["user_id", "data"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_applications_user_data", table_name="applications")
+
+    with op.batch_alter_table("applications") as batch_op:
+        batch_op.alter_column(
+            "data",
+            existing_type=sa.Date(),
+            type_=sa.String(),
+            existing_nullable=False,
+            postgresql_using="to_char(data, 'YYYY-MM-DD')",
+        )
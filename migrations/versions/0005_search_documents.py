@@ -0,0 +1,224 @@
+"""Índice de busca textual (FTS5 no SQLite, tsvector + GIN no Postgres)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 00:00:00
+
+A tabela search_documents tem um documento por candidatura e por entrevista,
+mantido por triggers nas tabelas de origem (qualquer caminho de escrita,
+inclusive UPDATE/DELETE em lote, mantém o índice em dia). O id do documento é
+derivado do id de origem: 2 * id para candidaturas e 2 * id + 1 para entrevistas.
+"""
+
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# Mesma configuração usada nas consultas (app.search.SEARCH_TS_CONFIG)
+TS_CONFIG = "portuguese"
+
+INTERVIEW_BODY_FIELDS = (
+    "questions_asked",
+    "answers_notes",
+    "feedback_received",
+    "pre_interview_notes",
+    "post_interview_notes",
+)
+
+# Quebra de linha entre os campos concatenados no corpo do documento
+SQLITE_NEWLINE = "char(10)"
+POSTGRES_NEWLINE = "E'\\n'"
+
+
+def _interview_body(row: str, separator: str) -> str:
+    return f" || {separator} || ".join(f"coalesce({row}.{field}, '')" for field in INTERVIEW_BODY_FIELDS)
+
+
+def _interview_title(row: str) -> str:
+    return f"trim(coalesce({row}.interviewer_name, '') || ' ' || coalesce({row}.interviewer_role, ''))"
+
+
+def _upgrade_sqlite() -> None:
+    # owner ("u<user_id>") é indexado para que o filtro por dono seja resolvido no próprio índice
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE search_documents USING fts5(
+            owner, title, body,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """
+    )
+
+    application_values = "new.id * 2, 'u' || new.user_id, new.nome, new.empresa || char(10) || new.role"
+    interview_values = (
+        f"new.id * 2 + 1, 'u' || new.user_id, {_interview_title('new')}, {_interview_body('new', SQLITE_NEWLINE)}"
+    )
+    interview_columns = ", ".join(("user_id", "interviewer_name", "interviewer_role") + INTERVIEW_BODY_FIELDS)
+
+    op.execute(
+        f"""
+        CREATE TRIGGER search_applications_ai AFTER INSERT ON applications BEGIN
+            INSERT INTO search_documents (rowid, owner, title, body) VALUES ({application_values});
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER search_applications_au AFTER UPDATE OF user_id, nome, empresa, role ON applications BEGIN
+            DELETE FROM search_documents WHERE rowid = old.id * 2;
+            INSERT INTO search_documents (rowid, owner, title, body) VALUES ({application_values});
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER search_applications_ad AFTER DELETE ON applications BEGIN
+            DELETE FROM search_documents WHERE rowid = old.id * 2;
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER search_interviews_ai AFTER INSERT ON interviews BEGIN
+            INSERT INTO search_documents (rowid, owner, title, body) VALUES ({interview_values});
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER search_interviews_au AFTER UPDATE OF {interview_columns} ON interviews BEGIN
+            DELETE FROM search_documents WHERE rowid = old.id * 2 + 1;
+            INSERT INTO search_documents (rowid, owner, title, body) VALUES ({interview_values});
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER search_interviews_ad AFTER DELETE ON interviews BEGIN
+            DELETE FROM search_documents WHERE rowid = old.id * 2 + 1;
+        END
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO search_documents (rowid, owner, title, body)
+        SELECT id * 2, 'u' || user_id, nome, empresa || char(10) || role FROM applications
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO search_documents (rowid, owner, title, body)
+        SELECT id * 2 + 1, 'u' || user_id, {_interview_title('interviews')}, {_interview_body('interviews', SQLITE_NEWLINE)}
+        FROM interviews
+        """
+    )
+
+
+def _upgrade_postgresql() -> None:
+    op.execute(
+        f"""
+        CREATE TABLE search_documents (
+            id BIGINT PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            body TEXT NOT NULL,
+            document TSVECTOR GENERATED ALWAYS AS (
+                setweight(to_tsvector('{TS_CONFIG}', title), 'A') ||
+                setweight(to_tsvector('{TS_CONFIG}', body), 'B')
+            ) STORED
+        )
+        """
+    )
+    op.execute("CREATE INDEX ix_search_documents_document ON search_documents USING GIN (document)")
+    op.execute("CREATE INDEX ix_search_documents_user ON search_documents (user_id)")
+
+    op.execute(
+        """
+        CREATE FUNCTION search_documents_sync_application() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                DELETE FROM search_documents WHERE id = OLD.id * 2;
+                RETURN OLD;
+            END IF;
+            INSERT INTO search_documents (id, user_id, title, body)
+            VALUES (NEW.id * 2, NEW.user_id, NEW.nome, NEW.empresa || E'\\n' || NEW.role)
+            ON CONFLICT (id) DO UPDATE
+            SET user_id = EXCLUDED.user_id, title = EXCLUDED.title, body = EXCLUDED.body;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        f"""
+        CREATE FUNCTION search_documents_sync_interview() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                DELETE FROM search_documents WHERE id = OLD.id * 2 + 1;
+                RETURN OLD;
+            END IF;
+            INSERT INTO search_documents (id, user_id, title, body)
+            VALUES (NEW.id * 2 + 1, NEW.user_id, {_interview_title('NEW')}, {_interview_body('NEW', POSTGRES_NEWLINE)})
+            ON CONFLICT (id) DO UPDATE
+            SET user_id = EXCLUDED.user_id, title = EXCLUDED.title, body = EXCLUDED.body;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    interview_columns = ", ".join(("user_id", "interviewer_name", "interviewer_role") + INTERVIEW_BODY_FIELDS)
+    op.execute(
+        """
+        CREATE TRIGGER search_applications_sync
+        AFTER INSERT OR UPDATE OF user_id, nome, empresa, role OR DELETE ON applications
+        FOR EACH ROW EXECUTE FUNCTION search_documents_sync_application()
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER search_interviews_sync
+        AFTER INSERT OR UPDATE OF {interview_columns} OR DELETE ON interviews
+        FOR EACH ROW EXECUTE FUNCTION search_documents_sync_interview()
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO search_documents (id, user_id, title, body)
+        SELECT id * 2, user_id, nome, empresa || E'\\n' || role FROM applications
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO search_documents (id, user_id, title, body)
+        SELECT id * 2 + 1, user_id, {_interview_title('interviews')}, {_interview_body('interviews', POSTGRES_NEWLINE)}
+        FROM interviews
+        """
+    )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        _upgrade_postgresql()
+    else:
+        _upgrade_sqlite()
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS search_interviews_sync ON interviews")
+        op.execute("DROP TRIGGER IF EXISTS search_applications_sync ON applications")
+        op.execute("DROP FUNCTION IF EXISTS search_documents_sync_interview()")
+        op.execute("DROP FUNCTION IF EXISTS search_documents_sync_application()")
+    else:
+        for trigger in (
+            "search_applications_ai", "search_applications_au", "search_applications_ad",
+            "search_interviews_ai", "search_interviews_au", "search_interviews_ad",
+        ):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS search_documents")
@@ -0,0 +1,41 @@
+"""Tabela user_stats com as estatísticas mantidas incrementalmente
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16 00:00:00
+
+As linhas são preenchidas com python -m app.manage rebuild-stats (ou sob
+demanda, na primeira leitura/escrita de cada usuário).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_stats",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("esperando", sa.Integer(), nullable=False),
+        sa.Column("entrevista", sa.Integer(), nullable=False),
+        sa.Column("rejeitado", sa.Integer(), nullable=False),
+        sa.Column("empresa_counts", sa.JSON(), nullable=False),
+        sa.Column("month_counts", sa.JSON(), nullable=False),
+        sa.Column("primeira_candidatura_id", sa.Integer(), nullable=True),
+        sa.Column("primeira_candidatura", sa.Date(), nullable=True),
+        sa.Column("ultima_entrevista_id", sa.Integer(), nullable=True),
+        sa.Column("ultima_entrevista", sa.Date(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_stats")
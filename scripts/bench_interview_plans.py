@@ -0,0 +1,161 @@
+"""
+Benchmark: consultas de entrevistas com junção em applications vs. user_id desnormalizado.
+
+Cria um banco SQLite temporário com o schema atual, popula com dados sintéticos
+e compara, para cada consulta, o plano (EXPLAIN QUERY PLAN) e o tempo médio do
+formato antigo (filtro de dono via JOIN applications) com o formato novo
+(filtro direto em interviews.user_id).
+
+Uso:
+    python scripts/bench_interview_plans.py [--users 200] [--apps 50] [--interviews 4] [--runs 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+_db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_file.name}"
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.database import Base, engine  # noqa: E402
+from app.models import (  # noqa: E402
+    Application,
+    Interview,
+    InterviewStatusEnum,
+    InterviewTypeEnum,
+    StatusEnum,
+    User,
+)
+
+
+def seed(users: int, apps_per_user: int, interviews_per_app: int) -> None:
+    """Popula o banco temporário com dados sintéticos."""
+    Base.metadata.create_all(engine)
+    rng = random.Random(42)
+    now = datetime.utcnow()
+
+    with engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"id": u, "email": f"user{u}@example.com", "hashed_password": "x"}
+            for u in range(1, users + 1)
+        ])
+
+        applications, interviews = [], []
+        app_id = interview_id = 0
+        for user_id in range(1, users + 1):
+            for _ in range(apps_per_user):
+                app_id += 1
+                applications.append({
+                    "id": app_id, "nome": "Vaga", "empresa": f"Empresa {rng.randint(1, 50)}",
+                    "data": "2024-01-15", "role": "Dev", "user_id": user_id,
+                    "status": rng.choice(list(StatusEnum)), "created_at": now, "updated_at": now,
+                })
+                for _ in range(interviews_per_app):
+                    interview_id += 1
+                    interviews.append({
+                        "id": interview_id, "application_id": app_id, "user_id": user_id,
+                        "interview_datetime": now + timedelta(hours=rng.randint(-2000, 2000)),
+                        "interview_type": rng.choice(list(InterviewTypeEnum)),
+                        "status": rng.choice(list(InterviewStatusEnum)),
+                        "created_at": now, "updated_at": now,
+                    })
+
+        connection.execute(insert(Application), applications)
+        connection.execute(insert(Interview), interviews)
+        connection.exec_driver_sql("ANALYZE")
+
+
+def build_queries(user_id: int):
+    """Retorna pares (nome, consulta com junção, consulta desnormalizada)."""
+    now = datetime.utcnow()
+    week_end = now + timedelta(days=7)
+
+    def joined():
+        return select(Interview).join(Application).where(Application.user_id == user_id)
+
+    def direct():
+        return select(Interview).where(Interview.user_id == user_id)
+
+    def scheduled(query):
+        return query.where(
+            Interview.status == InterviewStatusEnum.SCHEDULED,
+            Interview.interview_datetime >= now,
+        )
+
+    return [
+        (
+            "listagem (ORDER BY data DESC)",
+            joined().order_by(Interview.interview_datetime.desc()),
+            direct().order_by(Interview.interview_datetime.desc()),
+        ),
+        (
+            "próximas entrevistas (LIMIT 5)",
+            scheduled(joined()).order_by(Interview.interview_datetime.asc()).limit(5),
+            scheduled(direct()).order_by(Interview.interview_datetime.asc()).limit(5),
+        ),
+        (
+            "notificações (7 dias)",
+            scheduled(joined()).where(Interview.interview_datetime < week_end)
+            .order_by(Interview.interview_datetime.asc()),
+            scheduled(direct()).where(Interview.interview_datetime < week_end)
+            .order_by(Interview.interview_datetime.asc()),
+        ),
+        (
+            "busca por id (checagem de dono)",
+            select(Interview).join(Application).where(Interview.id == 1, Application.user_id == user_id),
+            select(Interview).where(Interview.id == 1, Interview.user_id == user_id),
+        ),
+    ]
+
+
+def explain(connection, statement) -> list:
+    compiled = statement.compile(dialect=connection.dialect)
+    params = tuple(compiled.construct_params()[name] for name in compiled.positiontup)
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    return [row[-1] for row in rows]
+
+
+def timed(connection, statement, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        connection.execute(statement).all()
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--apps", type=int, default=50, help="candidaturas por usuário")
+    parser.add_argument("--interviews", type=int, default=4, help="entrevistas por candidatura")
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    try:
+        seed(args.users, args.apps, args.interviews)
+        total = args.users * args.apps * args.interviews
+        print(f"{total} entrevistas, {args.users * args.apps} candidaturas, {args.users} usuários\n")
+
+        with engine.connect() as connection:
+            for name, before, after in build_queries(user_id=args.users // 2):
+                before_ms = timed(connection, before, args.runs)
+                after_ms = timed(connection, after, args.runs)
+                print(f"== {name}")
+                print(f"   antes  ({before_ms:7.3f} ms): " + " | ".join(explain(connection, before)))
+                print(f"   depois ({after_ms:7.3f} ms): " + " | ".join(explain(connection, after)))
+                print(f"   ganho: {before_ms / after_ms:.1f}x\n")
+    finally:
+        engine.dispose()
+        os.unlink(_db_file.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark: serialização das listagens via ORM + response_model vs. caminho rápido.
+
+Cria um banco SQLite temporário, popula um usuário com N candidaturas e N
+entrevistas e mede, para cada listagem, as linhas por segundo de:
+
+  antes:  instâncias ORM (candidaturas) ou dicts das linhas (entrevistas),
+          validados pelo response_model do FastAPI e codificados com json
+  depois: linhas Core -> dicts com chaves pré-calculadas -> orjson
+          (FastJSONResponse), sem revalidação
+
+Os dois caminhos incluem a consulta; o corpo gerado é comparado para garantir
+que o JSON é equivalente.
+
+Uso:
+    python scripts/bench_serialization.py [--rows 10000] [--runs 20]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+_db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_file.name}"
+os.environ.setdefault("SECRET_KEY", "bench-serialization")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.database import Base, engine  # noqa: E402
+from app.feeds import interview_feed_query  # noqa: E402
+from app.models import Application, Interview, InterviewTypeEnum, StatusEnum, User  # noqa: E402
+from app.routers.applications import APPLICATION_COLUMNS  # noqa: E402
+from app.schemas import ApplicationResponse, InterviewWithApplication  # noqa: E402
+from app.serialization import FastJSONResponse, rows_to_dicts  # noqa: E402
+
+USER_ID = 1
+
+
+def seed(rows: int) -> None:
+    """Popula o banco temporário com um usuário, rows candidaturas e rows entrevistas."""
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+
+    with engine.begin() as connection:
+        connection.execute(insert(User), [{"id": USER_ID, "email": "bench@example.com", "hashed_password": "x"}])
+        connection.execute(insert(Application), [
+            {
+                "id": i, "nome": f"Vaga {i}", "empresa": f"Empresa {i % 50}", "data": now.date(),
+                "role": "Dev", "status": list(StatusEnum)[i % 3], "chance": i % 101,
+                "user_id": USER_ID, "created_at": now, "updated_at": now,
+            }
+            for i in range(1, rows + 1)
+        ])
+        connection.execute(insert(Interview), [
+            {
+                "id": i, "application_id": i, "user_id": USER_ID,
+                "interview_datetime": now + timedelta(hours=i), "interview_type": list(InterviewTypeEnum)[i % 4],
+                "interviewer_name": "Fulana", "duration_minutes": 45, "questions_asked": "Conte sobre você",
+                "created_at": now, "updated_at": now,
+            }
+            for i in range(1, rows + 1)
+        ])
+
+
+def render_validated(loop, model, content) -> bytes:
+    """Caminho padrão do FastAPI: validação pelo response_model + JSONResponse (json)."""
+    field = create_response_field(name="bench", type_=List[model])
+    value = loop.run_until_complete(serialize_response(field=field, response_content=content, is_coroutine=True))
+    return JSONResponse(value).body
+
+
+def measure(fn, runs: int) -> float:
+    fn()  # aquecimento
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) / runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    try:
+        seed(args.rows)
+        applications_order = (Application.created_at.desc(), Application.id.desc())
+        interviews_query = interview_feed_query(USER_ID).order_by(Interview.interview_datetime.desc())
+
+        with Session(engine) as session:
+            cases = [
+                (
+                    "candidaturas",
+                    lambda: render_validated(loop, ApplicationResponse, session.scalars(
+                        select(Application).where(Application.user_id == USER_ID).order_by(*applications_order)
+                    ).all()),
+                    lambda: FastJSONResponse(rows_to_dicts(session.execute(
+                        select(*APPLICATION_COLUMNS).where(Application.user_id == USER_ID).order_by(*applications_order)
+                    ))).body,
+                ),
+                (
+                    "entrevistas",
+                    lambda: render_validated(loop, InterviewWithApplication, [
+                        dict(row._mapping) for row in session.execute(interviews_query)
+                    ]),
+                    lambda: FastJSONResponse(rows_to_dicts(session.execute(interviews_query))).body,
+                ),
+            ]
+
+            print(f"{args.rows} linhas por listagem, média de {args.runs} execuções\n")
+            for name, before, after in cases:
+                # expunge_all: cada execução hidrata as instâncias ORM do zero, como numa requisição
+                assert json.loads(before()) == json.loads(after()), f"{name}: JSON diferente"
+                session.expunge_all()
+
+                before_s = measure(lambda: (before(), session.expunge_all()), args.runs)
+                after_s = measure(after, args.runs)
+                print(f"== {name}")
+                print(f"   antes  ({before_s * 1000:8.1f} ms): {args.rows / before_s:10.0f} linhas/s")
+                print(f"   depois ({after_s * 1000:8.1f} ms): {args.rows / after_s:10.0f} linhas/s")
+                print(f"   ganho: {before_s / after_s:.1f}x\n")
+    finally:
+        loop.close()
+        engine.dispose()
+        os.unlink(_db_file.name)
+
+
+if __name__ == "__main__":
+    main()
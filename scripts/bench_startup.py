@@ -0,0 +1,152 @@
+"""
+Benchmark: inicialização a frio do worker (tempo de import e até o primeiro 200).
+
+Cada medição roda num processo novo, com um banco SQLite temporário:
+
+  import: tempo de `import app.main` medido com python -X importtime, com os
+          módulos de maior tempo acumulado
+  pronto: tempo entre o lançamento do uvicorn e o primeiro 200 em /health
+
+Também falha se alguma dependência pesada que deve ser carregada sob demanda
+(firebase_admin, jose, passlib) for importada na inicialização. Com
+--budget-import-ms/--budget-ready-ms o script sai com código 1 quando a mediana
+passa do orçamento (usado no CI).
+
+Uso:
+    python scripts/bench_startup.py [--runs 5] [--top 15]
+                                    [--budget-import-ms 2500] [--budget-ready-ms 4000]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Importadas apenas no primeiro uso (login Google, emissão/validação de JWT, hash de senha)
+LAZY_MODULES = ("firebase_admin", "jose", "passlib")
+
+READY_TIMEOUT_SECONDS = 30
+
+
+def worker_env(db_path: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["DATABASE_URL"] = f"sqlite:///{db_path}"
+    env.setdefault("SECRET_KEY", "bench-startup")
+    return env
+
+
+def measure_import(env: Dict[str, str]) -> Tuple[float, Dict[str, float]]:
+    """
+    Importa app.main num processo novo com -X importtime.
+
+    Returns:
+        Tupla (tempo total em ms, {módulo: tempo acumulado em ms})
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    modules: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative) / 1000
+    return modules["app.main"], modules
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_ready(env: Dict[str, str]) -> float:
+    """Lança o uvicorn e retorna o tempo (ms) até o primeiro 200 em /health."""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT_DIR, env=env,
+    )
+    try:
+        while time.perf_counter() - started < READY_TIMEOUT_SECONDS:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn encerrou com código {process.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise RuntimeError(f"/health não respondeu em {READY_TIMEOUT_SECONDS}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="módulos mais caros listados")
+    parser.add_argument("--budget-import-ms", type=float, help="orçamento para a mediana do import")
+    parser.add_argument("--budget-ready-ms", type=float, help="orçamento para a mediana até o primeiro 200")
+    args = parser.parse_args()
+
+    db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    db_file.close()
+    env = worker_env(db_file.name)
+    try:
+        measure_import(env)  # aquecimento: gera os .pyc
+
+        import_runs: List[float] = []
+        modules: Dict[str, float] = {}
+        for _ in range(args.runs):
+            total_ms, modules = measure_import(env)
+            import_runs.append(total_ms)
+        ready_runs = [measure_ready(env) for _ in range(args.runs)]
+    finally:
+        os.unlink(db_file.name)
+
+    import_ms = statistics.median(import_runs)
+    ready_ms = statistics.median(ready_runs)
+
+    print(f"Mediana de {args.runs} execuções\n")
+    print(f"import app.main:        {import_ms:8.1f} ms  (min {min(import_runs):.1f}, max {max(import_runs):.1f})")
+    print(f"primeiro 200 em /health: {ready_ms:7.1f} ms  (min {min(ready_runs):.1f}, max {max(ready_runs):.1f})\n")
+
+    print("Módulos de maior tempo acumulado (última execução):")
+    dependencies = {name: ms for name, ms in modules.items() if name != "app.main"}
+    for name, ms in sorted(dependencies.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"   {ms:8.1f} ms  {name}")
+
+    failures = []
+    eager = sorted({name for name in modules for lazy in LAZY_MODULES if name == lazy or name.startswith(lazy + ".")})
+    if eager:
+        failures.append(f"importados na inicialização (deveriam ser sob demanda): {', '.join(eager)}")
+    if args.budget_import_ms is not None and import_ms > args.budget_import_ms:
+        failures.append(f"import {import_ms:.1f} ms acima do orçamento de {args.budget_import_ms:.0f} ms")
+    if args.budget_ready_ms is not None and ready_ms > args.budget_ready_ms:
+        failures.append(f"primeiro 200 em {ready_ms:.1f} ms acima do orçamento de {args.budget_ready_ms:.0f} ms")
+
+    print()
+    for failure in failures:
+        print(f"FALHA: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Fixtures compartilhadas: banco SQLite temporário migrado, cliente HTTP e usuários.
+
+O ambiente é definido antes do primeiro import de `app` (as configurações são
+lidas uma única vez). O hash de senhas roda no threadpool com custo mínimo.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, List
+
+_DB_DIR = tempfile.mkdtemp(prefix="jobtracker-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}",
+    SECRET_KEY="test-secret-key",
+    PASSWORD_HASH_WORKERS="0",
+    BCRYPT_ROUNDS="4",
+    ADMISSION_ENABLED="false",
+    INVALIDATION_BACKEND="local",
+    # Streams SSE curtos: o TestClient só devolve a resposta quando ela termina
+    SSE_MAX_STREAM_SECONDS="1",
+)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    """Cliente da aplicação com o schema criado pelas migrações."""
+    subprocess.run([sys.executable, "-m", "app.manage", "migrate"], cwd=ROOT_DIR, check=True, capture_output=True)
+
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers(client: TestClient) -> dict:
+    """Registra um usuário novo e retorna o cabeçalho Authorization do seu token."""
+    email = f"user-{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post("/auth/register", json={"email": email, "password": "secret123"})
+    assert response.status_code == 201, response.text
+    response = client.post("/auth/login", data={"username": email, "password": "secret123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def recorded_statements(client: TestClient):
+    """
+    Registra as instruções SQL executadas dentro do bloco.
+
+    Uso:
+        with recorded_statements() as statements:
+            client.get(...)
+    """
+    from app.database import async_engine, engine
+
+    sync_engine = async_engine.sync_engine if async_engine is not None else engine
+
+    @contextmanager
+    def record() -> Iterator[List[str]]:
+        statements: List[str] = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+
+    return record
+
+
+@pytest.fixture
+def query_budget(recorded_statements):
+    """
+    Falha o teste se o bloco executar mais instruções SQL que o orçamento.
+
+    Uso:
+        with query_budget(2):
+            client.get("/users/me/stats", headers=headers)
+    """
+    from app.query_stats import RequestQueryStats
+
+    @contextmanager
+    def budget(max_statements: int) -> Iterator[RequestQueryStats]:
+        stats = RequestQueryStats()
+        with recorded_statements() as statements:
+            yield stats
+        for statement in statements:
+            stats.record(statement, 0.0)
+        if stats.count > max_statements:
+            listing = "\n".join(f"  {statement[:200]}" for statement in statements)
+            pytest.fail(f"{stats.count} instruções SQL, orçamento de {max_statements}:\n{listing}")
+
+    return budget
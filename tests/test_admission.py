@@ -0,0 +1,78 @@
+"""Controle de admissão: buckets por IP do cliente atrás de proxy."""
+
+import dataclasses
+
+import pytest
+from fastapi.testclient import TestClient
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from app import admission
+from app.admission import AdmissionPolicy
+
+IP_RATE_PER_MINUTE = 2
+PROXY_IP = "10.0.0.1"
+
+
+def behind_proxy(app, trusted_hosts=None):
+    """
+    Aplicação vista por trás de um proxy: toda conexão vem de PROXY_IP.
+
+    Com trusted_hosts, o X-Forwarded-For é resolvido como nos workers uvicorn
+    do gunicorn (forwarded_allow_ips).
+    """
+    if trusted_hosts is not None:
+        app = ProxyHeadersMiddleware(app, trusted_hosts=trusted_hosts)
+
+    async def from_proxy(scope, receive, send):
+        scope["client"] = (PROXY_IP, 40000)
+        await app(scope, receive, send)
+
+    return TestClient(from_proxy)
+
+
+@pytest.fixture
+def login_policy(client, monkeypatch):
+    """Admissão ativa no login, com poucos tokens por IP e sem limite por conta."""
+    policy = AdmissionPolicy("auth.login", max_concurrency=16, ip_rate_per_minute=IP_RATE_PER_MINUTE, account_rate_per_minute=0)
+    monkeypatch.setitem(admission.policies, "auth.login", policy)
+    monkeypatch.setattr(admission, "settings", dataclasses.replace(admission.settings, admission_enabled=True))
+    return policy
+
+
+def login(client, forwarded_for: str) -> int:
+    response = client.post(
+        "/auth/login",
+        data={"username": "nobody@example.com", "password": "wrong"},
+        headers={"X-Forwarded-For": forwarded_for},
+    )
+    return response.status_code
+
+
+def burst(client, forwarded_for: str) -> list:
+    return [login(client, forwarded_for) for _ in range(IP_RATE_PER_MINUTE + 1)]
+
+
+def test_trusted_proxy_hops_give_each_client_its_own_bucket(client, login_policy, monkeypatch):
+    monkeypatch.setattr(admission, "settings", dataclasses.replace(admission.settings, trusted_proxy_hops=1))
+    client = behind_proxy(client.app)
+
+    assert burst(client, "203.0.113.1") == [401, 401, 429]
+    assert burst(client, "203.0.113.2") == [401, 401, 429]
+    # Entradas à esquerda vêm do cliente: forjá-las não troca de bucket
+    assert login(client, "198.51.100.7, 203.0.113.1") == 429
+    assert login_policy.shed["ip_rate"] == 3
+
+
+def test_forwarded_allow_ips_give_each_client_its_own_bucket(client, login_policy):
+    proxied = behind_proxy(client.app, trusted_hosts=PROXY_IP)
+
+    assert burst(proxied, "203.0.113.1") == [401, 401, 429]
+    assert burst(proxied, "203.0.113.2") == [401, 401, 429]
+
+
+def test_without_proxy_settings_the_connection_ip_is_the_key(client, login_policy):
+    # Sem FORWARDED_ALLOW_IPS nem TRUSTED_PROXY_HOPS todos os clientes dividem o bucket do proxy
+    proxied = behind_proxy(client.app)
+
+    assert burst(proxied, "203.0.113.1")[-1] == 429
+    assert login(proxied, "203.0.113.2") == 429
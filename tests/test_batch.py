@@ -0,0 +1,78 @@
+"""Operações em lote: alterações parciais e validação dos campos obrigatórios."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+
+def create_application(client, headers, **fields) -> dict:
+    payload = {"nome": "Dev Backend", "empresa": "ACME", "data": "2024-01-15", "role": "dev", "status": "esperando"}
+    payload.update(fields)
+    response = client.post("/applications/", json=payload, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def create_interview(client, headers, application_id: int) -> dict:
+    response = client.post("/interviews/", json={
+        "application_id": application_id,
+        "interview_datetime": (datetime.utcnow() + timedelta(days=1)).isoformat(),
+        "interview_type": "video",
+    }, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_application_batch_update(client, auth_headers):
+    ids = [create_application(client, auth_headers)["id"] for _ in range(2)]
+
+    response = client.patch("/applications/batch", json={
+        "ids": ids + [999999], "changes": {"status": "rejeitado"},
+    }, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["affected"] == 2
+    assert [item["result"] for item in response.json()["results"]] == ["updated", "updated", "not_found"]
+
+
+@pytest.mark.parametrize("field", ["nome", "empresa", "data", "role", "status", "chance"])
+def test_application_batch_update_rejects_null(client, auth_headers, field):
+    application = create_application(client, auth_headers)
+
+    response = client.patch("/applications/batch", json={
+        "ids": [application["id"]], "changes": {field: None},
+    }, headers=auth_headers)
+
+    assert response.status_code == 422
+    assert client.get(f"/applications/{application['id']}", headers=auth_headers).json()[field] == application[field]
+
+
+def test_application_update_rejects_null(client, auth_headers):
+    application = create_application(client, auth_headers)
+
+    response = client.put(f"/applications/{application['id']}", json={"empresa": None}, headers=auth_headers)
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("field", ["interview_datetime", "interview_type", "status"])
+def test_interview_batch_update_rejects_null(client, auth_headers, field):
+    interview = create_interview(client, auth_headers, create_application(client, auth_headers)["id"])
+
+    response = client.patch("/interviews/batch", json={
+        "ids": [interview["id"]], "changes": {field: None},
+    }, headers=auth_headers)
+
+    assert response.status_code == 422
+
+
+def test_interview_batch_update_clears_optional_field(client, auth_headers):
+    interview = create_interview(client, auth_headers, create_application(client, auth_headers)["id"])
+    client.put(f"/interviews/{interview['id']}", json={"meeting_link": "https://meet.example.com/x"}, headers=auth_headers)
+
+    response = client.patch("/interviews/batch", json={
+        "ids": [interview["id"]], "changes": {"meeting_link": None},
+    }, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert client.get(f"/interviews/{interview['id']}", headers=auth_headers).json()["meeting_link"] is None
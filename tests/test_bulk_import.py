@@ -0,0 +1,61 @@
+"""Importação em massa: relatório de erros e event loop livre durante o parse."""
+
+import asyncio
+
+from app.bulk_import import import_applications
+from app.settings import settings
+
+CSV_HEADER = "nome,empresa,data,role,status\n"
+
+
+def test_import_reports_valid_and_invalid_rows(client, auth_headers):
+    body = CSV_HEADER + "Dev,ACME,2024-01-15,dev,esperando\nDev,ACME,15/01/2024,dev,esperando\n"
+
+    response = client.post("/applications/import", content=body, headers={**auth_headers, "Content-Type": "text/csv"})
+
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["imported"] == 1
+    assert report["failed"] == 1
+    assert report["errors"][0]["row"] == 3
+
+
+def test_large_all_invalid_upload(client, auth_headers):
+    rows = settings.import_max_rows
+    body = CSV_HEADER + "Dev,ACME,data-invalida,dev,esperando\n" * rows
+
+    response = client.post("/applications/import", content=body, headers={**auth_headers, "Content-Type": "text/csv"})
+
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["imported"] == 0
+    assert report["failed"] == rows
+    assert report["errors_truncated"] is True
+
+
+def test_all_invalid_import_does_not_hold_the_event_loop():
+    rows = ((number, {"nome": "Dev", "empresa": "ACME", "data": "data-invalida", "role": "dev"})
+            for number in range(2, settings.import_max_rows + 2))
+
+    async def run():
+        ticks = 0
+        done = False
+
+        async def ticker():
+            nonlocal ticks
+            while not done:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticking = asyncio.create_task(ticker())
+        # Sem linhas válidas não há INSERT: a sessão não é usada
+        result = await import_applications(None, user_id=1, rows=rows)
+        done = True
+        await ticking
+        return result, ticks
+
+    result, ticks = asyncio.run(run())
+
+    assert result.failed == settings.import_max_rows
+    # Pelo menos uma volta do event loop por bloco de IMPORT_BATCH_SIZE linhas
+    assert ticks >= settings.import_max_rows // settings.import_batch_size
@@ -0,0 +1,30 @@
+"""Compressão de respostas dinâmicas: negociação e cabeçalho Vary."""
+
+
+def test_index_page_varies_on_accept_encoding_once(client):
+    response = client.get("/app", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"].lower() == "accept-encoding"
+
+
+def test_json_list_is_compressed(client, auth_headers):
+    for index in range(30):
+        client.post("/applications/", json={
+            "nome": f"Dev {index}", "empresa": "ACME", "data": "2024-01-15", "role": "dev", "status": "esperando",
+        }, headers=auth_headers)
+
+    response = client.get("/applications/", headers={**auth_headers, "Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert len(response.json()) == 30
+
+
+def test_small_response_is_not_compressed(client):
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
@@ -0,0 +1,53 @@
+"""
+Feeds de entrevistas: a quantidade de consultas não depende do número de linhas.
+
+Os feeds (/interviews/, /interviews/upcoming e /notifications/) leem entrevistas
+e candidaturas num único SELECT com JOIN; um N+1 voltaria a fazer uma consulta
+por entrevista.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+FEEDS = ["/interviews/", "/interviews/upcoming", "/notifications/"]
+
+
+def seed_interviews(client, headers, total: int) -> None:
+    """Cria entrevistas agendadas nas próximas horas até o usuário ter `total`."""
+    application = client.post("/applications/", json={
+        "nome": "Dev Backend", "empresa": "ACME", "data": "2024-01-15", "role": "dev", "status": "entrevista",
+    }, headers=headers).json()
+    existing = len(client.get("/interviews/", headers=headers).json())
+    for index in range(existing, total):
+        response = client.post("/interviews/", json={
+            "application_id": application["id"],
+            "interview_datetime": (datetime.utcnow() + timedelta(hours=2, minutes=index)).isoformat(),
+            "interview_type": "video",
+        }, headers=headers)
+        assert response.status_code == 201, response.text
+
+
+# Checagem do ETag (versão dos dados) + a consulta do feed
+FEED_QUERY_BUDGET = 2
+
+
+def feed_statements(client, headers, recorded_statements, query_budget, path: str):
+    with query_budget(FEED_QUERY_BUDGET), recorded_statements() as statements:
+        response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+    return statements
+
+
+@pytest.mark.parametrize("path", FEEDS)
+def test_feed_statement_count_is_constant(client, auth_headers, recorded_statements, query_budget, path):
+    seed_interviews(client, auth_headers, 1)
+    few = feed_statements(client, auth_headers, recorded_statements, query_budget, path)
+
+    seed_interviews(client, auth_headers, 11)
+    many = feed_statements(client, auth_headers, recorded_statements, query_budget, path)
+
+    assert len(many) == len(few)
+    # Uma única leitura de entrevistas (as demais instruções são a checagem do ETag)
+    for statements in (few, many):
+        assert len([s for s in statements if "FROM interviews" in s]) == 1, statements
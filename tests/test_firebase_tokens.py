@@ -0,0 +1,147 @@
+"""
+Verificação de ID tokens do Firebase com um conjunto de chaves local.
+
+Gera uma chave RSA descartável e um certificado autoassinado; o SigningKeyCache
+recebe um fetcher que devolve esse certificado, sem acesso à rede.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from jose import jwt
+
+from app import firebase_tokens
+from app.firebase_tokens import InvalidIdToken, SigningKeyCache, SigningKeysUnavailable
+
+PROJECT_ID = "test-project"
+KID = "test-kid"
+
+
+@pytest.fixture(scope="module")
+def key_pair():
+    """Chave privada PEM e certificado PEM autoassinado correspondente."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "securetoken.test")])
+    now = datetime.utcnow()
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    return private_pem, certificate.public_bytes(serialization.Encoding.PEM).decode()
+
+
+@pytest.fixture
+def keys(monkeypatch, key_pair):
+    """Substitui o cache global de chaves por um com o certificado local."""
+    fetches = []
+
+    def fetcher():
+        fetches.append(time.monotonic())
+        return {KID: key_pair[1]}, 3600
+
+    cache = SigningKeyCache(fetcher=fetcher)
+    monkeypatch.setattr(firebase_tokens, "signing_keys", cache)
+    monkeypatch.setattr(firebase_tokens, "get_project_id", lambda: PROJECT_ID)
+    firebase_tokens.verified_tokens.clear()
+    yield cache
+    firebase_tokens.verified_tokens.clear()
+
+
+def make_token(private_pem: str, kid: str = KID, **overrides) -> str:
+    now = int(time.time())
+    claims = {
+        "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+        "aud": PROJECT_ID,
+        "sub": "firebase-uid",
+        "email": "user@example.com",
+        "name": "Usuário Teste",
+        "auth_time": now - 10,
+        "iat": now - 10,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, private_pem, algorithm="RS256", headers={"kid": kid})
+
+
+def test_valid_token(keys, key_pair):
+    user = firebase_tokens.verify_id_token(make_token(key_pair[0]))
+
+    assert user["email"] == "user@example.com"
+    assert user["sub"] == "firebase-uid"
+    assert keys.fetches == 1
+
+
+@pytest.mark.parametrize("claims", [
+    {"aud": "other-project"},
+    {"iss": "https://securetoken.google.com/other-project"},
+    {"exp": int(time.time()) - 60},
+])
+def test_rejects_wrong_audience_issuer_or_expired(keys, key_pair, claims):
+    with pytest.raises(InvalidIdToken):
+        firebase_tokens.verify_id_token(make_token(key_pair[0], **claims))
+
+
+def test_unknown_kid_forces_one_refetch(keys, key_pair):
+    firebase_tokens.verify_id_token(make_token(key_pair[0]))
+    keys._last_fetch -= firebase_tokens.CERTS_FORCED_REFRESH_INTERVAL_SECONDS + 1
+
+    with pytest.raises(InvalidIdToken):
+        firebase_tokens.verify_id_token(make_token(key_pair[0], kid="rotated-kid"))
+    assert keys.fetches == 2
+
+    # Dentro do intervalo mínimo não há nova busca
+    with pytest.raises(InvalidIdToken):
+        firebase_tokens.verify_id_token(make_token(key_pair[0], kid="rotated-kid"))
+    assert keys.fetches == 2
+
+
+def test_second_call_hits_verified_token_cache(keys, key_pair):
+    token = make_token(key_pair[0])
+    hits = firebase_tokens.verified_tokens.hits
+
+    first = firebase_tokens.verify_id_token(token)
+    second = firebase_tokens.verify_id_token(token)
+
+    assert first == second
+    assert firebase_tokens.verified_tokens.hits == hits + 1
+
+
+def test_fetch_failure_keeps_serving_cached_keys(keys, key_pair):
+    firebase_tokens.verify_id_token(make_token(key_pair[0]))
+    firebase_tokens.verified_tokens.clear()
+
+    def failing_fetcher():
+        raise OSError("certs endpoint fora do ar")
+
+    keys.fetcher = failing_fetcher
+    keys._expires_at = 0.0
+
+    user = firebase_tokens.verify_id_token(make_token(key_pair[0]))
+    assert user["email"] == "user@example.com"
+    assert keys.fetch_errors == 1
+
+
+def test_fetch_failure_without_keys_is_unavailable(keys, key_pair):
+    def failing_fetcher():
+        raise OSError("certs endpoint fora do ar")
+
+    keys.fetcher = failing_fetcher
+
+    with pytest.raises(SigningKeysUnavailable):
+        firebase_tokens.verify_id_token(make_token(key_pair[0]))
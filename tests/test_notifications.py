@@ -0,0 +1,51 @@
+"""Stream de notificações: autenticado apenas por tokens curtos de escopo próprio."""
+
+from datetime import timedelta
+
+from app.auth import STREAM_TOKEN_SCOPE, create_access_token
+
+
+def stream_token(client, headers) -> str:
+    response = client.post("/notifications/stream-token", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["expires_in"] == 60
+    return response.json()["token"]
+
+
+def test_stream_token_requires_authentication(client):
+    assert client.post("/notifications/stream-token").status_code == 401
+
+
+def test_stream_accepts_stream_token(client, auth_headers):
+    response = client.get("/notifications/stream", params={"token": stream_token(client, auth_headers)})
+
+    assert response.status_code == 200
+    assert "event: notifications" in response.text
+
+
+def test_stream_rejects_access_token(client, auth_headers):
+    access_token = auth_headers["Authorization"].split(" ", 1)[1]
+
+    response = client.get("/notifications/stream", params={"token": access_token})
+
+    assert response.status_code == 401
+
+
+def test_stream_token_is_not_an_access_token(client, auth_headers):
+    token = stream_token(client, auth_headers)
+
+    response = client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 401
+
+
+def test_stream_rejects_expired_stream_token(client, auth_headers):
+    email = client.get("/users/me", headers=auth_headers).json()["email"]
+    expired = create_access_token(
+        {"sub": email, "ver": 0, "scope": STREAM_TOKEN_SCOPE},
+        expires_delta=timedelta(seconds=-1),
+    )
+
+    response = client.get("/notifications/stream", params={"token": expired})
+
+    assert response.status_code == 401
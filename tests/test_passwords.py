@@ -0,0 +1,19 @@
+"""Pool de hashing de senhas: o módulo importado pelos processos do pool é leve."""
+
+import subprocess
+import sys
+
+from conftest import ROOT_DIR
+
+# Nenhum destes pode ser importado pelos processos do pool
+HEAVY_PACKAGES = ("fastapi", "starlette", "pydantic", "sqlalchemy")
+
+
+def test_pool_worker_import_is_light():
+    code = (
+        "import sys, app.passwords; "
+        f"print(','.join(sorted(m for m in sys.modules if m.split('.')[0] in {HEAVY_PACKAGES!r})))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
@@ -0,0 +1,30 @@
+"""Estatísticas do usuário: leitura da tabela user_stats dentro do orçamento de consultas."""
+
+# Checagem do ETag (versão dos dados) + a linha de user_stats
+STATS_QUERY_BUDGET = 2
+
+
+def test_stats_query_budget(client, auth_headers, query_budget):
+    for status in ("esperando", "entrevista", "rejeitado"):
+        response = client.post("/applications/", json={
+            "nome": "Dev Backend", "empresa": "ACME", "data": "2024-01-15", "role": "dev", "status": status,
+        }, headers=auth_headers)
+        assert response.status_code == 201, response.text
+
+    with query_budget(STATS_QUERY_BUDGET):
+        response = client.get("/users/me/stats", headers=auth_headers)
+
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["total"] == 3
+    assert stats["entrevista"] == 1
+    assert stats["taxa_conversao"] == 33.3
+
+
+def test_stats_not_modified_within_budget(client, auth_headers, query_budget):
+    etag = client.get("/users/me/stats", headers=auth_headers).headers["ETag"]
+
+    with query_budget(1):
+        response = client.get("/users/me/stats", headers={**auth_headers, "If-None-Match": etag})
+
+    assert response.status_code == 304